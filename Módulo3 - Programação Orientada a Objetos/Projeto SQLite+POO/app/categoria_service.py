@@ -131,6 +131,8 @@ class CategoriaService:
         """Solicita dados do usuário e atualiza uma categoria existente"""
         print("\n--- ATUALIZAR CATEGORIA ---")
         
+        categoriaId = None
+        
         try:
             idStr = input("Digite o ID da categoria a atualizar: ").strip()
             categoriaId = int(idStr)
@@ -169,6 +171,10 @@ class CategoriaService:
             print("❌ Erro: ID deve ser um número inteiro!")
         except Exception as e:
             print(f"❌ Erro ao atualizar categoria: {e}")
+        finally:
+            # Descartar do identity map alterações feitas no objeto e não salvas
+            if categoriaId is not None:
+                self.__categoriaDao.invalidar(categoriaId)
     
     def deletarCategoria(self):
         """Solicita um ID e deleta a categoria correspondente"""
@@ -214,23 +220,24 @@ class CategoriaService:
                 self.exibirMenu()
                 opcao = input("\nEscolha uma opção: ").strip()
                 
-                if opcao == '0':
-                    print("\n👋 Encerrando o sistema...")
-                    break
-                elif opcao == '1':
-                    self.criarCategoria()
-                elif opcao == '2':
-                    self.listarCategorias()
-                elif opcao == '3':
-                    self.buscarPorId()
-                elif opcao == '4':
-                    self.buscarPorNome()
-                elif opcao == '5':
-                    self.atualizarCategoria()
-                elif opcao == '6':
-                    self.deletarCategoria()
-                else:
-                    print("❌ Opção inválida! Tente novamente.")
+                with self.__db.escopo(f"Categorias: opção {opcao}"):
+                    if opcao == '0':
+                        print("\n👋 Encerrando o sistema...")
+                        break
+                    elif opcao == '1':
+                        self.criarCategoria()
+                    elif opcao == '2':
+                        self.listarCategorias()
+                    elif opcao == '3':
+                        self.buscarPorId()
+                    elif opcao == '4':
+                        self.buscarPorNome()
+                    elif opcao == '5':
+                        self.atualizarCategoria()
+                    elif opcao == '6':
+                        self.deletarCategoria()
+                    else:
+                        print("❌ Opção inválida! Tente novamente.")
                 
                 input("\nPressione Enter para continuar...")
         
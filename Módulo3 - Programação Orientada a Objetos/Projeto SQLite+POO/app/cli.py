@@ -0,0 +1,369 @@
+"""
+Modo não interativo: importação e exportação de arquivos CSV/JSONL pela linha de comando
+
+Exemplos:
+    python3 app/cli.py import pessoas.csv
+    python3 app/cli.py import feed.jsonl --entidade pessoas --lote 5000
+    python3 app/cli.py export disciplinas --format jsonl --saida disciplinas.jsonl
+    python3 app/cli.py backup backup.db.gz --pausa 0.01
+    python3 app/cli.py restore backup.db.gz
+    python3 app/cli.py --fts export pessoas      # instala os índices FTS5, se ainda não existem
+    python3 app/cli.py remove fts                # remove os índices FTS5 e seus triggers
+
+Os arquivos são lidos e escritos registro a registro, em lotes de tamanho fixo,
+então a memória usada não depende do tamanho do arquivo.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+# Adicionar o diretório pai ao path para permitir imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.backup import PAGINAS_POR_PASSO, fazerBackup, restaurar
+from bd.database import PERFIS, DatabaseConnection
+from bd.migracoes import RECURSOS
+from dao.categoria_dao import CategoriaDAO
+from dao.disciplina_dao import DisciplinaDAO
+from dao.lote import dividirEmLotes
+from dao.pessoa_dao import MINUSCULAS_NOCASE, PessoaDAO
+from dao.usuario_dao import UsuarioDAO
+from model.categoria import Categoria
+from model.disciplina import Disciplina
+from model.pessoa import Pessoa
+from model.usuario import Usuario
+
+# Colunas de cada entidade nos arquivos (mesmas na importação e na exportação)
+COLUNAS = {
+    'categorias': ['id', 'nome'],
+    'pessoas': ['id', 'nome', 'email', 'altura', 'peso', 'data_nascimento', 'ativo', 'telefone', 'categoria'],
+    'disciplinas': ['id', 'nome', 'carga_horaria', 'descricao'],
+    'usuarios': ['id', 'login', 'senha', 'tipo', 'email'],
+}
+FORMATOS = ('csv', 'jsonl')
+
+
+def valorOuNone(valor, tipo=str):
+    """Converte o texto lido do arquivo ('' ou None = ausente)"""
+    if valor is None or valor == '':
+        return None
+    return tipo(valor)
+
+
+def lerBooleano(valor):
+    if valor is None or valor == '':
+        return True
+    if isinstance(valor, bool):
+        return valor
+    return str(valor).strip().lower() in ('1', 'true', 'sim', 's', 'yes')
+
+
+def lerRegistros(arquivo, formato: str):
+    """Gerador de dicionários, um por linha do arquivo"""
+    if formato == 'csv':
+        yield from csv.DictReader(arquivo)
+    else:
+        for numero, linha in enumerate(arquivo, start=1):
+            if linha.strip():
+                try:
+                    yield json.loads(linha)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Linha {numero} não é um JSON válido: {e}")
+
+
+def detectarFormato(caminho: str, formato: str | None):
+    if formato is None:
+        formato = os.path.splitext(caminho)[1].lstrip('.').lower()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconhecido: '{formato}'. Use --format {' ou '.join(FORMATOS)}")
+    return formato
+
+
+class ArquivoService:
+
+    def __init__(self, db: DatabaseConnection, saidaProgresso=sys.stderr):
+        self.__db = db
+        self.__saidaProgresso = saidaProgresso
+        self.__categoriaDao = CategoriaDAO(db)
+        self.__pessoaDao = PessoaDAO(db)
+        self.__disciplinaDao = DisciplinaDAO(db)
+        self.__usuarioDao = UsuarioDAO(db)
+        # Categorias por nome: poucas, então podem ficar em memória durante a importação
+        self.__categorias = {}
+
+    def __exibir(self, mensagem: str):
+        print(mensagem, file=self.__saidaProgresso)
+
+    def __exibirVazao(self, acao: str, total: int, inicio: float):
+        duracao = time.perf_counter() - inicio
+        vazao = total / duracao if duracao > 0 else 0
+        self.__exibir(f"✅ {total} registro(s) {acao} em {duracao:.2f}s ({vazao:,.0f} registros/s)")
+
+    # Importação
+
+    def importar(self, caminho: str, entidade: str, formato: str | None = None, tamanhoLote: int = 1000):
+        """
+        Importa o arquivo pelos métodos salvarEmLote dos DAOs (upsert pelo id ou pela
+        chave natural: email, nome ou pessoa). Cada lote é gravado em sua própria
+        transação, junto com as categorias criadas para ele; se um lote falhar, nada
+        dele fica gravado e os anteriores permanecem.
+        Retorna o total de registros importados.
+        """
+        formato = detectarFormato(caminho, formato)
+        # Conversores recebem o lote inteiro de registros (usuarios resolve as pessoas de uma vez)
+        conversores = {
+            'categorias': (self.__converterCada(self.__categoriaDeRegistro), self.__categoriaDao.salvarEmLote),
+            'pessoas': (self.__converterCada(self.__pessoaDeRegistro), self.__pessoaDao.salvarEmLote),
+            'disciplinas': (self.__converterCada(self.__disciplinaDeRegistro), self.__disciplinaDao.salvarEmLote),
+            'usuarios': (self.__usuariosDeRegistros, self.__usuarioDao.salvarEmLote),
+        }
+        if entidade not in conversores:
+            raise ValueError(f"Entidade desconhecida: '{entidade}'. Opções: {', '.join(conversores)}")
+        converter, salvarEmLote = conversores[entidade]
+
+        total = 0
+        inicio = time.perf_counter()
+        with open(caminho, newline='', encoding='utf-8') as arquivo:
+            for registros in dividirEmLotes(lerRegistros(arquivo, formato), tamanhoLote):
+                try:
+                    # As categorias que o conversor cria (pessoas) entram na transação do lote
+                    with self.__db.transacao():
+                        lote = converter(registros)
+                        try:
+                            salvarEmLote(lote, tamanhoLote)
+                        except Exception as e:
+                            raise RuntimeError(f"Erro no lote iniciado no registro {total + 1}: {e}") from e
+                except Exception:
+                    # Categorias criadas no lote desfeito não existem mais no banco
+                    self.__categorias.clear()
+                    raise
+                total += len(lote)
+                self.__exibir(f"  {total} registro(s) importado(s)...")
+                # Os objetos já gravados não serão mais usados: liberar o identity map
+                self.__db.identityMap.limpar()
+
+        self.__exibirVazao("importado(s)", total, inicio)
+        return total
+
+    def __converterCada(self, converter):
+        """Conversor de lote a partir de um conversor de registro"""
+        return lambda registros: [converter(registro) for registro in registros]
+
+    def __categoriaDeRegistro(self, registro: dict):
+        return Categoria(id=valorOuNone(registro.get('id'), int), nome=registro['nome'])
+
+    def __categoriaPorNome(self, nome: str):
+        """Busca a categoria pelo nome, criando-a se ainda não existir"""
+        categoria = self.__categorias.get(nome)
+        if categoria is None:
+            categoria = self.__categoriaDao.buscarPorNome(nome)
+            if categoria is None:
+                categoria = Categoria(id=None, nome=nome)
+                self.__categoriaDao.salvar(categoria)
+            self.__categorias[nome] = categoria
+        return categoria
+
+    def __pessoaDeRegistro(self, registro: dict):
+        return Pessoa(
+            id=valorOuNone(registro.get('id'), int),
+            nome=registro['nome'],
+            email=registro['email'],
+            altura=valorOuNone(registro.get('altura'), float),
+            peso=valorOuNone(registro.get('peso'), float),
+            dataNascimento=valorOuNone(registro.get('data_nascimento')),
+            ativo=lerBooleano(registro.get('ativo')),
+            telefone=valorOuNone(registro.get('telefone')),
+            categoria=self.__categoriaPorNome(registro['categoria'])
+        )
+
+    def __disciplinaDeRegistro(self, registro: dict):
+        return Disciplina(
+            id=valorOuNone(registro.get('id'), int),
+            nome=registro['nome'],
+            cargaHoraria=valorOuNone(registro.get('carga_horaria'), int),
+            descricao=valorOuNone(registro.get('descricao'))
+        )
+
+    def __usuariosDeRegistros(self, registros: list[dict]):
+        # A pessoa (1:1) é identificada pelo email; sem email, pelo id.
+        # As pessoas do lote são buscadas de uma vez (uma consulta IN por tipo de chave)
+        chaves = [(valorOuNone(r.get('email')), valorOuNone(r.get('id'), int)) for r in registros]
+        porEmail = self.__pessoaDao.buscarPorEmails({email for email, _ in chaves if email})
+        porId = self.__pessoaDao.buscarPorIds({id for email, id in chaves if not email and id is not None})
+
+        usuarios = []
+        for registro, (email, id) in zip(registros, chaves):
+            pessoa = porEmail.get(email.translate(MINUSCULAS_NOCASE)) if email else porId.get(id)
+            if pessoa is None:
+                raise ValueError(f"Pessoa não encontrada para o usuário '{registro.get('login')}'")
+            usuarios.append(Usuario(
+                id=pessoa.id,
+                login=registro['login'],
+                senha=registro['senha'],
+                tipo=registro['tipo'],
+                pessoa=pessoa
+            ))
+        return usuarios
+
+    # Exportação
+
+    def exportar(self, entidade: str, saida, formato: str = 'csv', tamanhoLote: int = 1000):
+        """
+        Escreve todos os registros da entidade em `saida` (arquivo de texto aberto),
+        lendo do banco em lotes (iterarTodas). Retorna o total exportado.
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato desconhecido: '{formato}'. Opções: {', '.join(FORMATOS)}")
+        geradores = {
+            # Categorias são poucas: listarTodas basta
+            'categorias': lambda: (self.__registroDeCategoria(c) for c in self.__categoriaDao.listarTodas()),
+            'pessoas': lambda: (self.__registroDePessoa(p) for p in self.__pessoaDao.iterarTodas(tamanhoLote)),
+            'disciplinas': lambda: (self.__registroDeDisciplina(d)
+                                    for d in self.__disciplinaDao.iterarTodas(tamanhoLote)),
+            'usuarios': lambda: (self.__registroDeUsuario(u) for u in self.__usuarioDao.iterarTodos(tamanhoLote)),
+        }
+        if entidade not in geradores:
+            raise ValueError(f"Entidade desconhecida: '{entidade}'. Opções: {', '.join(geradores)}")
+
+        if formato == 'csv':
+            escritor = csv.DictWriter(saida, fieldnames=COLUNAS[entidade])
+            escritor.writeheader()
+            escrever = escritor.writerow
+        else:
+            def escrever(registro):
+                saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+        total = 0
+        inicio = time.perf_counter()
+        for registro in geradores[entidade]():
+            escrever(registro)
+            total += 1
+            if total % tamanhoLote == 0:
+                self.__exibir(f"  {total} registro(s) exportado(s)...")
+
+        self.__exibirVazao("exportado(s)", total, inicio)
+        return total
+
+    def __registroDeCategoria(self, categoria: Categoria):
+        return {'id': categoria.id, 'nome': categoria.nome}
+
+    def __registroDePessoa(self, pessoa: Pessoa):
+        return {
+            'id': pessoa.id,
+            'nome': pessoa.nome,
+            'email': pessoa.email,
+            'altura': pessoa.altura,
+            'peso': pessoa.peso,
+            'data_nascimento': pessoa.dataNascimento,
+            'ativo': 1 if pessoa.ativo else 0,
+            'telefone': pessoa.telefone,
+            'categoria': pessoa.categoria.nome,
+        }
+
+    def __registroDeDisciplina(self, disciplina: Disciplina):
+        return {
+            'id': disciplina.id,
+            'nome': disciplina.nome,
+            'carga_horaria': disciplina.cargaHoraria,
+            'descricao': disciplina.descricao,
+        }
+
+    def __registroDeUsuario(self, usuario: Usuario):
+        return {
+            'id': usuario.id,
+            'login': usuario.login,
+            'senha': usuario.senha,
+            'tipo': usuario.tipo,
+            'email': usuario.pessoa.email,
+        }
+
+
+def criarParser():
+    parser = argparse.ArgumentParser(description="Importação/exportação e backup de dados do SQLite+POO")
+    parser.add_argument('--db', default='exemplo_bd.db', help="arquivo do banco (padrão: exemplo_bd.db)")
+    parser.add_argument('--lote', type=int, default=1000, help="registros por lote (padrão: 1000)")
+    parser.add_argument('--perfil', choices=list(PERFIS), default='default',
+                        help="perfil de conexão (ex.: throughput para cargas grandes)")
+    parser.add_argument('--fts', action='store_true', help="instala/usa os índices FTS5 nas buscas por nome")
+    parser.add_argument('--contadores', action='store_true',
+                        help="instala/usa os contadores de matrícula (disciplina.total_matriculados)")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    importar = subparsers.add_parser('import', help="importa um arquivo CSV ou JSONL")
+    importar.add_argument('arquivo')
+    importar.add_argument('--entidade', choices=list(COLUNAS),
+                          help="padrão: nome do arquivo (ex.: pessoas.csv -> pessoas)")
+    importar.add_argument('--format', dest='formato', choices=FORMATOS,
+                          help="padrão: extensão do arquivo")
+
+    exportar = subparsers.add_parser('export', help="exporta uma entidade para CSV ou JSONL")
+    exportar.add_argument('entidade', choices=list(COLUNAS))
+    exportar.add_argument('--format', dest='formato', choices=FORMATOS, default='csv')
+    exportar.add_argument('--saida', help="arquivo de saída (padrão: saída padrão)")
+
+    backup = subparsers.add_parser('backup', help="copia o banco (mesmo em uso) para um arquivo; .gz comprime")
+    backup.add_argument('destino')
+    backup.add_argument('--paginas', type=int, default=PAGINAS_POR_PASSO, help="páginas copiadas por passo")
+    backup.add_argument('--pausa', type=float, default=0.0, help="segundos de espera entre os passos")
+
+    restaurar = subparsers.add_parser('restore', help="substitui o conteúdo do banco por um backup")
+    restaurar.add_argument('origem')
+
+    remover = subparsers.add_parser('remove', help="remove um recurso opcional (índices FTS5 ou contadores)")
+    remover.add_argument('recurso', choices=[recurso.nome for recurso in RECURSOS])
+    return parser
+
+
+def exibirProgresso(acao: str):
+    """aoProgredir para fazerBackup/restaurar: percentual na saída de erro"""
+    def aoProgredir(copiadas, total):
+        print(f"\r  {acao}: {copiadas * 100 // max(total, 1):>3}% ({copiadas}/{total} páginas)",
+              end="" if copiadas < total else "\n", file=sys.stderr)
+    return aoProgredir
+
+
+def main(argv=None):
+    """Executa o comando; retorna o código de saída (0 = sucesso)"""
+    args = criarParser().parse_args(argv)
+    db = DatabaseConnection(args.db, perfil=args.perfil, fts=args.fts, contadores=args.contadores)
+
+    try:
+        if args.comando == 'restore':
+            info = restaurar(args.origem, db, aoProgredir=exibirProgresso("restauração"))
+            db.criarTabelas()  # Backup de uma versão anterior do esquema
+            print(f"✓ {info['paginas']} páginas restauradas em {info['segundos']:.1f}s", file=sys.stderr)
+            return 0
+
+        db.criarTabelas()
+        if args.comando == 'remove':
+            removido = db.removerRecurso(args.recurso)
+            print(f"✓ Recurso {args.recurso} {'removido' if removido else 'não estava instalado'}", file=sys.stderr)
+            return 0
+
+        servico = ArquivoService(db)
+
+        if args.comando == 'backup':
+            info = fazerBackup(db, args.destino, args.paginas, args.pausa, aoProgredir=exibirProgresso("backup"))
+            print(f"✓ {info['paginas']} páginas, {info['bytes']} bytes em {info['segundos']:.1f}s", file=sys.stderr)
+        elif args.comando == 'import':
+            entidade = args.entidade or os.path.splitext(os.path.basename(args.arquivo))[0].lower()
+            servico.importar(args.arquivo, entidade, args.formato, args.lote)
+        elif args.saida:
+            with open(args.saida, 'w', newline='', encoding='utf-8') as saida:
+                servico.exportar(args.entidade, saida, args.formato, args.lote)
+        else:
+            servico.exportar(args.entidade, sys.stdout, args.formato, args.lote)
+        return 0
+
+    except Exception as e:
+        print(f"❌ Erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.fechar()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,8 @@ from model.disciplina import Disciplina
 
 
 class DisciplinaService:
+    # Quantidade de registros exibidos por página nas listagens
+    TAMANHO_PAGINA = 20
     
     def __init__(self, db: DatabaseConnection):
         self.__db = db
@@ -36,6 +38,7 @@ class DisciplinaService:
         print("8. Desvincular pessoa de disciplina")
         print("9. Listar pessoas de uma disciplina")
         print("10. Listar disciplinas de uma pessoa")
+        print("11. Estatísticas de matrículas")
         print("0. Sair")
         print("="*50)
     
@@ -92,20 +95,36 @@ class DisciplinaService:
         print("\n--- LISTAR TODAS AS DISCIPLINAS ---")
         
         try:
-            disciplinas = self.__disciplinaDao.listarTodas()
+            total = self.__disciplinaDao.contar()
             
-            if not disciplinas:
+            if not total:
                 print("⚠️  Nenhuma disciplina cadastrada.")
                 return
             
-            print(f"\nTotal de disciplinas: {len(disciplinas)}")
+            print(f"\nTotal de disciplinas: {total}")
             print("\n" + "-"*80)
-            print(f"{'ID':<5} | {'Nome':<40} | {'Carga Horária':<15}")
+            print(f"{'ID':<5} | {'Nome':<40} | {'Carga Horária':<15} | {'Matriculados':<12}")
             print("-"*80)
             
-            for disciplina in disciplinas:
-                cargaHoraria = f"{disciplina.cargaHoraria}h" if disciplina.cargaHoraria else "N/A"
-                print(f"{disciplina.id:<5} | {disciplina.nome[:39]:<40} | {cargaHoraria:<15}")
+            ultima = None
+            while True:
+                if ultima is None:
+                    disciplinas = self.__disciplinaDao.listarPagina(limite=self.TAMANHO_PAGINA)
+                else:
+                    disciplinas = self.__disciplinaDao.listarPagina(ultima.nome, ultima.id, self.TAMANHO_PAGINA)
+                
+                # Uma consulta por página (ou leitura de total_matriculados, com contadores ativos)
+                totais = self.__disciplinaDao.contarPorDisciplina([d.id for d in disciplinas])
+                for disciplina in disciplinas:
+                    cargaHoraria = f"{disciplina.cargaHoraria}h" if disciplina.cargaHoraria else "N/A"
+                    print(f"{disciplina.id:<5} | {disciplina.nome[:39]:<40} | {cargaHoraria:<15} | {totais.get(disciplina.id, 0):<12}")
+                
+                if len(disciplinas) < self.TAMANHO_PAGINA:
+                    break
+                continuar = input("Enter para a próxima página, 'q' para parar: ").strip().lower()
+                if continuar == 'q':
+                    break
+                ultima = disciplinas[-1]
             
             print("-"*80)
         
@@ -163,6 +182,8 @@ class DisciplinaService:
         """Solicita dados do usuário e atualiza uma disciplina existente"""
         print("\n--- ATUALIZAR DISCIPLINA ---")
         
+        disciplinaId = None
+        
         try:
             idStr = input("Digite o ID da disciplina a atualizar: ").strip()
             disciplinaId = int(idStr)
@@ -208,6 +229,10 @@ class DisciplinaService:
             print(f"❌ Erro: {e}")
         except Exception as e:
             print(f"❌ Erro ao atualizar disciplina: {e}")
+        finally:
+            # Descartar do identity map alterações feitas no objeto e não salvas
+            if disciplinaId is not None:
+                self.__disciplinaDao.invalidar(disciplinaId)
     
     def deletarDisciplina(self):
         """Solicita um ID e deleta a disciplina correspondente"""
@@ -244,6 +269,22 @@ class DisciplinaService:
         except Exception as e:
             print(f"❌ Erro ao deletar disciplina: {e}")
     
+    def exibirPessoasDisponiveis(self):
+        """Lista as pessoas para a escolha de um ID, página a página (paginação por chave)"""
+        print("\nPessoas disponíveis:")
+        pessoas = self.__pessoaDao.listarPagina(limite=self.TAMANHO_PAGINA)
+        while True:
+            for p in pessoas:
+                print(f"  {p.id}. {p.nome} - {p.email}")
+            
+            if len(pessoas) < self.TAMANHO_PAGINA:
+                break
+            continuar = input("Enter para a próxima página, 'q' para escolher: ").strip().lower()
+            if continuar == 'q':
+                break
+            ultima = pessoas[-1]
+            pessoas = self.__pessoaDao.listarPagina(ultima.nome, ultima.id, self.TAMANHO_PAGINA)
+    
     def vincularPessoa(self):
         """Vincula uma pessoa a uma disciplina"""
         print("\n--- VINCULAR PESSOA A DISCIPLINA ---")
@@ -268,16 +309,17 @@ class DisciplinaService:
                 return
             
             # Selecionar pessoa
-            pessoas = self.__pessoaDao.listarTodas()
-            if not pessoas:
+            if not self.__pessoaDao.contar():
                 print("⚠️  Nenhuma pessoa cadastrada.")
                 return
             
-            print("\nPessoas disponíveis:")
-            for p in pessoas:
-                print(f"  {p.id}. {p.nome} - {p.email}")
+            self.exibirPessoasDisponiveis()
+            
+            pessoaIdStr = input("\nDigite o ID da pessoa (ou vários IDs separados por vírgula): ").strip()
+            if ',' in pessoaIdStr:
+                self.vincularPessoasEmLote(disciplina, pessoaIdStr)
+                return
             
-            pessoaIdStr = input("\nDigite o ID da pessoa: ").strip()
             pessoaId = int(pessoaIdStr)
             pessoa = self.__pessoaDao.buscarPorId(pessoaId)
             
@@ -303,6 +345,24 @@ class DisciplinaService:
         except Exception as e:
             print(f"❌ Erro ao vincular pessoa: {e}")
     
+    def vincularPessoasEmLote(self, disciplina: Disciplina, pessoaIdsStr: str):
+        """Vincula de uma vez as pessoas informadas (IDs separados por vírgula)"""
+        pessoaIds = {int(parte) for parte in pessoaIdsStr.split(',') if parte.strip()}
+        
+        # Uma consulta IN para todos os ids, sem carregar as pessoas
+        existentes = sorted(self.__pessoaDao.idsExistentes(pessoaIds))
+        naoEncontrados = sorted(pessoaIds.difference(existentes))
+        
+        if naoEncontrados:
+            print(f"⚠️  IDs não encontrados (ignorados): {', '.join(map(str, naoEncontrados))}")
+        if not existentes:
+            print("❌ Erro: Nenhuma pessoa válida informada!")
+            return
+        
+        adicionados = self.__disciplinaDao.vincularPessoasEmLote(disciplina, existentes)
+        print(f"\n✅ {adicionados} pessoa(s) vinculada(s) à disciplina '{disciplina.nome}' "
+              f"({len(existentes) - adicionados} já estavam vinculadas).")
+    
     def desvincularPessoa(self):
         """Remove o vínculo entre uma pessoa e uma disciplina"""
         print("\n--- DESVINCULAR PESSOA DE DISCIPLINA ---")
@@ -366,9 +426,10 @@ class DisciplinaService:
                 print("⚠️  Nenhuma disciplina cadastrada.")
                 return
             
+            totais = self.__disciplinaDao.contarPorDisciplina()
             print("\nDisciplinas disponíveis:")
             for d in disciplinas:
-                print(f"  {d.id}. {d.nome}")
+                print(f"  {d.id}. {d.nome} ({totais.get(d.id, 0)} matriculado(s))")
             
             disciplinaIdStr = input("\nDigite o ID da disciplina: ").strip()
             disciplinaId = int(disciplinaIdStr)
@@ -378,7 +439,8 @@ class DisciplinaService:
                 print(f"❌ Erro: Disciplina com ID {disciplinaId} não encontrada!")
                 return
             
-            pessoas = self.__disciplinaDao.buscarPessoasPorDisciplina(disciplinaId)
+            # Sem vínculos: nem consultar as pessoas
+            pessoas = self.__disciplinaDao.buscarPessoasPorDisciplina(disciplinaId) if totais.get(disciplinaId) else []
             
             if pessoas:
                 print(f"\n✅ {len(pessoas)} pessoa(s) vinculada(s) à disciplina '{disciplina.nome}':")
@@ -399,14 +461,11 @@ class DisciplinaService:
         print("\n--- LISTAR DISCIPLINAS DE UMA PESSOA ---")
         
         try:
-            pessoas = self.__pessoaDao.listarTodas()
-            if not pessoas:
+            if not self.__pessoaDao.contar():
                 print("⚠️  Nenhuma pessoa cadastrada.")
                 return
             
-            print("\nPessoas disponíveis:")
-            for p in pessoas:
-                print(f"  {p.id}. {p.nome} - {p.email}")
+            self.exibirPessoasDisponiveis()
             
             pessoaIdStr = input("\nDigite o ID da pessoa: ").strip()
             pessoaId = int(pessoaIdStr)
@@ -433,6 +492,33 @@ class DisciplinaService:
         except Exception as e:
             print(f"❌ Erro ao listar disciplinas: {e}")
     
+    def exibirEstatisticas(self):
+        """Exibe matriculados e horas totais por disciplina"""
+        print("\n--- ESTATÍSTICAS DE MATRÍCULAS ---")
+        
+        try:
+            estatisticas = self.__disciplinaDao.estatisticasCargaHoraria()
+            
+            if not estatisticas:
+                print("⚠️  Nenhuma disciplina cadastrada.")
+                return
+            
+            print("\n" + "-"*80)
+            print(f"{'ID':<5} | {'Nome':<30} | {'Carga':<7} | {'Matriculados':<12} | {'Horas totais':<12}")
+            print("-"*80)
+            for linha in estatisticas:
+                cargaHoraria = f"{linha['cargaHoraria']}h" if linha['cargaHoraria'] else "N/A"
+                print(f"{linha['disciplinaId']:<5} | {linha['nome'][:29]:<30} | {cargaHoraria:<7} | "
+                      f"{linha['matriculados']:<12} | {linha['horasTotais']:<12}")
+            print("-"*80)
+            
+            totalMatriculas = sum(linha['matriculados'] for linha in estatisticas)
+            totalHoras = sum(linha['horasTotais'] for linha in estatisticas)
+            print(f"Total: {totalMatriculas} matrícula(s), {totalHoras}h")
+        
+        except Exception as e:
+            print(f"❌ Erro ao calcular estatísticas: {e}")
+    
     def executar(self):
         """Método principal que executa o loop do menu"""
         try:
@@ -440,31 +526,34 @@ class DisciplinaService:
                 self.exibirMenu()
                 opcao = input("\nEscolha uma opção: ").strip()
                 
-                if opcao == '0':
-                    print("\n👋 Encerrando o sistema...")
-                    break
-                elif opcao == '1':
-                    self.criarDisciplina()
-                elif opcao == '2':
-                    self.listarDisciplinas()
-                elif opcao == '3':
-                    self.buscarPorId()
-                elif opcao == '4':
-                    self.buscarPorNome()
-                elif opcao == '5':
-                    self.atualizarDisciplina()
-                elif opcao == '6':
-                    self.deletarDisciplina()
-                elif opcao == '7':
-                    self.vincularPessoa()
-                elif opcao == '8':
-                    self.desvincularPessoa()
-                elif opcao == '9':
-                    self.listarPessoasDisciplina()
-                elif opcao == '10':
-                    self.listarDisciplinasPessoa()
-                else:
-                    print("❌ Opção inválida! Tente novamente.")
+                with self.__db.escopo(f"Disciplinas: opção {opcao}"):
+                    if opcao == '0':
+                        print("\n👋 Encerrando o sistema...")
+                        break
+                    elif opcao == '1':
+                        self.criarDisciplina()
+                    elif opcao == '2':
+                        self.listarDisciplinas()
+                    elif opcao == '3':
+                        self.buscarPorId()
+                    elif opcao == '4':
+                        self.buscarPorNome()
+                    elif opcao == '5':
+                        self.atualizarDisciplina()
+                    elif opcao == '6':
+                        self.deletarDisciplina()
+                    elif opcao == '7':
+                        self.vincularPessoa()
+                    elif opcao == '8':
+                        self.desvincularPessoa()
+                    elif opcao == '9':
+                        self.listarPessoasDisciplina()
+                    elif opcao == '10':
+                        self.listarDisciplinasPessoa()
+                    elif opcao == '11':
+                        self.exibirEstatisticas()
+                    else:
+                        print("❌ Opção inválida! Tente novamente.")
                 
                 input("\nPressione Enter para continuar...")
         
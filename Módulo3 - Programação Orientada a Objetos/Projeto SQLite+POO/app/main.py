@@ -1,6 +1,7 @@
 """
 Sistema principal de gerenciamento com menu unificado
 Permite ao usuário escolher entre gerenciar Categorias, Usuários (com Pessoa) ou Disciplinas
+Uso: python3 app/main.py [--rastrear]   (--rastrear exibe um relatório dos comandos SQL ao sair)
 """
 import sys
 import os
@@ -75,7 +76,9 @@ class SistemaPrincipal:
 
 def main():
     """Função principal para executar o sistema"""
-    db = DatabaseConnection('exemplo_bd.db')
+    opcoes = sys.argv[1:]
+    db = DatabaseConnection('exemplo_bd.db', fts='--fts' in opcoes, contadores='--contadores' in opcoes)
+    rastreador = db.ativarRastreamento() if '--rastrear' in opcoes else None
     
     try:
         # Conectar ao banco
@@ -93,6 +96,8 @@ def main():
         import traceback
         traceback.print_exc()
     finally:
+        if rastreador is not None:
+            print("\n" + rastreador.relatorio())
         db.fechar()
         print("✓ Conexão com banco de dados encerrada.")
 
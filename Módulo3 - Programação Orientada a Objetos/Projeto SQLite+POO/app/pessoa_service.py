@@ -14,6 +14,8 @@ from model.pessoa import Pessoa
 
 
 class PessoaService:
+    # Quantidade de registros exibidos por página nas listagens
+    TAMANHO_PAGINA = 20
     
     def __init__(self, db: DatabaseConnection):
         self.__db = db
@@ -84,12 +86,10 @@ class PessoaService:
             return
         
         # Verificar se já existe uma pessoa com esse email
-        pessoasExistentes = self.__pessoaDao.buscarPorNome("")  # Buscar todas para verificar email
-        todasPessoas = self.__pessoaDao.listarTodas()
-        for p in todasPessoas:
-            if p.email.lower() == email.lower():
-                print(f"❌ Erro: Já existe uma pessoa com o email '{email}' (ID: {p.id})")
-                return
+        idExistente = self.__pessoaDao.existeEmail(email)
+        if idExistente:
+            print(f"❌ Erro: Já existe uma pessoa com o email '{email}' (ID: {idExistente})")
+            return
         
         # Selecionar categoria
         categoria = self.selecionarCategoria()
@@ -155,20 +155,35 @@ class PessoaService:
         print("\n--- LISTAR TODAS AS PESSOAS ---")
         
         try:
-            pessoas = self.__pessoaDao.listarTodas()
+            total = self.__pessoaDao.contar()
             
-            if not pessoas:
+            if not total:
                 print("⚠️  Nenhuma pessoa cadastrada.")
                 return
             
-            print(f"\nTotal de pessoas: {len(pessoas)}")
+            print(f"\nTotal de pessoas: {total}")
             print("\n" + "-"*80)
             print(f"{'ID':<5} | {'Nome':<25} | {'Email':<25} | {'Categoria':<15} | {'Status':<8}")
             print("-"*80)
             
-            for pessoa in pessoas:
-                status = "Ativa" if pessoa.ativo else "Inativa"
-                print(f"{pessoa.id:<5} | {pessoa.nome[:24]:<25} | {pessoa.email[:24]:<25} | {pessoa.categoria.nome[:14]:<15} | {status:<8}")
+            # Página a página: apenas TAMANHO_PAGINA pessoas em memória por vez
+            ultima = None
+            while True:
+                if ultima is None:
+                    pessoas = self.__pessoaDao.listarPagina(limite=self.TAMANHO_PAGINA)
+                else:
+                    pessoas = self.__pessoaDao.listarPagina(ultima.nome, ultima.id, self.TAMANHO_PAGINA)
+                
+                for pessoa in pessoas:
+                    status = "Ativa" if pessoa.ativo else "Inativa"
+                    print(f"{pessoa.id:<5} | {pessoa.nome[:24]:<25} | {pessoa.email[:24]:<25} | {pessoa.categoria.nome[:14]:<15} | {status:<8}")
+                
+                if len(pessoas) < self.TAMANHO_PAGINA:
+                    break
+                continuar = input("Enter para a próxima página, 'q' para parar: ").strip().lower()
+                if continuar == 'q':
+                    break
+                ultima = pessoas[-1]
             
             print("-"*80)
         
@@ -259,6 +274,8 @@ class PessoaService:
         """Solicita dados do usuário e atualiza uma pessoa existente"""
         print("\n--- ATUALIZAR PESSOA ---")
         
+        pessoaId = None
+        
         try:
             idStr = input("Digite o ID da pessoa a atualizar: ").strip()
             pessoaId = int(idStr)
@@ -283,11 +300,10 @@ class PessoaService:
             novoEmail = input(f"Email [{pessoa.email}]: ").strip()
             if novoEmail:
                 # Verificar se já existe outra pessoa com esse email
-                todasPessoas = self.__pessoaDao.listarTodas()
-                for p in todasPessoas:
-                    if p.id != pessoaId and p.email.lower() == novoEmail.lower():
-                        print(f"❌ Erro: Já existe outra pessoa com o email '{novoEmail}' (ID: {p.id})")
-                        return
+                idExistente = self.__pessoaDao.existeEmail(novoEmail, ignorarId=pessoaId)
+                if idExistente:
+                    print(f"❌ Erro: Já existe outra pessoa com o email '{novoEmail}' (ID: {idExistente})")
+                    return
                 pessoa.email = novoEmail
             
             # Categoria
@@ -334,6 +350,10 @@ class PessoaService:
             print(f"❌ Erro: {e}")
         except Exception as e:
             print(f"❌ Erro ao atualizar pessoa: {e}")
+        finally:
+            # Descartar do identity map alterações feitas no objeto e não salvas
+            if pessoaId is not None:
+                self.__pessoaDao.invalidar(pessoaId)
     
     def deletarPessoa(self):
         """Solicita um ID e deleta a pessoa correspondente"""
@@ -377,25 +397,26 @@ class PessoaService:
                 self.exibirMenu()
                 opcao = input("\nEscolha uma opção: ").strip()
                 
-                if opcao == '0':
-                    print("\n👋 Encerrando o sistema...")
-                    break
-                elif opcao == '1':
-                    self.criarPessoa()
-                elif opcao == '2':
-                    self.listarPessoas()
-                elif opcao == '3':
-                    self.buscarPorId()
-                elif opcao == '4':
-                    self.buscarPorNome()
-                elif opcao == '5':
-                    self.buscarPorCategoria()
-                elif opcao == '6':
-                    self.atualizarPessoa()
-                elif opcao == '7':
-                    self.deletarPessoa()
-                else:
-                    print("❌ Opção inválida! Tente novamente.")
+                with self.__db.escopo(f"Pessoas: opção {opcao}"):
+                    if opcao == '0':
+                        print("\n👋 Encerrando o sistema...")
+                        break
+                    elif opcao == '1':
+                        self.criarPessoa()
+                    elif opcao == '2':
+                        self.listarPessoas()
+                    elif opcao == '3':
+                        self.buscarPorId()
+                    elif opcao == '4':
+                        self.buscarPorNome()
+                    elif opcao == '5':
+                        self.buscarPorCategoria()
+                    elif opcao == '6':
+                        self.atualizarPessoa()
+                    elif opcao == '7':
+                        self.deletarPessoa()
+                    else:
+                        print("❌ Opção inválida! Tente novamente.")
                 
                 input("\nPressione Enter para continuar...")
         
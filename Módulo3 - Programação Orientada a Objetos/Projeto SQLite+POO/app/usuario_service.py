@@ -16,6 +16,8 @@ from model.pessoa import Pessoa
 
 
 class UsuarioService:
+    # Quantidade de registros exibidos por página nas listagens
+    TAMANHO_PAGINA = 20
     
     def __init__(self, db: DatabaseConnection):
         self.__db = db
@@ -39,26 +41,38 @@ class UsuarioService:
         print("="*50)
     
     def listarPessoasDisponiveis(self):
-        """Lista todas as pessoas disponíveis para vincular a um usuário"""
-        pessoas = self.__pessoaDao.listarTodas()
+        """
+        Lista as pessoas sem usuário, disponíveis para vincular a um usuário, página
+        a página (anti-join com usuario, paginação por chave).
+        Retorna True se há pessoas disponíveis.
+        """
+        pessoas = self.__pessoaDao.listarPaginaSemUsuario(limite=self.TAMANHO_PAGINA)
         if not pessoas:
-            print("⚠️  Nenhuma pessoa cadastrada. Cadastre uma pessoa primeiro!")
-            return None
+            if self.__pessoaDao.contar():
+                print("⚠️  Todas as pessoas já possuem usuário!")
+            else:
+                print("⚠️  Nenhuma pessoa cadastrada. Cadastre uma pessoa primeiro!")
+            return False
         
         print("\nPessoas disponíveis:")
         print("-"*50)
-        for p in pessoas:
-            # Verificar se já tem usuário
-            usuarioExistente = self.__usuarioDao.buscarPorPessoaId(p.id)
-            status = " (já tem usuário)" if usuarioExistente else ""
-            print(f"  {p.id}. {p.nome} - {p.email}{status}")
+        while True:
+            for p in pessoas:
+                print(f"  {p.id}. {p.nome} - {p.email}")
+            
+            if len(pessoas) < self.TAMANHO_PAGINA:
+                break
+            continuar = input("Enter para a próxima página, 'q' para escolher: ").strip().lower()
+            if continuar == 'q':
+                break
+            ultima = pessoas[-1]
+            pessoas = self.__pessoaDao.listarPaginaSemUsuario(ultima.nome, ultima.id, self.TAMANHO_PAGINA)
         print("-"*50)
-        return pessoas
+        return True
     
     def selecionarPessoa(self):
         """Solicita ao usuário que selecione uma pessoa sem usuário"""
-        pessoas = self.listarPessoasDisponiveis()
-        if not pessoas:
+        if not self.listarPessoasDisponiveis():
             return None
         
         try:
@@ -132,11 +146,10 @@ class UsuarioService:
             return
         
         # Verificar se já existe uma pessoa com esse email
-        todasPessoas = self.__pessoaDao.listarTodas()
-        for p in todasPessoas:
-            if p.email.lower() == email.lower():
-                print(f"❌ Erro: Já existe uma pessoa com o email '{email}' (ID: {p.id})")
-                return
+        idExistente = self.__pessoaDao.existeEmail(email)
+        if idExistente:
+            print(f"❌ Erro: Já existe uma pessoa com o email '{email}' (ID: {idExistente})")
+            return
         
         # Selecionar categoria
         categoria = self.selecionarCategoria()
@@ -196,8 +209,6 @@ class UsuarioService:
                 telefone=telefone
             )
             
-            pessoaId = self.__pessoaDao.salvar(pessoa)
-            
             # Criar o usuário vinculado à pessoa (transparente para o usuário)
             usuario = Usuario(
                 id=None,
@@ -207,7 +218,17 @@ class UsuarioService:
                 pessoa=pessoa
             )
             
-            usuarioId = self.__usuarioDao.salvar(usuario)
+            # Pessoa e usuário são gravados juntos: um único commit,
+            # e nenhuma pessoa "órfã" fica no banco se o usuário falhar
+            try:
+                with self.__db.transacao():
+                    self.__pessoaDao.salvar(pessoa)
+                    usuarioId = self.__usuarioDao.salvar(usuario)
+            except Exception:
+                pessoa.id = None
+                usuario.id = None
+                raise
+            
             print(f"\n✅ Usuário cadastrado com sucesso! (ID: {usuarioId})")
             self.exibirDetalhesUsuario(usuario)
         
@@ -244,19 +265,30 @@ class UsuarioService:
         print("\n--- LISTAR TODOS OS USUÁRIOS ---")
         
         try:
-            usuarios = self.__usuarioDao.listarTodos()
+            total = self.__usuarioDao.contar()
             
-            if not usuarios:
+            if not total:
                 print("⚠️  Nenhum usuário cadastrado.")
                 return
             
-            print(f"\nTotal de usuários: {len(usuarios)}")
+            print(f"\nTotal de usuários: {total}")
             print("\n" + "-"*80)
             print(f"{'ID':<5} | {'Login':<20} | {'Tipo':<15} | {'Pessoa':<30}")
             print("-"*80)
             
-            for usuario in usuarios:
-                print(f"{usuario.id:<5} | {usuario.login[:19]:<20} | {usuario.tipo[:14]:<15} | {usuario.pessoa.nome[:29]:<30}")
+            ultimoLogin = None
+            while True:
+                usuarios = self.__usuarioDao.listarPagina(ultimoLogin, self.TAMANHO_PAGINA)
+                
+                for usuario in usuarios:
+                    print(f"{usuario.id:<5} | {usuario.login[:19]:<20} | {usuario.tipo[:14]:<15} | {usuario.pessoa.nome[:29]:<30}")
+                
+                if len(usuarios) < self.TAMANHO_PAGINA:
+                    break
+                continuar = input("Enter para a próxima página, 'q' para parar: ").strip().lower()
+                if continuar == 'q':
+                    break
+                ultimoLogin = usuarios[-1].login
             
             print("-"*80)
         
@@ -336,6 +368,8 @@ class UsuarioService:
         """Solicita dados do usuário e atualiza um usuário existente"""
         print("\n--- ATUALIZAR USUÁRIO ---")
         
+        usuarioId = None
+        
         try:
             idStr = input("Digite o ID do usuário a atualizar: ").strip()
             usuarioId = int(idStr)
@@ -380,6 +414,10 @@ class UsuarioService:
             print(f"❌ Erro: {e}")
         except Exception as e:
             print(f"❌ Erro ao atualizar usuário: {e}")
+        finally:
+            # Descartar do identity map alterações feitas no objeto e não salvas
+            if usuarioId is not None:
+                self.__usuarioDao.invalidar(usuarioId)
     
     def deletarUsuario(self):
         """Solicita um ID e deleta o usuário correspondente"""
@@ -423,25 +461,26 @@ class UsuarioService:
                 self.exibirMenu()
                 opcao = input("\nEscolha uma opção: ").strip()
                 
-                if opcao == '0':
-                    print("\n👋 Encerrando o sistema...")
-                    break
-                elif opcao == '1':
-                    self.criarUsuario()
-                elif opcao == '2':
-                    self.listarUsuarios()
-                elif opcao == '3':
-                    self.buscarPorId()
-                elif opcao == '4':
-                    self.buscarPorLogin()
-                elif opcao == '5':
-                    self.buscarPorPessoa()
-                elif opcao == '6':
-                    self.atualizarUsuario()
-                elif opcao == '7':
-                    self.deletarUsuario()
-                else:
-                    print("❌ Opção inválida! Tente novamente.")
+                with self.__db.escopo(f"Usuários: opção {opcao}"):
+                    if opcao == '0':
+                        print("\n👋 Encerrando o sistema...")
+                        break
+                    elif opcao == '1':
+                        self.criarUsuario()
+                    elif opcao == '2':
+                        self.listarUsuarios()
+                    elif opcao == '3':
+                        self.buscarPorId()
+                    elif opcao == '4':
+                        self.buscarPorLogin()
+                    elif opcao == '5':
+                        self.buscarPorPessoa()
+                    elif opcao == '6':
+                        self.atualizarUsuario()
+                    elif opcao == '7':
+                        self.deletarUsuario()
+                    else:
+                        print("❌ Opção inválida! Tente novamente.")
                 
                 input("\nPressione Enter para continuar...")
         
@@ -0,0 +1,150 @@
+"""
+Backup e restauração do banco com a API de backup do SQLite (Connection.backup).
+A cópia é feita em passos de N páginas: entre um passo e outro o banco fica livre,
+então os DAOs continuam atendendo enquanto um arquivo grande é copiado.
+Destinos terminados em .gz são comprimidos.
+"""
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from bd.cache_tabela import invalidarCaches
+from bd.caminho_banco import arquivoDoBanco
+from bd.database import TAMANHO_CACHE_SQL, DatabaseConnection
+
+# Páginas copiadas por passo (com páginas de 4 KiB, 4 MiB por passo)
+PAGINAS_POR_PASSO = 1024
+# Bytes lidos/escritos por vez ao comprimir/descomprimir
+TAMANHO_BLOCO = 1024 * 1024
+
+
+def ehComprimido(caminho: str):
+    return str(caminho).endswith('.gz')
+
+
+def _copiar(origem, destino, paginasPorPasso, pausa, aoProgredir):
+    """Executa origem.backup(destino) em passos (paginasPorPasso <= 0: tudo de uma vez); retorna o total de páginas"""
+    paginas = [0]
+
+    def progresso(status, restantes, total):
+        paginas[0] = total
+        if aoProgredir is not None:
+            aoProgredir(total - restantes, total)
+        if pausa and restantes:
+            # Entre os passos a origem fica sem lock: a aplicação usa o disco neste intervalo
+            time.sleep(pausa)
+
+    origem.backup(destino, pages=paginasPorPasso, progress=progresso)
+    return paginas[0]
+
+
+def _conexaoOrigem(db: DatabaseConnection):
+    """
+    Conexão só de leitura ao arquivo de db, separada da usada pelos DAOs (o backup pode
+    rodar em outra thread). Em bancos em memória a cópia usa a própria conexão de db.
+    """
+    arquivo = arquivoDoBanco(db.dbPath)
+    if arquivo is None:
+        return db.conectar(), False
+    uri = Path(arquivo).absolute().as_uri() + '?mode=ro'
+    return sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=TAMANHO_CACHE_SQL), True
+
+
+def fazerBackup(db: DatabaseConnection, destino: str, paginasPorPasso: int = PAGINAS_POR_PASSO,
+                pausa: float = 0.0, comprimir: bool | None = None, aoProgredir=None):
+    """
+    Copia o banco de db para o arquivo destino com o banco em uso.
+    pausa: segundos de espera entre os passos (limita o uso de disco).
+    comprimir: gzip; None = conforme a extensão .gz de destino.
+    aoProgredir(copiadas, total) é chamado após cada passo (páginas).
+    O arquivo só aparece em destino ao final: um backup interrompido não substitui o anterior.
+    Retorna um dicionário com paginas, bytes e segundos.
+
+    Se outra conexão gravar no banco durante a cópia, o SQLite recomeça a cópia no
+    passo seguinte; com escrita contínua, use passos maiores (ou -1 para copiar tudo de uma vez).
+    """
+    comprimir = ehComprimido(destino) if comprimir is None else comprimir
+    diretorio = os.path.dirname(os.path.abspath(destino))
+    inicio = time.perf_counter()
+
+    origem, fecharOrigem = _conexaoOrigem(db)
+    descritor, parcial = tempfile.mkstemp(prefix='.backup-', suffix='.db', dir=diretorio)
+    os.close(descritor)
+    try:
+        copia = sqlite3.connect(parcial)
+        try:
+            paginas = _copiar(origem, copia, paginasPorPasso, pausa, aoProgredir)
+        finally:
+            copia.close()
+
+        if comprimir:
+            descritor, comprimido = tempfile.mkstemp(prefix='.backup-', suffix='.gz', dir=diretorio)
+            with os.fdopen(descritor, 'wb') as bruto, gzip.GzipFile(fileobj=bruto, mode='wb', compresslevel=6) as saida, \
+                    open(parcial, 'rb') as entrada:
+                shutil.copyfileobj(entrada, saida, TAMANHO_BLOCO)
+            os.remove(parcial)
+            parcial = comprimido
+
+        os.replace(parcial, destino)
+    except BaseException:
+        if os.path.exists(parcial):
+            os.remove(parcial)
+        raise
+    finally:
+        if fecharOrigem:
+            origem.close()
+
+    return {'paginas': paginas, 'bytes': os.path.getsize(destino), 'segundos': time.perf_counter() - inicio}
+
+
+def restaurar(origem: str, db: DatabaseConnection, paginasPorPasso: int = PAGINAS_POR_PASSO,
+              pausa: float = 0.0, aoProgredir=None):
+    """
+    Substitui o conteúdo do banco de db pelo backup origem (.db ou .db.gz).
+    A escrita passa pela conexão de db, então funciona também com bancos em memória.
+    Retorna um dicionário com paginas e segundos.
+    """
+    inicio = time.perf_counter()
+    temporario = None
+    try:
+        if ehComprimido(origem):
+            descritor, temporario = tempfile.mkstemp(prefix='.restauracao-', suffix='.db')
+            with os.fdopen(descritor, 'wb') as saida, gzip.open(origem, 'rb') as entrada:
+                shutil.copyfileobj(entrada, saida, TAMANHO_BLOCO)
+            origem = temporario
+        elif not os.path.exists(origem):
+            # sqlite3.connect criaria um banco vazio e a restauração apagaria os dados
+            raise FileNotFoundError(f"Backup não encontrado: {origem}")
+
+        fonte = sqlite3.connect(Path(origem).absolute().as_uri() + '?mode=ro', uri=True)
+        try:
+            paginas = _copiar(fonte, db.conectar(), paginasPorPasso, pausa, aoProgredir)
+        finally:
+            fonte.close()
+    finally:
+        if temporario is not None:
+            os.remove(temporario)
+
+    # Objetos e caches carregados antes não correspondem mais ao banco
+    db.identityMap.limpar()
+    invalidarCaches(db)
+    return {'paginas': paginas, 'segundos': time.perf_counter() - inicio}
+
+
+def restaurarEmMemoria(origem: str, **opcoes):
+    """
+    Novo DatabaseConnection(':memory:') com o conteúdo do backup origem.
+    Útil em testes: cada teste parte do mesmo conjunto de dados, sem reinserir as linhas.
+    opcoes vão para o construtor (ex.: fts=True, contadores=True).
+    """
+    db = DatabaseConnection(':memory:', **opcoes)
+    try:
+        restaurar(origem, db, paginasPorPasso=-1)
+    except BaseException:
+        db.fechar()
+        raise
+    return db
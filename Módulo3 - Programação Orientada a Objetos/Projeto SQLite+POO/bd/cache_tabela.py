@@ -0,0 +1,151 @@
+"""
+Cache de tabelas pequenas e pouco alteradas (ex.: categoria), compartilhado por
+todas as conexões do processo ao mesmo arquivo de banco. A tabela é lida
+inteira de uma vez e indexada por id e por nome; qualquer alteração feita pelos
+DAOs invalida a tabela toda, que é recarregada na próxima consulta.
+Com ttl, a tabela também é recarregada após ttl segundos (para quando outro
+processo pode alterar o mesmo arquivo).
+"""
+import threading
+import time
+import weakref
+
+from bd.caminho_banco import chaveBanco
+
+# Segundos até recarregar a tabela mesmo sem alterações; None = só ao invalidar
+TTL_PADRAO = None
+
+_caches = {}                                  # (chaveBanco, tabela) -> CacheTabela
+_cachesMemoria = weakref.WeakKeyDictionary()  # db -> {tabela: CacheTabela} (':memory:' é um banco por conexão)
+_lockRegistro = threading.Lock()
+
+
+class CacheTabela:
+    def __init__(self, tabela: str, ttl: float | None = None):
+        self.__tabela = tabela
+        self.ttl = ttl
+        self.__porId = None
+        self.__porNome = None
+        self.__carregadoEm = 0.0
+        # Incrementada a cada invalidação: uma carga iniciada antes dela não é guardada
+        self.__geracao = 0
+        # Conexões com alterações ainda não confirmadas: consultam o banco direto até o COMMIT/ROLLBACK
+        self.__pendentes = weakref.WeakSet()
+        self.__lock = threading.Lock()
+        self.__contadores = {'acertos': 0, 'falhas': 0, 'desvios': 0, 'invalidacoes': 0}
+
+    @property
+    def tabela(self):
+        return self.__tabela
+
+    @property
+    def estatisticas(self):
+        """acertos, falhas (recargas), desvios (consultas direto ao banco), invalidacoes e linhas em cache"""
+        with self.__lock:
+            estatisticas = dict(self.__contadores)
+            estatisticas['linhas'] = len(self.__porId) if self.__porId is not None else 0
+        return estatisticas
+
+    def usavel(self, db):
+        """False se db alterou a tabela na transação atual (o cache não tem essas alterações)"""
+        if db in self.__pendentes:
+            with self.__lock:
+                self.__contadores['desvios'] += 1
+            return False
+        return True
+
+    def buscarPorId(self, db, id: int):
+        """Linha (id, nome, ...) ou None"""
+        return self.__indices(db)[0].get(id)
+
+    def buscarPorNome(self, db, nome: str):
+        return self.__indices(db)[1].get(nome)
+
+    def linhas(self, db):
+        return list(self.__indices(db)[0].values())
+
+    def __indices(self, db):
+        with self.__lock:
+            if self.__porId is not None and (self.ttl is None or time.monotonic() - self.__carregadoEm < self.ttl):
+                self.__contadores['acertos'] += 1
+                return self.__porId, self.__porNome
+            self.__contadores['falhas'] += 1
+            geracao = self.__geracao
+
+        cur = db.cursor()
+        cur.execute(f"SELECT * FROM {self.__tabela};")
+        porId = {}
+        porNome = {}
+        for row in cur.fetchall():
+            linha = tuple(row)
+            porId[linha[0]] = linha
+            porNome[linha[1]] = linha
+
+        with self.__lock:
+            if geracao == self.__geracao:
+                self.__porId, self.__porNome = porId, porNome
+                self.__carregadoEm = time.monotonic()
+        return porId, porNome
+
+    def invalidar(self):
+        with self.__lock:
+            self.__geracao += 1
+            self.__porId = self.__porNome = None
+            self.__contadores['invalidacoes'] += 1
+
+    def registrarAlteracao(self, db):
+        """
+        Chamado pelo DAO após gravar na tabela. Dentro de uma transação, db passa a
+        consultar o banco direto e o cache é invalidado de novo ao final dela: outra
+        conexão pode ter recarregado a tabela antes do COMMIT.
+        """
+        self.invalidar()
+        if db.emTransacao and db not in self.__pendentes:
+            self.__pendentes.add(db)
+            db.aposTransacao(lambda confirmada: self.__liberar(db))
+
+    def __liberar(self, db):
+        self.__pendentes.discard(db)
+        self.invalidar()
+
+
+def obterCache(db, tabela: str):
+    """
+    O cache da tabela para o banco de db: o mesmo para todas as conexões ao arquivo
+    (ou ao banco em memória compartilhado)
+    """
+    banco = chaveBanco(db.dbPath)
+    with _lockRegistro:
+        if banco is None:
+            caches = _cachesMemoria.setdefault(db, {})
+            chave = tabela
+        else:
+            caches = _caches
+            chave = (banco, tabela)
+
+        cache = caches.get(chave)
+        if cache is None:
+            cache = caches[chave] = CacheTabela(tabela, TTL_PADRAO)
+        return cache
+
+
+def invalidarCaches(db):
+    """Invalida todos os caches do arquivo de db (ex.: após alterar as tabelas com SQL direto)"""
+    banco = chaveBanco(db.dbPath)
+    with _lockRegistro:
+        if banco is None:
+            caches = list(_cachesMemoria.get(db, {}).values())
+        else:
+            caches = [cache for (chave, _), cache in _caches.items() if chave == banco]
+    for cache in caches:
+        cache.invalidar()
+
+
+def definirTtl(segundos: float | None):
+    """Define o ttl dos caches já criados e dos próximos"""
+    global TTL_PADRAO
+    with _lockRegistro:
+        TTL_PADRAO = segundos
+        caches = list(_caches.values()) + [c for porTabela in _cachesMemoria.values() for c in porTabela.values()]
+    for cache in caches:
+        cache.ttl = segundos
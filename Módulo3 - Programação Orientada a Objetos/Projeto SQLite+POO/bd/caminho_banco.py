@@ -0,0 +1,54 @@
+"""
+Interpretação do dbPath aceito por DatabaseConnection:
+    'exemplo_bd.db'                              arquivo
+    ':memory:'                                   banco em memória, um por conexão
+    'file:dados.db?mode=ro'                      URI de arquivo (opções do SQLite na query)
+    'file:nome?mode=memory&cache=shared'         banco em memória compartilhado por todas as
+                                                 conexões do processo com o mesmo nome
+"""
+import os
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+def ehUri(dbPath: str):
+    return dbPath.startswith('file:')
+
+
+def _partesUri(dbPath: str):
+    """(caminho, opcoes) de uma URI file:"""
+    partes = urlsplit(dbPath)
+    opcoes = {nome: valores[-1] for nome, valores in parse_qs(partes.query).items()}
+    return unquote(partes.path), opcoes
+
+
+def ehMemoria(dbPath: str):
+    """True se o banco fica em memória (some quando a última conexão a ele fecha)"""
+    if not ehUri(dbPath):
+        return dbPath in (':memory:', '')
+    caminho, opcoes = _partesUri(dbPath)
+    return opcoes.get('mode') == 'memory' or caminho in (':memory:', '')
+
+
+def ehCompartilhado(dbPath: str):
+    """True para bancos em memória com cache=shared: conexões com o mesmo dbPath veem os mesmos dados"""
+    return ehMemoria(dbPath) and ehUri(dbPath) and _partesUri(dbPath)[1].get('cache') == 'shared'
+
+
+def arquivoDoBanco(dbPath: str):
+    """Caminho do arquivo no disco; None para bancos em memória"""
+    if ehMemoria(dbPath):
+        return None
+    if ehUri(dbPath):
+        return _partesUri(dbPath)[0]
+    return dbPath
+
+
+def chaveBanco(dbPath: str):
+    """
+    Identifica o banco no processo: o caminho real do arquivo ou o nome do banco
+    compartilhado. None para ':memory:' privado (cada conexão é um banco diferente).
+    """
+    if ehCompartilhado(dbPath):
+        return 'memoria:' + _partesUri(dbPath)[0]
+    arquivo = arquivoDoBanco(dbPath)
+    return os.path.realpath(arquivo) if arquivo is not None else None
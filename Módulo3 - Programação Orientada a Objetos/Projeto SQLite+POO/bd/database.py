@@ -2,25 +2,159 @@
 Classe para gerenciar conexão com o banco de dados SQLite
 """
 import sqlite3
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from bd.cache_tabela import invalidarCaches
+from bd.caminho_banco import ehMemoria, ehUri
+from bd.identity_map import IdentityMap
+from bd.migracoes import aplicarRecursos, contadoresInstalados, ftsInstalado, migrar, removerRecurso
+from bd.rastreador import CursorRastreado, RastreadorSql
+
+# Perfis de configuração: PRAGMAs aplicados a cada nova conexão
+PERFIS = {
+    # Comportamento original: apenas foreign keys (journal padrão, synchronous=FULL)
+    'default': {},
+    # Escrita intensa: WAL permite leituras durante a escrita e, com synchronous=NORMAL,
+    # o commit não espera o fsync do arquivo principal
+    'throughput': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,       # Valor negativo = KiB (~64 MB)
+        'mmap_size': 268435456,     # 256 MB
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,       # ms esperando um lock antes de falhar
+    },
+    # Somente leitura: o arquivo é aberto com mode=ro e escritas são recusadas
+    'readonly': {
+        'query_only': 'ON',
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+}
+
+# Comandos SQL preparados mantidos por conexão (o padrão do sqlite3 é 128). Os DAOs
+# usam textos SQL fixos, então cada comando é compilado uma vez e reaproveitado;
+# as consultas com IN (?, ?, ...) de tamanho variável ocupam uma entrada cada
+TAMANHO_CACHE_SQL = 512
 
 class DatabaseConnection:
-    def __init__(self, dbPath: str = 'exemplo_bd.db'):
+    def __init__(self, dbPath: str = 'exemplo_bd.db', tamanhoIdentityMap: int = 10000,
+                 perfil: str = 'default', pragmas: dict | None = None, fts: bool = False,
+                 contadores: bool = False):
+        if perfil not in PERFIS:
+            raise ValueError(f"Perfil desconhecido: '{perfil}'. Opções: {', '.join(PERFIS)}")
+        
+        # Arquivo, ':memory:' ou URI file: (ver bd/caminho_banco.py)
         self.__dbPath = dbPath
         self.__conn = None
+        self.__perfil = perfil
+        # PRAGMAs do perfil, sobrescritos/complementados pelos informados no construtor
+        self.__pragmas = {**PERFIS[perfil], **(pragmas or {})}
+        # Entidades já carregadas, compartilhadas por todos os DAOs desta conexão
+        self.__identityMap = IdentityMap(tamanhoIdentityMap)
+        # Profundidade de transacao() aninhadas (0 = autocommit)
+        self.__nivelTransacao = 0
+        # Funções de aposTransacao, uma lista por nível de transacao() aberto
+        self.__aposTransacao = []
+        # Buscas por nome via FTS5 (se o SQLite tiver o módulo).
+        # Os índices FTS5 e os triggers de contadores são criados por criarTabelas só com
+        # fts=True/contadores=True e removidos só por removerRecurso, ver RECURSOS em bd/migracoes.py
+        self.__fts = fts
+        # Contagens lidas de disciplina.total_matriculados
+        self.__contadores = contadores
+        # RastreadorSql ativo (opcional, ver ativarRastreamento)
+        self.__rastreador = None
+    
+    @property
+    def identityMap(self):
+        return self.__identityMap
+    
+    @property
+    def emTransacao(self):
+        return self.__nivelTransacao > 0
+    
+    @property
+    def dbPath(self):
+        return self.__dbPath
+    
+    @property
+    def ftsAtivo(self):
+        """
+        True se as buscas por nome podem usar os índices FTS5 (senão os DAOs usam LIKE).
+        Verificado a cada chamada: outro processo pode ter removido os índices.
+        """
+        return self.__fts and ftsInstalado(self)
+    
+    @property
+    def contadoresAtivos(self):
+        """
+        True se disciplina.total_matriculados foi preenchida e é mantida pelos triggers.
+        Verificado a cada chamada: sem os triggers (removidos por outro processo)
+        a coluna fica desatualizada e as contagens voltam ao GROUP BY.
+        """
+        return self.__contadores and contadoresInstalados(self)
+    
+    @property
+    def rastreador(self):
+        return self.__rastreador
+    
+    def ativarRastreamento(self, rastreador: RastreadorSql | None = None):
+        """
+        Passa a registrar cada comando SQL (tempo, linhas, origem) no rastreador.
+        Retorna o rastreador, para exibir rastreador.relatorio() ao final.
+        """
+        self.__rastreador = rastreador or RastreadorSql()
+        if self.__conn is not None:
+            self.__rastreador.instalar(self.__conn)
+        return self.__rastreador
+    
+    def escopo(self, nome: str):
+        """Agrupa os comandos de uma operação no rastreador (sem efeito se o rastreamento estiver desligado)"""
+        if self.__rastreador is None:
+            return nullcontext()
+        return self.__rastreador.escopo(nome)
+    
+    @property
+    def perfil(self):
+        return self.__perfil
+    
+    @property
+    def pragmas(self):
+        return dict(self.__pragmas)
     
     def conectar(self):
         if self.__conn is None:
+            uri = self.__dbPath if ehUri(self.__dbPath) else None
+            if self.__perfil == 'readonly' and not ehMemoria(self.__dbPath):
+                # mode=ro: o SQLite nem tenta abrir o arquivo para escrita
+                if uri is None:
+                    uri = Path(self.__dbPath).absolute().as_uri() + '?mode=ro'
+                elif 'mode=' not in uri:
+                    uri += ('&' if '?' in uri else '?') + 'mode=ro'
             # isolation_level=None ativa autocommit (cada operação é commitada automaticamente)
-            self.__conn = sqlite3.connect(self.__dbPath, isolation_level=None)
+            self.__conn = sqlite3.connect(uri or self.__dbPath, uri=uri is not None, isolation_level=None,
+                                          cached_statements=TAMANHO_CACHE_SQL)
             self.__conn.row_factory = sqlite3.Row
             self.__conn.execute("PRAGMA foreign_keys = ON")
+            self.aplicarPragmas(self.__conn)
+            if self.__rastreador is not None:
+                self.__rastreador.instalar(self.__conn)
         return self.__conn
     
+    def aplicarPragmas(self, conn):
+        """Aplica os PRAGMAs do perfil na conexão"""
+        for nome, valor in self.__pragmas.items():
+            conn.execute(f"PRAGMA {nome} = {valor}")
+    
     def fechar(self):
         """Fecha a conexão com o banco de dados"""
         if self.__conn:
             self.__conn.close()
             self.__conn = None
+        self.__identityMap.limpar()
     
 
     
@@ -28,62 +162,93 @@ class DatabaseConnection:
         """Retorna um cursor para executar queries"""
         if self.__conn is None:
             self.conectar()
+        if self.__rastreador is not None:
+            return CursorRastreado(self.__conn.cursor(), self.__rastreador)
         return self.__conn.cursor()
     
+    @contextmanager
+    def transacao(self):
+        """
+        Agrupa as operações do bloco em uma única transação:
+        commit ao final, rollback se ocorrer uma exceção.
+        Blocos aninhados usam SAVEPOINT, então um erro interno desfaz apenas o bloco interno.
+        Fora de um bloco transacao() a conexão continua em autocommit.
+        """
+        conn = self.conectar()
+        nivel = self.__nivelTransacao
+        
+        if nivel == 0:
+            conn.execute("BEGIN")
+        else:
+            conn.execute(f"SAVEPOINT sp_{nivel}")
+        self.__nivelTransacao += 1
+        self.__aposTransacao.append([])
+        
+        try:
+            yield self
+        except BaseException:
+            self.__nivelTransacao -= 1
+            if nivel == 0:
+                conn.execute("ROLLBACK")
+            else:
+                conn.execute(f"ROLLBACK TO SAVEPOINT sp_{nivel}")
+                conn.execute(f"RELEASE SAVEPOINT sp_{nivel}")
+            # O que foi agendado neste nível foi desfeito, mesmo que a transação externa confirme
+            self.__executarAposTransacao(False)
+            # Objetos carregados/alterados dentro do bloco podem não refletir mais o banco
+            self.__identityMap.limpar()
+            raise
+        else:
+            self.__nivelTransacao -= 1
+            if nivel == 0:
+                try:
+                    conn.execute("COMMIT")
+                except BaseException:
+                    # COMMIT recusado (ex.: "database is locked", FK adiada) deixa a transação
+                    # aberta: desfazê-la para que a conexão volte ao autocommit
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    self.__identityMap.limpar()
+                    self.__executarAposTransacao(False)
+                    raise
+                self.__executarAposTransacao(True)
+            else:
+                conn.execute(f"RELEASE SAVEPOINT sp_{nivel}")
+                # Confirmado só com a transação externa: passa para o nível de cima
+                funcoes = self.__aposTransacao.pop()
+                self.__aposTransacao[-1].extend(funcoes)
+    
+    def aposTransacao(self, funcao):
+        """
+        Agenda funcao(confirmada) para o fim da transação mais externa: confirmada é
+        True após o COMMIT e False após o ROLLBACK. Se o bloco aninhado (SAVEPOINT)
+        em que foi agendada for desfeito, funcao(False) é chamada já no ROLLBACK TO.
+        Fora de uma transação, chama já.
+        """
+        if self.emTransacao:
+            self.__aposTransacao[-1].append(funcao)
+        else:
+            funcao(True)
+    
+    def __executarAposTransacao(self, confirmada: bool):
+        """Chama e descarta as funções do nível de transação que está sendo encerrado"""
+        for funcao in self.__aposTransacao.pop():
+            funcao(confirmada)
+    
     def criarTabelas(self):
-        cur = self.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS categoria (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nome TEXT NOT NULL UNIQUE
-            );
-            """
-        )
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS pessoa (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nome TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            altura REAL,
-            peso REAL,
-            data_nascimento TEXT,
-            ativo INTEGER DEFAULT 1,
-            telefone TEXT,
-            categoria_id INTEGER NOT NULL,
-            FOREIGN KEY (categoria_id) REFERENCES categoria(id)
-        );
-        """)
-        # Tabela usuario (relacionamento 1:1 com pessoa)
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS usuario (
-            id INTEGER NOT NULL,
-            login TEXT NOT NULL UNIQUE,
-            senha TEXT NOT NULL,
-            tipo TEXT NOT NULL,
-            PRIMARY KEY (id),
-            FOREIGN KEY (id) REFERENCES pessoa(id) ON DELETE CASCADE
-        );
-        """)
-        # Tabela disciplina
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS disciplina (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nome TEXT NOT NULL UNIQUE,
-            carga_horaria INTEGER,
-            descricao TEXT
-        );
-        """)
-        # Tabela intermediária para relacionamento N:N entre pessoa e disciplina
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS pessoa_disciplina (
-            pessoa_id INTEGER NOT NULL,
-            disciplina_id INTEGER NOT NULL,
-            PRIMARY KEY (pessoa_id, disciplina_id),
-            FOREIGN KEY (pessoa_id) REFERENCES pessoa(id) ON DELETE CASCADE,
-            FOREIGN KEY (disciplina_id) REFERENCES disciplina(id) ON DELETE CASCADE
-        );
-        """)
+        """
+        Atualiza o esquema: executa as migrações pendentes (bd/migracoes.py) e instala
+        os recursos opcionais ligados no construtor (fts, contadores). Recursos desligados
+        não são removidos (ver removerRecurso).
+        Retorna (versao, descricao, segundos) de cada migração executada.
+        """
+        executadas = migrar(self)
+        aplicarRecursos(self, {'fts': self.__fts, 'contadores': self.__contadores})
+        return executadas
+    
+    def removerRecurso(self, nome: str):
+        """Remove um recurso opcional ('fts' ou 'contadores'); retorna se ele estava instalado"""
+        return removerRecurso(self, nome)
     
     def limparDados(self):
         cur = self.cursor()
@@ -93,4 +258,6 @@ class DatabaseConnection:
         cur.execute("DELETE FROM pessoa;")
         cur.execute("DELETE FROM categoria;")
         cur.execute("DELETE FROM sqlite_sequence WHERE name IN ('pessoa', 'categoria', 'usuario', 'disciplina');")
+        self.__identityMap.limpar()
+        invalidarCaches(self)
 
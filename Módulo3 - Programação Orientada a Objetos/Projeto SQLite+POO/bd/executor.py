@@ -0,0 +1,195 @@
+"""
+Thread dedicada ao banco: recebe pedidos por uma fila e os executa na sua
+própria conexão, para que código asyncio use os DAOs sem bloquear o event loop.
+Escritas que chegam juntas são agrupadas em uma única transação.
+"""
+import asyncio
+import queue
+import threading
+from collections import defaultdict
+from concurrent.futures import Future
+from contextlib import ExitStack
+
+from bd.database import DatabaseConnection
+
+# Sinal de encerramento na fila
+_FIM = object()
+
+
+class Pedido:
+    __slots__ = ('funcao', 'args', 'escrita', 'loop', 'futuro')
+
+    def __init__(self, funcao, args, escrita, loop=None):
+        self.funcao = funcao
+        self.args = args
+        self.escrita = escrita
+        # Com loop, o resultado vai para um asyncio.Future desse loop; senão, para um concurrent.futures.Future
+        self.loop = loop
+        self.futuro = loop.create_future() if loop is not None else Future()
+
+    def cancelado(self):
+        return self.futuro.cancelled()
+
+
+def _entregarNoLoop(respostas):
+    # Roda no event loop: uma chamada entrega todas as respostas do ciclo
+    for futuro, resultado, erro in respostas:
+        if futuro.cancelled():
+            continue
+        if erro is not None:
+            futuro.set_exception(erro)
+        else:
+            futuro.set_result(resultado)
+
+
+class ExecutorBanco:
+    def __init__(self, db: DatabaseConnection, tamanhoLote: int = 200):
+        """
+        db passa a ser usado somente pela thread do executor: a conexão sqlite3 pertence
+        à thread que a abriu, então db não deve ter sido conectado antes.
+        tamanhoLote: máximo de pedidos tratados por ciclo; as escritas de um ciclo
+        dividem uma transação (um commit).
+        """
+        if tamanhoLote < 1:
+            raise ValueError("tamanhoLote deve ser maior que zero")
+
+        self.__db = db
+        self.__tamanhoLote = tamanhoLote
+        self.__fila = queue.Queue()
+        self.__encerrado = False
+        self.__lock = threading.Lock()
+        self.__metricas = {
+            'leituras': 0,
+            'escritas': 0,
+            'transacoes': 0,       # Commits usados pelas escritas
+            'maiorLote': 0,        # Mais escritas em uma transação
+            'erros': 0,
+        }
+        self.__thread = threading.Thread(target=self.__executarFila, name="ExecutorBanco", daemon=True)
+        self.__thread.start()
+
+    @property
+    def db(self):
+        return self.__db
+
+    @property
+    def metricas(self):
+        with self.__lock:
+            metricas = dict(self.__metricas)
+        metricas['pendentes'] = self.__fila.qsize()
+        return metricas
+
+    def __enfileirar(self, pedido):
+        with self.__lock:
+            if self.__encerrado:
+                raise RuntimeError("ExecutorBanco encerrado")
+            self.__fila.put(pedido)
+        return pedido.futuro
+
+    def enviar(self, funcao, *args, escrita: bool = False):
+        """Agenda funcao(*args) na thread do banco; retorna um concurrent.futures.Future"""
+        return self.__enfileirar(Pedido(funcao, args, escrita))
+
+    async def executar(self, funcao, *args, escrita: bool = False):
+        """Versão awaitable de enviar(): o event loop continua livre enquanto o banco trabalha"""
+        return await self.__enfileirar(Pedido(funcao, args, escrita, asyncio.get_running_loop()))
+
+    def fechar(self, timeout: float | None = None):
+        """Executa os pedidos já enviados, fecha a conexão e encerra a thread"""
+        with self.__lock:
+            if self.__encerrado:
+                return
+            self.__encerrado = True
+            self.__fila.put(_FIM)
+        self.__thread.join(timeout)
+
+    def __executarFila(self):
+        try:
+            while True:
+                # Ciclo: o próximo pedido mais os que já estiverem na fila
+                pedidos = [self.__fila.get()]
+                while len(pedidos) < self.__tamanhoLote and pedidos[-1] is not _FIM:
+                    try:
+                        pedidos.append(self.__fila.get_nowait())
+                    except queue.Empty:
+                        break
+
+                fim = pedidos[-1] is _FIM
+                if fim:
+                    pedidos.pop()
+                if pedidos:
+                    self.__executarCiclo(pedidos)
+                if fim:
+                    return
+        finally:
+            self.__db.fechar()
+
+    def __executarCiclo(self, pedidos):
+        """
+        Executa os pedidos na ordem de chegada. A primeira escrita abre uma transação
+        que vai até o fim do ciclo; cada escrita roda em um savepoint (transacao() aninhada),
+        então uma falha desfaz só ela (e os ids que os DAOs atribuíram nela). As leituras
+        seguintes enxergam as escritas anteriores, como aconteceria um pedido por vez. Se o
+        ciclo inteiro for desfeito (ex.: COMMIT recusado), todas as escritas recebem o erro e
+        os DAOs limpam os ids que atribuíram nele (desfazerIdsAoReverter em dao/lote.py).
+        """
+        respostas = []          # (pedido, resultado, erro)
+        escritas = []           # Índices em respostas, confirmados só após o COMMIT
+        leituras = erros = 0
+        emTransacao = False
+
+        with ExitStack() as transacao:
+            try:
+                for pedido in pedidos:
+                    if pedido.cancelado():
+                        continue
+                    if pedido.escrita and not emTransacao:
+                        transacao.enter_context(self.__db.transacao())
+                        emTransacao = True
+                    try:
+                        if pedido.escrita:
+                            with self.__db.transacao():
+                                resultado = pedido.funcao(*pedido.args)
+                            escritas.append(len(respostas))
+                        else:
+                            resultado = pedido.funcao(*pedido.args)
+                            leituras += 1
+                        respostas.append((pedido, resultado, None))
+                    except Exception as e:
+                        erros += 1
+                        respostas.append((pedido, None, e))
+                transacao.close()   # COMMIT
+            except Exception as e:
+                # A transação foi desfeita: nenhuma escrita do ciclo foi gravada
+                for i in escritas:
+                    respostas[i] = (respostas[i][0], None, e)
+                respondidos = {id(p) for p, _, _ in respostas}
+                respostas.extend((p, None, e) for p in pedidos if id(p) not in respondidos)
+
+        with self.__lock:
+            self.__metricas['leituras'] += leituras
+            self.__metricas['escritas'] += len(escritas)
+            self.__metricas['erros'] += erros
+            if escritas:
+                self.__metricas['transacoes'] += 1
+                self.__metricas['maiorLote'] = max(self.__metricas['maiorLote'], len(escritas))
+
+        self.__entregar(respostas)
+
+    def __entregar(self, respostas):
+        # Uma única chamada por event loop (call_soon_threadsafe acorda o loop a cada chamada)
+        porLoop = defaultdict(list)
+        for pedido, resultado, erro in respostas:
+            if pedido.loop is not None:
+                porLoop[pedido.loop].append((pedido.futuro, resultado, erro))
+            elif pedido.futuro.set_running_or_notify_cancel():
+                if erro is not None:
+                    pedido.futuro.set_exception(erro)
+                else:
+                    pedido.futuro.set_result(resultado)
+
+        for loop, itens in porLoop.items():
+            try:
+                loop.call_soon_threadsafe(_entregarNoLoop, itens)
+            except RuntimeError:
+                pass  # Loop já encerrado: ninguém aguarda essas respostas
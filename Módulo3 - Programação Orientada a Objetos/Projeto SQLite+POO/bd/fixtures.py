@@ -0,0 +1,103 @@
+"""
+Bancos de teste criados a partir de um modelo: o esquema (e os dados iniciais) são
+montados uma única vez e cada teste recebe uma cópia independente, em vez de
+reinserir as linhas ou apagá-las com DELETE entre um teste e outro.
+
+    with ModeloBanco(popular=inserirDados) as modelo:
+        db = modelo.novoBanco()     # cópia em memória do modelo
+        ...
+        db.fechar()
+"""
+import itertools
+import os
+import shutil
+import tempfile
+
+from bd.database import DatabaseConnection
+
+# Onde ficam o modelo e as cópias
+MODOS = ('memoria', 'arquivo', 'compartilhado')
+
+# Numera os bancos compartilhados (os nomes precisam ser únicos no processo)
+_sequencia = itertools.count(1)
+
+
+class ModeloBanco:
+    def __init__(self, popular=None, modo: str = 'memoria', **opcoesDb):
+        """
+        popular(db): insere os dados iniciais no modelo (chamada uma vez).
+        modo: 'memoria' (cada cópia em ':memory:', copiada com a API de backup),
+        'arquivo' (o modelo é um arquivo e cada cópia, outro arquivo no diretório temporário)
+        ou 'compartilhado' (cópias em memória com cache=shared, que outras conexões do
+        processo abrem pelo db.dbPath enquanto a cópia estiver aberta).
+        opcoesDb vão para o construtor de DatabaseConnection (ex.: fts=True, contadores=True).
+        """
+        if modo not in MODOS:
+            raise ValueError(f"Modo desconhecido: '{modo}'. Opções: {', '.join(MODOS)}")
+
+        self.__modo = modo
+        self.__opcoesDb = opcoesDb
+        self.__diretorio = tempfile.TemporaryDirectory(prefix='modelo-banco-') if modo == 'arquivo' else None
+        self.__copias = 0
+
+        dbPath = os.path.join(self.__diretorio.name, 'modelo.db') if self.__diretorio else ':memory:'
+        self.__modelo = DatabaseConnection(dbPath, **opcoesDb)
+        try:
+            self.__modelo.criarTabelas()
+            if popular is not None:
+                popular(self.__modelo)
+            if self.__diretorio:
+                # O arquivo modelo não muda mais: copiar o arquivo basta
+                self.__modelo.fechar()
+        except BaseException:
+            self.fechar()
+            raise
+
+    @property
+    def modo(self):
+        return self.__modo
+
+    @property
+    def copias(self):
+        """Quantidade de bancos criados por novoBanco()"""
+        return self.__copias
+
+    def novoBanco(self, **opcoesDb):
+        """
+        Novo DatabaseConnection com o conteúdo do modelo. As alterações feitas nele não
+        afetam o modelo nem as outras cópias; feche-o com db.fechar() ao fim do teste.
+        opcoesDb sobrescrevem as do modelo (ex.: tamanhoIdentityMap=0).
+        """
+        if self.__modelo is None:
+            raise RuntimeError("ModeloBanco fechado")
+
+        self.__copias += 1
+        opcoes = {**self.__opcoesDb, **opcoesDb}
+        if self.__modo == 'arquivo':
+            dbPath = os.path.join(self.__diretorio.name, f'banco_{self.__copias}.db')
+            shutil.copyfile(self.__modelo.dbPath, dbPath)
+            return DatabaseConnection(dbPath, **opcoes)
+
+        if self.__modo == 'memoria':
+            dbPath = ':memory:'
+        else:
+            dbPath = f'file:modelo_{next(_sequencia)}?mode=memory&cache=shared'
+        db = DatabaseConnection(dbPath, **opcoes)
+        # Backup em memória: uma cópia das páginas, sem reexecutar SQL
+        self.__modelo.conectar().backup(db.conectar())
+        return db
+
+    def fechar(self):
+        """Descarta o modelo (e, no modo 'arquivo', os arquivos das cópias)"""
+        if self.__modelo is not None:
+            self.__modelo.fechar()
+            self.__modelo = None
+        if self.__diretorio is not None:
+            self.__diretorio.cleanup()
+            self.__diretorio = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
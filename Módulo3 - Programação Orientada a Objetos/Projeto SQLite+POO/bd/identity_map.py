@@ -0,0 +1,54 @@
+"""
+Identity map: guarda as entidades já carregadas do banco, para que cada
+registro vire um único objeto enquanto a conexão estiver aberta
+"""
+import threading
+from collections import OrderedDict
+
+class IdentityMap:
+    def __init__(self, tamanhoMaximo: int = 10000):
+        self.__tamanhoMaximo = tamanhoMaximo
+        # Chave (classe, id) -> entidade, em ordem de uso (LRU)
+        self.__entidades = OrderedDict()
+        # O mesmo mapa pode ser usado por várias threads (PoolConexoes)
+        self.__lock = threading.RLock()
+
+    @property
+    def tamanhoMaximo(self):
+        return self.__tamanhoMaximo
+
+    def obter(self, classe, id):
+        """Retorna a entidade já carregada ou None"""
+        chave = (classe, id)
+        with self.__lock:
+            entidade = self.__entidades.get(chave)
+
+            if entidade is not None:
+                self.__entidades.move_to_end(chave)
+        return entidade
+
+    def registrar(self, entidade):
+        """Guarda a entidade e a retorna. Se o mapa estiver cheio, descarta a usada há mais tempo"""
+        if entidade.id is None or self.__tamanhoMaximo <= 0:
+            return entidade
+
+        chave = (type(entidade), entidade.id)
+        with self.__lock:
+            self.__entidades[chave] = entidade
+            self.__entidades.move_to_end(chave)
+
+            while len(self.__entidades) > self.__tamanhoMaximo:
+                self.__entidades.popitem(last=False)
+        return entidade
+
+    def remover(self, classe, id):
+        """Invalida a entrada (após salvar/deletar)"""
+        with self.__lock:
+            self.__entidades.pop((classe, id), None)
+
+    def limpar(self):
+        with self.__lock:
+            self.__entidades.clear()
+
+    def __len__(self):
+        return len(self.__entidades)
@@ -0,0 +1,402 @@
+"""
+Migrações do esquema do banco, versionadas por PRAGMA user_version.
+Cada migração roda uma única vez, em ordem, e a versão gravada no arquivo
+indica até onde o banco já foi atualizado.
+Uso direto: python3 bd/migracoes.py [caminho_do_banco]
+"""
+import sqlite3
+import time
+
+# Triggers que mantêm disciplina.total_matriculados (recurso 'contadores')
+TRIGGERS_CONTADORES = ('pessoa_disciplina_total_ai', 'pessoa_disciplina_total_ad')
+
+# Índices de texto (FTS5) das buscas por nome: tabela -> colunas indexadas.
+# As tabelas *_fts usam a própria tabela como conteúdo (content=...), então
+# guardam apenas o índice; os triggers de instalarIndicesFts as mantêm sincronizadas.
+TABELAS_FTS = {
+    'pessoa': ('nome', 'email'),
+    'disciplina': ('nome', 'descricao'),
+}
+
+
+class Migracao:
+    """
+    Um passo do esquema. Por padrão roda dentro de uma transação (junto com a
+    atualização de user_version). Com emPartes=True, a própria função controla as
+    transações (ex.: preencherEmPartes), para não bloquear o banco durante um
+    preenchimento longo; nesse caso ela precisa poder ser executada de novo se for interrompida.
+    """
+    def __init__(self, versao: int, descricao: str, executar, emPartes: bool = False):
+        self.versao = versao
+        self.descricao = descricao
+        self.executar = executar
+        self.emPartes = emPartes
+
+
+def preencherEmPartes(db, tabela: str, atualizacao: str, tamanhoParte: int = 5000, pausa: float = 0.0):
+    """
+    Executa "UPDATE tabela SET <atualizacao>" em faixas de id, uma transação por faixa:
+    entre as faixas outras conexões podem ler e escrever (em WAL, leituras nunca esperam).
+    pausa: segundos de espera entre as faixas, para dividir o disco com a aplicação.
+    Retorna o total de linhas atualizadas.
+    """
+    cur = db.cursor()
+    cur.execute(f"SELECT MIN(id), MAX(id) FROM {tabela};")
+    menor, maior = cur.fetchone()
+    if menor is None:
+        return 0
+
+    total = 0
+    inicio = menor
+    while inicio <= maior:
+        with db.transacao():
+            cur = db.cursor()
+            cur.execute(f"UPDATE {tabela} SET {atualizacao} WHERE id >= ? AND id < ?;",
+                        (inicio, inicio + tamanhoParte))
+            total += cur.rowcount
+        inicio += tamanhoParte
+        if pausa:
+            time.sleep(pausa)
+    return total
+
+
+def criarTabelasIniciais(db):
+    cur = db.cursor()
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS categoria (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL UNIQUE
+    );
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS pessoa (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        altura REAL,
+        peso REAL,
+        data_nascimento TEXT,
+        ativo INTEGER DEFAULT 1,
+        telefone TEXT,
+        categoria_id INTEGER NOT NULL,
+        FOREIGN KEY (categoria_id) REFERENCES categoria(id)
+    );
+    """)
+    # Tabela usuario (relacionamento 1:1 com pessoa)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS usuario (
+        id INTEGER NOT NULL,
+        login TEXT NOT NULL UNIQUE,
+        senha TEXT NOT NULL,
+        tipo TEXT NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY (id) REFERENCES pessoa(id) ON DELETE CASCADE
+    );
+    """)
+    # Tabela disciplina
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS disciplina (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nome TEXT NOT NULL UNIQUE,
+        carga_horaria INTEGER,
+        descricao TEXT
+    );
+    """)
+    # Tabela intermediária para relacionamento N:N entre pessoa e disciplina
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS pessoa_disciplina (
+        pessoa_id INTEGER NOT NULL,
+        disciplina_id INTEGER NOT NULL,
+        PRIMARY KEY (pessoa_id, disciplina_id),
+        FOREIGN KEY (pessoa_id) REFERENCES pessoa(id) ON DELETE CASCADE,
+        FOREIGN KEY (disciplina_id) REFERENCES disciplina(id) ON DELETE CASCADE
+    );
+    """)
+
+
+def criarIndicesSecundarios(db):
+    # FKs usadas em JOIN/filtro e a ordenação por nome
+    # (pessoa_disciplina já é indexada por (pessoa_id, disciplina_id) pela PK)
+    cur = db.cursor()
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_pessoa_categoria_id ON pessoa(categoria_id);")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_pessoa_nome ON pessoa(nome);")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_pessoa_disciplina_disciplina_id "
+                "ON pessoa_disciplina(disciplina_id);")
+
+
+def criarIndiceEmailNocase(db):
+    # Email único sem diferenciar maiúsculas/minúsculas (PessoaDAO.existeEmail)
+    cur = db.cursor()
+    try:
+        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_pessoa_email_nocase "
+                    "ON pessoa(email COLLATE NOCASE);")
+    except sqlite3.IntegrityError:
+        # Banco antigo com emails repetidos (ex.: "A@x.com" e "a@x.com"): indexar sem UNIQUE
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_pessoa_email_nocase_dup "
+                    "ON pessoa(email COLLATE NOCASE);")
+
+
+def criarColunaContadores(db):
+    cur = db.cursor()
+    cur.execute("PRAGMA table_info(disciplina);")
+    if not any(row['name'] == 'total_matriculados' for row in cur.fetchall()):
+        cur.execute("ALTER TABLE disciplina ADD COLUMN total_matriculados INTEGER NOT NULL DEFAULT 0;")
+
+
+def adicionarContadoresMatricula(db):
+    """
+    Coluna disciplina.total_matriculados e a contagem dos vínculos existentes,
+    preenchida em partes: o ALTER TABLE é instantâneo e o UPDATE longo não bloqueia
+    o banco. Pode ser executada de novo se for interrompida.
+    """
+    with db.transacao():
+        criarColunaContadores(db)
+    preencherEmPartes(db, 'disciplina', """total_matriculados = (
+        SELECT COUNT(*) FROM pessoa_disciplina pd WHERE pd.disciplina_id = disciplina.id
+    )""")
+
+
+def existemObjetos(db, nomes):
+    """True se sqlite_master tem todas as tabelas, índices ou triggers com esses nomes (uma consulta)"""
+    nomes = tuple(nomes)
+    cur = db.cursor()
+    cur.execute(f"SELECT COUNT(*) FROM sqlite_master WHERE name IN ({', '.join('?' * len(nomes))});", nomes)
+    return cur.fetchone()[0] == len(nomes)
+
+
+def contadoresInstalados(db):
+    return existemObjetos(db, TRIGGERS_CONTADORES)
+
+
+def instalarContadoresMatricula(db):
+    """
+    Triggers que atualizam disciplina.total_matriculados a cada vínculo criado/removido
+    em pessoa_disciplina (inclusive pelo ON DELETE CASCADE) e a recontagem dos vínculos
+    existentes. Tudo em uma transação: nenhum vínculo é criado entre os triggers e a
+    contagem, e uma interrupção não deixa triggers com contadores incompletos.
+    """
+    with db.transacao():
+        criarColunaContadores(db)
+        cur = db.cursor()
+        cur.execute("""
+            CREATE TRIGGER IF NOT EXISTS pessoa_disciplina_total_ai AFTER INSERT ON pessoa_disciplina BEGIN
+                UPDATE disciplina SET total_matriculados = total_matriculados + 1
+                WHERE id = new.disciplina_id;
+            END;
+        """)
+        cur.execute("""
+            CREATE TRIGGER IF NOT EXISTS pessoa_disciplina_total_ad AFTER DELETE ON pessoa_disciplina BEGIN
+                UPDATE disciplina SET total_matriculados = total_matriculados - 1
+                WHERE id = old.disciplina_id;
+            END;
+        """)
+        cur.execute("""
+            UPDATE disciplina SET total_matriculados = (
+                SELECT COUNT(*) FROM pessoa_disciplina pd WHERE pd.disciplina_id = disciplina.id
+            );
+        """)
+
+
+def removerContadoresMatricula(db):
+    # A coluna fica (desatualizada): instalarContadoresMatricula a recalcula ao reativar
+    cur = db.cursor()
+    for trigger in TRIGGERS_CONTADORES:
+        cur.execute(f"DROP TRIGGER IF EXISTS {trigger};")
+
+
+def ftsInstalado(db):
+    return existemObjetos(db, (f"{tabela}_fts_{sufixo}"
+                               for tabela in TABELAS_FTS for sufixo in ('ai', 'ad', 'au')))
+
+
+def instalarIndicesFts(db):
+    """
+    Tabelas FTS5 e os triggers que as mantêm em dia com pessoa e disciplina,
+    em uma transação. Se o SQLite não tiver FTS5, nada é criado e as buscas
+    continuam com LIKE. A indexação das linhas existentes ('rebuild') é um único
+    comando: com os triggers ativos, indexar em partes removeria do índice linhas
+    que ainda não estão nele.
+    """
+    try:
+        with db.transacao():
+            cur = db.cursor()
+            for tabela, colunas in TABELAS_FTS.items():
+                fts = f"{tabela}_fts"
+                lista = ", ".join(colunas)
+                novos = ", ".join(f"new.{coluna}" for coluna in colunas)
+                antigos = ", ".join(f"old.{coluna}" for coluna in colunas)
+
+                # remove_diacritics: "joao" encontra "João"
+                cur.execute(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                        {lista}, content='{tabela}', content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2'
+                    );
+                """)
+                cur.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {tabela} BEGIN
+                        INSERT INTO {fts}(rowid, {lista}) VALUES (new.id, {novos});
+                    END;
+                """)
+                cur.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {tabela} BEGIN
+                        INSERT INTO {fts}({fts}, rowid, {lista}) VALUES ('delete', old.id, {antigos});
+                    END;
+                """)
+                cur.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {lista} ON {tabela} BEGIN
+                        INSERT INTO {fts}({fts}, rowid, {lista}) VALUES ('delete', old.id, {antigos});
+                        INSERT INTO {fts}(rowid, {lista}) VALUES (new.id, {novos});
+                    END;
+                """)
+                # Indexar as linhas existentes (também refaz um índice deixado sem triggers)
+                cur.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild');")
+    except sqlite3.OperationalError as erro:
+        if 'no such module' not in str(erro):
+            raise
+
+
+def removerIndicesFts(db):
+    cur = db.cursor()
+    for tabela in TABELAS_FTS:
+        fts = f"{tabela}_fts"
+        for sufixo in ('ai', 'ad', 'au'):
+            cur.execute(f"DROP TRIGGER IF EXISTS {fts}_{sufixo};")
+        cur.execute(f"DROP TABLE IF EXISTS {fts};")
+
+
+# Em ordem de versão. Novas migrações entram no final, com a próxima versão;
+# as já publicadas não devem ser alteradas (bancos existentes não as executam de novo).
+# Os passos usam IF NOT EXISTS (e o 4 verifica a coluna): bancos criados antes das migrações
+# (user_version 0) passam por eles sem erro.
+# Os triggers dos contadores de matrícula e os índices FTS5 não são migrações, e sim
+# recursos opcionais (RECURSOS).
+MIGRACOES = [
+    Migracao(1, "Tabelas categoria, pessoa, usuario, disciplina e pessoa_disciplina", criarTabelasIniciais),
+    Migracao(2, "Índices secundários de pessoa e pessoa_disciplina", criarIndicesSecundarios),
+    Migracao(3, "Índice único de email sem diferenciar maiúsculas", criarIndiceEmailNocase),
+    Migracao(4, "Coluna disciplina.total_matriculados (preenchida em partes)",
+             adicionarContadoresMatricula, emPartes=True),
+]
+
+
+class Recurso:
+    """
+    Objetos opcionais do esquema, ligados por uma opção de DatabaseConnection.
+    Ficam fora das migrações porque seus triggers pesam em toda escrita: criarTabelas
+    os instala quando a opção está ligada. Com a opção desligada eles não são tocados
+    (outro processo pode estar usando o banco com ela ligada); só removerRecurso os remove.
+    """
+    def __init__(self, nome: str, descricao: str, instalado, instalar, remover):
+        self.nome = nome
+        self.descricao = descricao
+        self.instalado = instalado
+        self.instalar = instalar
+        self.remover = remover
+
+
+RECURSOS = [
+    Recurso('contadores', "Triggers de disciplina.total_matriculados",
+            contadoresInstalados, instalarContadoresMatricula, removerContadoresMatricula),
+    Recurso('fts', "Índices FTS5 de pessoa e disciplina",
+            ftsInstalado, instalarIndicesFts, removerIndicesFts),
+]
+
+
+def aplicarRecursos(db, ativos: dict, aoConcluir=None):
+    """
+    Instala os recursos com ativos[nome] verdadeiro que ainda não estão instalados.
+    Os demais não são removidos (ver removerRecurso).
+    aoConcluir(recurso, segundos) é chamado após cada instalação.
+    Retorna uma lista de (nome, segundos) dos recursos instalados.
+    """
+    instalados = []
+    for recurso in RECURSOS:
+        if not ativos.get(recurso.nome) or recurso.instalado(db):
+            continue
+
+        inicio = time.perf_counter()
+        recurso.instalar(db)
+        segundos = time.perf_counter() - inicio
+
+        instalados.append((recurso.nome, segundos))
+        if aoConcluir is not None:
+            aoConcluir(recurso, segundos)
+    return instalados
+
+
+def removerRecurso(db, nome: str):
+    """
+    Remove os objetos de um recurso opcional (ex.: 'fts'), em uma transação.
+    Conexões abertas com a opção ligada passam a usar o caminho sem o recurso
+    (LIKE, GROUP BY) até que criarTabelas o instale de novo.
+    Retorna se o recurso estava instalado.
+    """
+    recursos = {recurso.nome: recurso for recurso in RECURSOS}
+    if nome not in recursos:
+        raise ValueError(f"Recurso desconhecido: {nome} (disponíveis: {', '.join(recursos)})")
+
+    recurso = recursos[nome]
+    instalado = recurso.instalado(db)
+    # Sempre executa: também limpa uma instalação incompleta
+    with db.transacao():
+        recurso.remover(db)
+    return instalado
+
+
+def versaoAtual(db):
+    cur = db.cursor()
+    cur.execute("PRAGMA user_version;")
+    return cur.fetchone()[0]
+
+
+def migrar(db, migracoes=None, aoConcluir=None):
+    """
+    Executa as migrações com versão maior que a do banco.
+    aoConcluir(migracao, segundos) é chamado após cada passo (ex.: para exibir o progresso).
+    Retorna uma lista de (versao, descricao, segundos) dos passos executados.
+    """
+    migracoes = sorted(MIGRACOES if migracoes is None else migracoes, key=lambda m: m.versao)
+    versao = versaoAtual(db)
+
+    if migracoes and versao > migracoes[-1].versao:
+        raise RuntimeError(f"O banco está na versão {versao}, mais nova que a deste código "
+                           f"({migracoes[-1].versao})")
+
+    executadas = []
+    for migracao in migracoes:
+        if migracao.versao <= versao:
+            continue
+
+        inicio = time.perf_counter()
+        if migracao.emPartes:
+            migracao.executar(db)
+            db.cursor().execute(f"PRAGMA user_version = {int(migracao.versao)};")
+        else:
+            # user_version faz parte da transação: se o passo falhar, a versão não avança
+            with db.transacao():
+                migracao.executar(db)
+                db.cursor().execute(f"PRAGMA user_version = {int(migracao.versao)};")
+        segundos = time.perf_counter() - inicio
+
+        executadas.append((migracao.versao, migracao.descricao, segundos))
+        if aoConcluir is not None:
+            aoConcluir(migracao, segundos)
+
+    return executadas
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from bd.database import DatabaseConnection
+
+    db = DatabaseConnection(sys.argv[1] if len(sys.argv) > 1 else 'exemplo_bd.db')
+    try:
+        print(f"Versão atual: {versaoAtual(db)}")
+        executadas = migrar(db, aoConcluir=lambda m, s: print(f"  ✓ {m.versao:>3}  {m.descricao:<60} {s:>8.3f}s"))
+        print(f"Versão final: {versaoAtual(db)} ({len(executadas)} migração(ões) executada(s))")
+    finally:
+        db.fechar()
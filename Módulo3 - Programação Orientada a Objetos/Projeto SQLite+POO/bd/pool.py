@@ -0,0 +1,275 @@
+"""
+Pool de conexões SQLite: N conexões de leitura e uma de escrita,
+com a mesma interface de DatabaseConnection (os DAOs funcionam sem alteração)
+"""
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from bd.caminho_banco import ehMemoria, ehUri
+from bd.database import TAMANHO_CACHE_SQL, DatabaseConnection
+from bd.rastreador import CursorRastreado, RastreadorSql
+
+# Comandos que podem ir para uma conexão de leitura
+COMANDOS_LEITURA = ('SELECT', 'WITH', 'EXPLAIN')
+
+
+def ehLeitura(sql: str):
+    comando = sql.lstrip().split(None, 1)
+    return bool(comando) and comando[0].upper() in COMANDOS_LEITURA
+
+
+class CursorPool:
+    """
+    Cursor que escolhe a conexão a cada execute: leituras vão para um leitor
+    do pool e escritas (ou qualquer comando dentro de transacao()) para o escritor.
+    O resultado é lido por inteiro e a conexão é devolvida ao pool em seguida,
+    então o cursor pode ser usado depois sem prender a conexão. Por isso fetchmany
+    não é incremental aqui: os geradores dos DAOs (iterarTodas) economizam a
+    montagem dos objetos, mas não a memória das linhas.
+    """
+    def __init__(self, pool):
+        self.__pool = pool
+        self.__linhas = []
+        self.__posicao = 0
+        self.lastrowid = None
+        self.rowcount = -1
+        self.description = None
+
+    def execute(self, sql: str, parametros=()):
+        if self.__pool.emTransacao or not ehLeitura(sql):
+            with self.__pool.escritor() as conn:
+                self.__guardar(conn.execute(sql, parametros))
+        else:
+            with self.__pool.leitor() as conn:
+                self.__guardar(conn.execute(sql, parametros))
+        return self
+
+    def executemany(self, sql: str, parametros):
+        with self.__pool.escritor() as conn:
+            self.__guardar(conn.executemany(sql, parametros))
+        return self
+
+    def __guardar(self, cur):
+        self.__linhas = cur.fetchall()
+        self.__posicao = 0
+        self.lastrowid = cur.lastrowid
+        self.rowcount = cur.rowcount
+        self.description = cur.description
+
+    def fetchone(self):
+        if self.__posicao >= len(self.__linhas):
+            return None
+        linha = self.__linhas[self.__posicao]
+        self.__posicao += 1
+        return linha
+
+    def fetchmany(self, tamanho: int = 1):
+        linhas = self.__linhas[self.__posicao:self.__posicao + tamanho]
+        self.__posicao += len(linhas)
+        return linhas
+
+    def fetchall(self):
+        linhas = self.__linhas[self.__posicao:]
+        self.__posicao = len(self.__linhas)
+        return linhas
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self.__linhas = []
+
+
+class PoolConexoes(DatabaseConnection):
+    def __init__(self, dbPath: str = 'exemplo_bd.db', tamanhoLeitores: int = 4,
+                 timeout: float = 5.0, tamanhoIdentityMap: int = 10000,
+                 perfil: str = 'throughput', pragmas: dict | None = None, fts: bool = False,
+                 contadores: bool = False):
+        if ehMemoria(dbPath):
+            # Cada conexão em ':memory:' seria um banco diferente; com cache=shared os
+            # leitores disputariam os locks de tabela com o escritor (sem WAL)
+            raise ValueError("PoolConexoes precisa de um arquivo de banco (não um banco em memória)")
+        if tamanhoLeitores < 1:
+            raise ValueError("tamanhoLeitores deve ser maior que zero")
+
+        super().__init__(dbPath, tamanhoIdentityMap, perfil, pragmas, fts, contadores)
+        self.__tamanhoLeitores = tamanhoLeitores
+        self.__timeout = timeout
+
+        self.__leitoresLivres = queue.LifoQueue()
+        self.__leitores = []
+        self.__leitoresCriados = 0
+        self.__escritor = None
+        # RLock: a thread que já tem o escritor (ex.: dentro de transacao()) pode pedi-lo de novo
+        self.__lockEscritor = threading.RLock()
+        self.__usosEscritor = 0
+        self.__lock = threading.Lock()
+        # Profundidade de transacao() da thread atual
+        self.__local = threading.local()
+
+        self.__metricas = {
+            'checkouts': 0,          # Leitores + escritor entregues
+            'esperas': 0,            # Pedidos que precisaram aguardar uma conexão livre
+            'tempoEspera': 0.0,      # Segundos somados aguardando
+            'timeouts': 0,           # Pedidos que desistiram após o timeout
+            'leitoresEmUso': 0,
+            'escritorEmUso': False,
+        }
+
+    @property
+    def metricas(self):
+        """Cópia das métricas do pool"""
+        with self.__lock:
+            metricas = dict(self.__metricas)
+            metricas['leitoresCriados'] = self.__leitoresCriados
+            metricas['tamanhoLeitores'] = self.__tamanhoLeitores
+        return metricas
+
+    @property
+    def emTransacao(self):
+        # Por thread: outras threads continuam lendo nos leitores
+        return getattr(self.__local, 'nivel', 0) > 0
+
+    def __novaConexao(self, leitura: bool):
+        # check_same_thread=False: a conexão é usada pela thread que fez o checkout
+        conn = sqlite3.connect(self.dbPath, uri=ehUri(self.dbPath), isolation_level=None,
+                               check_same_thread=False, cached_statements=TAMANHO_CACHE_SQL)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        self.aplicarPragmas(conn)
+        if leitura:
+            # Um comando de escrita enviado por engano a um leitor falha em vez de disputar o lock
+            conn.execute("PRAGMA query_only = ON")
+        if self.rastreador is not None:
+            self.rastreador.instalar(conn)
+        return conn
+
+    def conectar(self):
+        """Abre (se preciso) e retorna a conexão de escrita"""
+        with self.__lock:
+            if self.__escritor is None:
+                self.__escritor = self.__novaConexao(leitura=False)
+        return self.__escritor
+
+    def cursor(self):
+        if self.rastreador is not None:
+            return CursorRastreado(CursorPool(self), self.rastreador)
+        return CursorPool(self)
+
+    def ativarRastreamento(self, rastreador: RastreadorSql | None = None):
+        """Como em DatabaseConnection, para o escritor e todos os leitores (inclusive os criados depois)"""
+        rastreador = super().ativarRastreamento(rastreador)
+        with self.__lock:
+            conexoes = list(self.__leitores)
+            if self.__escritor is not None:
+                conexoes.append(self.__escritor)
+        for conn in conexoes:
+            rastreador.instalar(conn)
+        return rastreador
+
+    def __registrarEspera(self, inicio, sucesso):
+        with self.__lock:
+            self.__metricas['esperas'] += 1
+            self.__metricas['tempoEspera'] += time.perf_counter() - inicio
+            if not sucesso:
+                self.__metricas['timeouts'] += 1
+
+    def obterLeitor(self):
+        """Checkout de uma conexão de leitura (aguarda até timeout se todas estiverem em uso)"""
+        self.conectar()  # O escritor aplica journal_mode antes dos leitores existirem
+
+        try:
+            conn = self.__leitoresLivres.get_nowait()
+        except queue.Empty:
+            with self.__lock:
+                criar = self.__leitoresCriados < self.__tamanhoLeitores
+                if criar:
+                    self.__leitoresCriados += 1  # Reserva a vaga antes de conectar
+            if criar:
+                try:
+                    conn = self.__novaConexao(leitura=True)
+                except Exception:
+                    with self.__lock:
+                        self.__leitoresCriados -= 1
+                    raise
+                with self.__lock:
+                    self.__leitores.append(conn)
+            else:
+                inicio = time.perf_counter()
+                try:
+                    conn = self.__leitoresLivres.get(timeout=self.__timeout)
+                except queue.Empty:
+                    self.__registrarEspera(inicio, sucesso=False)
+                    raise TimeoutError(f"Nenhuma conexão de leitura livre após {self.__timeout}s")
+                self.__registrarEspera(inicio, sucesso=True)
+
+        with self.__lock:
+            self.__metricas['checkouts'] += 1
+            self.__metricas['leitoresEmUso'] += 1
+        return conn
+
+    def devolverLeitor(self, conn):
+        """Checkin de uma conexão de leitura"""
+        with self.__lock:
+            self.__metricas['leitoresEmUso'] -= 1
+        self.__leitoresLivres.put(conn)
+
+    @contextmanager
+    def leitor(self):
+        conn = self.obterLeitor()
+        try:
+            yield conn
+        finally:
+            self.devolverLeitor(conn)
+
+    @contextmanager
+    def escritor(self):
+        """Uso exclusivo da conexão de escrita (aguarda até timeout)"""
+        if not self.__lockEscritor.acquire(blocking=False):
+            inicio = time.perf_counter()
+            sucesso = self.__lockEscritor.acquire(timeout=self.__timeout)
+            self.__registrarEspera(inicio, sucesso)
+            if not sucesso:
+                raise TimeoutError(f"Conexão de escrita ocupada após {self.__timeout}s")
+
+        try:
+            with self.__lock:
+                self.__usosEscritor += 1
+                self.__metricas['checkouts'] += 1
+                self.__metricas['escritorEmUso'] = True
+            yield self.conectar()
+        finally:
+            with self.__lock:
+                self.__usosEscritor -= 1
+                self.__metricas['escritorEmUso'] = self.__usosEscritor > 0
+            self.__lockEscritor.release()
+
+    @contextmanager
+    def transacao(self):
+        # A thread fica com o escritor durante todo o bloco: um único escritor por vez
+        with self.escritor():
+            self.__local.nivel = getattr(self.__local, 'nivel', 0) + 1
+            try:
+                with super().transacao():
+                    yield self
+            finally:
+                self.__local.nivel -= 1
+
+    def fechar(self):
+        """Fecha todas as conexões do pool"""
+        with self.__lock:
+            leitores = self.__leitores
+            self.__leitores = []
+            self.__leitoresCriados = 0
+            escritor = self.__escritor
+            self.__escritor = None
+        self.__leitoresLivres = queue.LifoQueue()
+
+        for conn in leitores:
+            conn.close()
+        if escritor is not None:
+            escritor.close()
+        super().fechar()
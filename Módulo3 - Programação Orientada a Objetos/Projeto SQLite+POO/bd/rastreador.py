@@ -0,0 +1,306 @@
+"""
+Rastreamento dos comandos SQL enviados pelos DAOs: latência, linhas e origem
+de cada comando, agregados pelo SQL normalizado (sem os valores).
+Dentro de um escopo (ex.: uma opção de menu) acusa consultas idênticas repetidas
+e o mesmo comando executado muitas vezes com parâmetros diferentes (N+1).
+Pode ser compartilhado por várias threads (PoolConexoes): os escopos são por thread.
+"""
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+# Arquivos ignorados ao procurar a origem (quem chamou o cursor)
+DIRETORIO_BD = os.path.dirname(os.path.abspath(__file__))
+DIRETORIO_PROJETO = os.path.dirname(DIRETORIO_BD)
+# Só consultas entram na detecção de repetições idênticas
+COMANDOS_CONSULTA = ('SELECT', 'WITH')
+
+RE_TEXTO = re.compile(r"'(?:[^']|'')*'")
+RE_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+RE_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def normalizarSql(sql: str):
+    """Troca literais por ? e listas (?, ?, ...) de qualquer tamanho por uma só forma"""
+    sql = RE_TEXTO.sub("?", sql)
+    sql = RE_NUMERO.sub("?", sql)
+    sql = RE_LISTA.sub("(?, ...)", sql)
+    return " ".join(sql.split()).rstrip(";").rstrip()
+
+
+def origemChamada():
+    """'arquivo:linha funcao' do primeiro frame fora de bd/ (o DAO ou serviço que executou)"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        arquivo = frame.f_code.co_filename
+        if not arquivo.startswith(DIRETORIO_BD + os.sep) and 'contextlib' not in arquivo:
+            return f"{os.path.relpath(arquivo, DIRETORIO_PROJETO)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "?"
+
+
+class EstatisticaSql:
+    __slots__ = ('sql', 'execucoes', 'segundos', 'maximo', 'linhas', 'comandos', 'origens')
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.execucoes = 0
+        self.segundos = 0.0
+        self.maximo = 0.0
+        self.linhas = 0
+        self.comandos = 0      # Comandos que o SQLite executou (inclui corpos de triggers)
+        self.origens = Counter()
+
+
+class Execucao:
+    """
+    Uma chamada de execute; as leituras (fetch) seguintes somam tempo e linhas a ela.
+    parametros só é guardado com RastreadorSql(mostrarParametros=True); quantidadeParametros
+    é None para executemany.
+    """
+    __slots__ = ('estatistica', 'sql', 'parametros', 'quantidadeParametros', 'origem', 'escopo',
+                 'segundos', 'linhas', 'lenta')
+
+    def __init__(self, estatistica, sql, parametros, quantidadeParametros, origem, escopo):
+        self.estatistica = estatistica
+        self.sql = sql
+        self.parametros = parametros
+        self.quantidadeParametros = quantidadeParametros
+        self.origem = origem
+        self.escopo = escopo
+        self.segundos = 0.0
+        self.linhas = 0
+        self.lenta = False
+
+
+class CursorRastreado:
+    """Cursor do sqlite3 que informa cada execute/fetch ao rastreador"""
+    def __init__(self, cursor, rastreador):
+        self.__cursor = cursor
+        self.__rastreador = rastreador
+        self.__execucao = None
+
+    def execute(self, sql: str, parametros=()):
+        self.__execucao = self.__rastreador.executar(self.__cursor.execute, sql, parametros)
+        return self
+
+    def executemany(self, sql: str, parametros):
+        self.__execucao = self.__rastreador.executar(self.__cursor.executemany, sql, parametros, varios=True)
+        return self
+
+    def __ler(self, metodo, *args):
+        inicio = time.perf_counter()
+        resultado = metodo(*args)
+        if self.__execucao is not None:
+            linhas = 1 if isinstance(resultado, tuple) or hasattr(resultado, 'keys') else len(resultado or ())
+            self.__rastreador.registrarLeitura(self.__execucao, linhas, time.perf_counter() - inicio)
+        return resultado
+
+    def fetchone(self):
+        return self.__ler(self.__cursor.fetchone)
+
+    def fetchmany(self, tamanho: int = 1):
+        return self.__ler(self.__cursor.fetchmany, tamanho)
+
+    def fetchall(self):
+        return self.__ler(self.__cursor.fetchall)
+
+    def __iter__(self):
+        while True:
+            linhas = self.fetchmany(500)
+            if not linhas:
+                return
+            yield from linhas
+
+    def __getattr__(self, nome):
+        # lastrowid, rowcount, description, close...
+        return getattr(self.__cursor, nome)
+
+
+class RastreadorSql:
+    def __init__(self, limiarLentaMs: float = 50.0, limiarRepeticoes: int = 10, maxLentas: int = 100,
+                 mostrarParametros: bool = False):
+        """
+        limiarLentaMs: execuções a partir desse tempo (execute + fetch) entram na lista de lentas.
+        limiarRepeticoes: no mesmo escopo, o mesmo SQL normalizado executado esse número de vezes
+        com parâmetros diferentes é acusado como N+1.
+        mostrarParametros: o relatório das execuções lentas exibe os valores dos parâmetros
+        (podem conter senhas e dados pessoais); por padrão exibe só quantos são.
+        """
+        self.__limiarLenta = limiarLentaMs / 1000
+        self.__mostrarParametros = mostrarParametros
+        self.__limiarRepeticoes = limiarRepeticoes
+        self.__estatisticas = {}
+        self.__lentas = deque(maxlen=maxLentas)
+        self.__alertas = []
+        self.__lock = threading.RLock()
+        # Por thread: pilha de escopos abertos (nome, Counter de (sql, parametros), Counter de sql
+        # normalizado), comandos vistos pelo trace e se um execute do cursor está em andamento
+        self.__local = threading.local()
+
+    def __estadoThread(self):
+        local = self.__local
+        if not hasattr(local, 'escopos'):
+            local.escopos = []
+            local.comandosSqlite = 0
+            local.emExecucao = False
+        return local
+
+    @property
+    def estatisticas(self):
+        """SQL normalizado -> EstatisticaSql"""
+        with self.__lock:
+            return dict(self.__estatisticas)
+
+    @property
+    def lentas(self):
+        with self.__lock:
+            return list(self.__lentas)
+
+    @property
+    def alertas(self):
+        """Lista de (escopo, tipo, sql, quantidade); tipo é 'repetida' ou 'n+1'"""
+        with self.__lock:
+            return list(self.__alertas)
+
+    def instalar(self, conn):
+        # Vê também o que não passa pelo cursor (BEGIN/COMMIT de transacao()) e os corpos de triggers
+        conn.set_trace_callback(self.__aoExecutarSqlite)
+
+    def __aoExecutarSqlite(self, sql):
+        # Chamado na thread que executa o comando, a mesma do cursor
+        local = self.__estadoThread()
+        local.comandosSqlite += 1
+        if not local.emExecucao and not sql.startswith('--'):
+            self.__registrar(sql, (), origemChamada(), 0.0, comandos=1, noEscopo=False)
+
+    def __registrar(self, sql, parametros, origem, segundos, comandos, varios=False, noEscopo=True):
+        normalizado = normalizarSql(sql)
+        with self.__lock:
+            estatistica = self.__estatisticas.get(normalizado)
+            if estatistica is None:
+                estatistica = self.__estatisticas[normalizado] = EstatisticaSql(normalizado)
+            estatistica.execucoes += 1
+            estatistica.comandos += comandos
+            estatistica.origens[origem] += 1
+
+        escopo = None
+        escopos = self.__estadoThread().escopos
+        if escopos and noEscopo:
+            escopo, identicas, porSql = escopos[-1]
+            porSql[normalizado] += 1
+            if not varios and normalizado.lstrip('( ').upper().startswith(COMANDOS_CONSULTA):
+                chave = tuple(sorted(parametros.items())) if isinstance(parametros, dict) else tuple(parametros)
+                identicas[(sql, chave)] += 1
+
+        quantidade = None if varios else len(parametros)
+        execucao = Execucao(estatistica, sql, parametros if self.__mostrarParametros and not varios else None,
+                            quantidade, origem, escopo)
+        self.registrarLeitura(execucao, 0, segundos)
+        return execucao
+
+    def executar(self, metodo, sql, parametros, varios=False):
+        """Executa metodo(sql, parametros) medindo o tempo; retorna a Execucao registrada"""
+        origem = origemChamada()
+        local = self.__estadoThread()
+        comandosAntes = local.comandosSqlite
+        local.emExecucao = True
+        inicio = time.perf_counter()
+        try:
+            cursor = metodo(sql, parametros)
+        finally:
+            segundos = time.perf_counter() - inicio
+            local.emExecucao = False
+
+        execucao = self.__registrar(sql, parametros, origem, segundos,
+                                    local.comandosSqlite - comandosAntes, varios)
+        if cursor.rowcount > 0:
+            # INSERT/UPDATE/DELETE; em SELECT as linhas são contadas no fetch
+            self.registrarLeitura(execucao, cursor.rowcount, 0.0)
+        return execucao
+
+    def registrarLeitura(self, execucao, linhas, segundos):
+        execucao.segundos += segundos
+        execucao.linhas += linhas
+        estatistica = execucao.estatistica
+        with self.__lock:
+            estatistica.segundos += segundos
+            estatistica.linhas += linhas
+            estatistica.maximo = max(estatistica.maximo, execucao.segundos)
+            if not execucao.lenta and execucao.segundos >= self.__limiarLenta:
+                execucao.lenta = True
+                self.__lentas.append(execucao)
+
+    @contextmanager
+    def escopo(self, nome: str):
+        """Agrupa os comandos de uma operação (ex.: uma opção de menu) para detectar repetições"""
+        identicas, porSql = Counter(), Counter()
+        escopos = self.__estadoThread().escopos
+        escopos.append((nome, identicas, porSql))
+        try:
+            yield self
+        finally:
+            escopos.pop()
+            alertas = [(nome, 'repetida', normalizarSql(sql), quantidade)
+                       for (sql, _), quantidade in identicas.items() if quantidade > 1]
+            alertas += [(nome, 'n+1', sql, quantidade)
+                        for sql, quantidade in porSql.items() if quantidade >= self.__limiarRepeticoes]
+            with self.__lock:
+                self.__alertas.extend(alertas)
+
+    def limpar(self):
+        with self.__lock:
+            self.__estatisticas.clear()
+            self.__lentas.clear()
+            self.__alertas.clear()
+
+    def relatorio(self, topN: int = 10, larguraSql: int = 70):
+        """Texto com os topN comandos por tempo total, as execuções lentas e os alertas"""
+        linhas = []
+        with self.__lock:
+            estatisticas = sorted(self.__estatisticas.values(), key=lambda e: e.segundos, reverse=True)
+            lentas = list(self.__lentas)
+            alertas = list(self.__alertas)
+        totalSegundos = sum(e.segundos for e in estatisticas)
+        totalExecucoes = sum(e.execucoes for e in estatisticas)
+
+        linhas.append("=" * 110)
+        linhas.append(f"  RASTREAMENTO SQL: {totalExecucoes} execuções, {len(estatisticas)} comandos distintos, "
+                      f"{totalSegundos * 1000:.1f} ms")
+        linhas.append("=" * 110)
+        linhas.append(f"{'Total ms':>10} {'Exec':>7} {'Média ms':>9} {'Máx ms':>8} {'Linhas':>8}  SQL / origem principal")
+        linhas.append("-" * 110)
+        for e in estatisticas[:topN]:
+            sql = e.sql if len(e.sql) <= larguraSql else e.sql[:larguraSql - 3] + "..."
+            linhas.append(f"{e.segundos * 1000:>10.2f} {e.execucoes:>7} {e.segundos * 1000 / e.execucoes:>9.3f} "
+                          f"{e.maximo * 1000:>8.2f} {e.linhas:>8}  {sql}")
+            origem, quantidade = e.origens.most_common(1)[0]
+            linhas.append(f"{'':>47}↳ {origem} ({quantidade}x)")
+
+        if lentas:
+            linhas.append("")
+            linhas.append(f"Execuções lentas (>= {self.__limiarLenta * 1000:g} ms):")
+            for execucao in sorted(lentas, key=lambda x: x.segundos, reverse=True)[:topN]:
+                linhas.append(f"  {execucao.segundos * 1000:>9.2f} ms  {execucao.linhas:>7} linhas  "
+                              f"{execucao.estatistica.sql[:larguraSql]}")
+                if execucao.parametros is not None:
+                    parametros = f"parâmetros={execucao.parametros!r}"
+                elif execucao.quantidadeParametros is not None:
+                    parametros = f"{execucao.quantidadeParametros} parâmetro(s)"
+                else:
+                    parametros = "executemany"
+                linhas.append(f"{'':>14}↳ {execucao.origem}  {parametros}"
+                              + (f"  escopo={execucao.escopo}" if execucao.escopo else ""))
+
+        if alertas:
+            linhas.append("")
+            linhas.append("Alertas:")
+            for escopo, tipo, sql, quantidade in alertas[-topN:]:
+                descricao = "consulta idêntica repetida" if tipo == 'repetida' else "possível N+1"
+                linhas.append(f"  ⚠️  [{escopo}] {descricao}: {quantidade}x  {sql[:larguraSql]}")
+
+        return "\n".join(linhas)
@@ -0,0 +1,98 @@
+"""
+Versões async dos DAOs, para uso em código asyncio.
+Cada método tem o mesmo nome e os mesmos parâmetros do DAO síncrono e roda na
+thread do ExecutorBanco (bd/executor.py); os DAOs síncronos continuam iguais.
+
+    executor = ExecutorBanco(DatabaseConnection('exemplo_bd.db'))
+    pessoaDao = PessoaDAOAssincrono(executor)
+    pessoa = await pessoaDao.buscarPorId(1)
+    await pessoaDao.salvar(pessoa)      # escritas simultâneas são agrupadas em um commit
+"""
+from functools import partial
+from itertools import islice
+
+from bd.executor import ExecutorBanco
+from dao.categoria_dao import CategoriaDAO
+from dao.disciplina_dao import DisciplinaDAO
+from dao.pessoa_dao import PessoaDAO
+from dao.usuario_dao import UsuarioDAO
+
+
+class DAOAssincrono:
+    # Métodos que alteram o banco (entram nos lotes de escrita do executor)
+    ESCRITAS = frozenset()
+
+    def __init__(self, executor: ExecutorBanco, classeDao):
+        self.__executor = executor
+        self.__dao = classeDao(executor.db)
+
+    def __getattr__(self, nome):
+        metodo = getattr(self.__dao, nome) if not nome.startswith('_') else None
+        if not callable(metodo):
+            raise AttributeError(f"'{type(self).__name__}' não tem o método '{nome}'")
+
+        executor = self.__executor
+        escrita = nome in self.ESCRITAS
+
+        async def chamar(*args, **kwargs):
+            return await executor.executar(partial(metodo, *args, **kwargs), escrita=escrita)
+
+        chamar.__name__ = nome
+        setattr(self, nome, chamar)  # Próximas chamadas não passam por __getattr__
+        return chamar
+
+    async def iterar(self, nomeMetodo: str, tamanhoLote: int = 500):
+        """
+        Percorre um gerador do DAO (ex.: iterarTodas) buscando tamanhoLote objetos
+        por vez na thread do banco
+        """
+        executor = self.__executor
+        gerador = await executor.executar(partial(getattr(self.__dao, nomeMetodo), tamanhoLote))
+        try:
+            while True:
+                lote = await executor.executar(lambda: list(islice(gerador, tamanhoLote)))
+                if not lote:
+                    return
+                for item in lote:
+                    yield item
+        finally:
+            # O cursor do gerador pertence à thread do banco
+            await executor.executar(gerador.close)
+
+
+class CategoriaDAOAssincrono(DAOAssincrono):
+    ESCRITAS = frozenset({'salvar', 'salvarEmLote', 'deletar'})
+
+    def __init__(self, executor: ExecutorBanco):
+        super().__init__(executor, CategoriaDAO)
+
+
+class PessoaDAOAssincrono(DAOAssincrono):
+    ESCRITAS = frozenset({'salvar', 'salvarEmLote', 'deletar'})
+
+    def __init__(self, executor: ExecutorBanco):
+        super().__init__(executor, PessoaDAO)
+
+    def iterarTodas(self, tamanhoLote: int = 500):
+        return self.iterar('iterarTodas', tamanhoLote)
+
+
+class UsuarioDAOAssincrono(DAOAssincrono):
+    ESCRITAS = frozenset({'salvar', 'salvarEmLote', 'deletar'})
+
+    def __init__(self, executor: ExecutorBanco):
+        super().__init__(executor, UsuarioDAO)
+
+    def iterarTodos(self, tamanhoLote: int = 500):
+        return self.iterar('iterarTodos', tamanhoLote)
+
+
+class DisciplinaDAOAssincrono(DAOAssincrono):
+    ESCRITAS = frozenset({'salvar', 'salvarEmLote', 'deletar', 'vincularPessoa', 'vincularPessoasEmLote',
+                          'sincronizarVinculos', 'desvincularPessoa'})
+
+    def __init__(self, executor: ExecutorBanco):
+        super().__init__(executor, DisciplinaDAO)
+
+    def iterarTodas(self, tamanhoLote: int = 500):
+        return self.iterar('iterarTodas', tamanhoLote)
@@ -0,0 +1,21 @@
+"""
+Funções auxiliares para as buscas de texto dos DAOs (FTS5)
+"""
+import re
+
+
+def montarConsultaFts(termo: str, coluna: str | None = None):
+    """
+    Converte o texto digitado em uma consulta MATCH do FTS5: cada palavra vira
+    um prefixo ("jo" encontra "João") e todas precisam aparecer.
+    Retorna None se o termo não tiver nenhuma palavra (ex.: busca vazia).
+    """
+    palavras = re.findall(r"\w+", termo)
+    if not palavras:
+        return None
+
+    # Aspas evitam que palavras como AND/OR/NOT sejam lidas como operadores
+    consulta = " ".join(f'"{palavra}"*' for palavra in palavras)
+    if coluna is not None:
+        consulta = f"{coluna} : ({consulta})"
+    return consulta
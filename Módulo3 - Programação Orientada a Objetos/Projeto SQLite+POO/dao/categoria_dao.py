@@ -1,12 +1,21 @@
 """
 DAO (Data Access Object) para operações de banco de dados da tabela categoria
 """
+from bd.cache_tabela import obterCache
 from bd.database import DatabaseConnection
+from dao.lote import desfazerIdsAoReverter, executarEmLotes
 from model.categoria import Categoria
 
 class CategoriaDAO:
     def __init__(self, db: DatabaseConnection):
         self.__db = db
+        # Tabela inteira em memória, compartilhada pelas conexões do processo ao mesmo arquivo
+        self.__cache = obterCache(db, 'categoria')
+    
+    @property
+    def cache(self):
+        """CacheTabela das categorias (cache.estatisticas tem acertos/falhas)"""
+        return self.__cache
     
     def salvar(self, categoria: Categoria):
         cur = self.__db.cursor()
@@ -15,34 +24,87 @@ class CategoriaDAO:
             # INSERT
             cur.execute("INSERT INTO categoria (nome) VALUES (?);", (categoria.nome,))
             categoria.id = cur.lastrowid
+            desfazerIdsAoReverter(self.__db, [categoria])
         else:
             # UPDATE
             cur.execute("UPDATE categoria SET nome = ? WHERE id = ?;", (categoria.nome, categoria.id))
+            self.__db.identityMap.remover(Categoria, categoria.id)
         
+        self.__cache.registrarAlteracao(self.__db)
         return categoria.id
     
+    def salvarEmLote(self, categorias, tamanhoLote: int = 500):
+        """
+        Insere/atualiza várias categorias com executemany em uma única transação.
+        Categorias sem id fazem upsert pelo nome; as com id, pelo id.
+        Os ids gerados são gravados de volta nos objetos. Retorna o total salvo.
+        """
+        return executarEmLotes(self.__db, categorias, tamanhoLote, self.__salvarLote)
+    
+    def __salvarLote(self, cur, categorias):
+        self.__cache.registrarAlteracao(self.__db)
+        novas = [c for c in categorias if c.id is None]
+        existentes = [c for c in categorias if c.id is not None]
+        
+        if existentes:
+            cur.executemany("""
+                INSERT INTO categoria (id, nome) VALUES (?, ?)
+                ON CONFLICT(id) DO UPDATE SET nome = excluded.nome;
+            """, [(c.id, c.nome) for c in existentes])
+            
+            for c in existentes:
+                self.invalidar(c.id)
+        
+        if novas:
+            cur.executemany("""
+                INSERT INTO categoria (nome) VALUES (?)
+                ON CONFLICT(nome) DO NOTHING;
+            """, [(c.nome,) for c in novas])
+            
+            # executemany não informa lastrowid de cada linha: buscar os ids pelo nome (UNIQUE)
+            nomes = [c.nome for c in novas]
+            marcadores = ", ".join("?" * len(nomes))
+            cur.execute(f"SELECT id, nome FROM categoria WHERE nome IN ({marcadores});", nomes)
+            idsPorNome = {row['nome']: row['id'] for row in cur.fetchall()}
+            
+            for c in novas:
+                c.id = idsPorNome[c.nome]
+        
+        return novas
+    
     def buscarPorId(self, id: int):
-        cur = self.__db.cursor()
-        cur.execute("SELECT * FROM categoria WHERE id = ?;", (id,))
-        row = cur.fetchone()
+        # Sempre pelo cache (ou pelo banco): a instância do identity map pode ter sido
+        # carregada antes de outra conexão alterar a linha, e criarDeRow a atualiza
+        if self.__cache.usavel(self.__db):
+            row = self.__cache.buscarPorId(self.__db, id)
+        else:
+            cur = self.__db.cursor()
+            cur.execute("SELECT id, nome FROM categoria WHERE id = ?;", (id,))
+            row = cur.fetchone()
         
         if row:
             return self.criarDeRow(row)
         return None
     
     def buscarPorNome(self, nome: str):
-        cur = self.__db.cursor()
-        cur.execute("SELECT * FROM categoria WHERE nome = ?;", (nome,))
-        row = cur.fetchone()
+        if self.__cache.usavel(self.__db):
+            row = self.__cache.buscarPorNome(self.__db, nome)
+        else:
+            cur = self.__db.cursor()
+            cur.execute("SELECT id, nome FROM categoria WHERE nome = ?;", (nome,))
+            row = cur.fetchone()
         
         if row:
             return self.criarDeRow(row)
         return None
     
     def listarTodas(self):
-        cur = self.__db.cursor()
-        cur.execute("SELECT * FROM categoria ORDER BY nome;")
-        rows = cur.fetchall()
+        if self.__cache.usavel(self.__db):
+            rows = sorted(self.__cache.linhas(self.__db), key=lambda row: row[1])
+        else:
+            cur = self.__db.cursor()
+            cur.execute("SELECT id, nome FROM categoria ORDER BY nome;")
+            rows = cur.fetchall()
         
         resultado = []
         for row in rows:
@@ -50,10 +112,15 @@ class CategoriaDAO:
         return resultado
     
     def criarDeRow(self, row):
-        return Categoria(
-            id=row['id'],
-            nome=row['nome']
-        )
+        # Reaproveitar a instância já carregada, se houver, com o nome da linha lida
+        # (após o ttl do cache, a linha pode trazer uma alteração de outra conexão)
+        categoria = self.__db.identityMap.obter(Categoria, row[0])
+        if categoria is not None:
+            categoria.nome = row[1]
+            return categoria
+        
+        # Colunas pela posição (id, nome): as consultas e o cache começam por elas
+        return self.__db.identityMap.registrar(Categoria(row[0], row[1]))
     
     def deletar(self, categoria: Categoria):
         if categoria.id is None:
@@ -61,6 +128,12 @@ class CategoriaDAO:
         
         cur = self.__db.cursor()
         cur.execute("DELETE FROM categoria WHERE id = ?;", (categoria.id,))
+        self.__db.identityMap.remover(Categoria, categoria.id)
+        self.__cache.registrarAlteracao(self.__db)
 
         return cur.rowcount > 0
+    
+    def invalidar(self, categoriaId: int):
+        """Remove a categoria do identity map (ex.: alteração descartada sem salvar)"""
+        self.__db.identityMap.remover(Categoria, categoriaId)
 
@@ -4,11 +4,16 @@ e da tabela intermediária pessoa_disciplina (relacionamento N:N)
 """
 
 from bd.database import DatabaseConnection
+from dao.busca import montarConsultaFts
+from dao.lote import desfazerIdsAoReverter, executarEmLotes
 from model.disciplina import Disciplina
 from model.pessoa import Pessoa
 from dao.pessoa_dao import PessoaDAO
 
 class DisciplinaDAO:
+    # Colunas lidas pela posição em criarDeRow (total_matriculados e futuras colunas ficam de fora)
+    COLUNAS = "d.id, d.nome, d.carga_horaria, d.descricao"
+    
     def __init__(self, db: DatabaseConnection):
         self.__db = db
     
@@ -23,18 +28,68 @@ class DisciplinaDAO:
             """, (disciplina.nome, disciplina.cargaHoraria, disciplina.descricao))
             
             disciplina.id = cur.lastrowid
+            desfazerIdsAoReverter(self.__db, [disciplina])
         else:
             # UPDATE
             cur.execute("""
                 UPDATE disciplina SET nome = ?, carga_horaria = ?, descricao = ?
                 WHERE id = ?;
             """, (disciplina.nome, disciplina.cargaHoraria, disciplina.descricao, disciplina.id))
+            self.__db.identityMap.remover(Disciplina, disciplina.id)
         
         return disciplina.id
     
+    def salvarEmLote(self, disciplinas, tamanhoLote: int = 500):
+        """
+        Insere/atualiza várias disciplinas com executemany em uma única transação.
+        Disciplinas sem id fazem upsert pelo nome; as com id, pelo id.
+        Os ids gerados são gravados de volta nos objetos. Retorna o total salvo.
+        """
+        return executarEmLotes(self.__db, disciplinas, tamanhoLote, self.__salvarLote)
+    
+    def __salvarLote(self, cur, disciplinas):
+        novas = [d for d in disciplinas if d.id is None]
+        existentes = [d for d in disciplinas if d.id is not None]
+        
+        if existentes:
+            cur.executemany("""
+                INSERT INTO disciplina (id, nome, carga_horaria, descricao)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    nome = excluded.nome, carga_horaria = excluded.carga_horaria,
+                    descricao = excluded.descricao;
+            """, [(d.id, d.nome, d.cargaHoraria, d.descricao) for d in existentes])
+            
+            for d in existentes:
+                self.invalidar(d.id)
+        
+        if novas:
+            cur.executemany("""
+                INSERT INTO disciplina (nome, carga_horaria, descricao)
+                VALUES (?, ?, ?)
+                ON CONFLICT(nome) DO UPDATE SET
+                    carga_horaria = excluded.carga_horaria, descricao = excluded.descricao;
+            """, [(d.nome, d.cargaHoraria, d.descricao) for d in novas])
+            
+            # executemany não informa lastrowid de cada linha: buscar os ids pelo nome (UNIQUE)
+            nomes = [d.nome for d in novas]
+            marcadores = ", ".join("?" * len(nomes))
+            cur.execute(f"SELECT id, nome FROM disciplina WHERE nome IN ({marcadores});", nomes)
+            idsPorNome = {row['nome']: row['id'] for row in cur.fetchall()}
+            
+            for d in novas:
+                d.id = idsPorNome[d.nome]
+                self.invalidar(d.id)
+        
+        return novas
+    
     def buscarPorId(self, id: int):
+        disciplina = self.__db.identityMap.obter(Disciplina, id)
+        if disciplina is not None:
+            return disciplina
+        
         cur = self.__db.cursor()
-        cur.execute("SELECT * FROM disciplina WHERE id = ?;", (id,))
+        cur.execute(f"SELECT {self.COLUNAS} FROM disciplina d WHERE d.id = ?;", (id,))
         row = cur.fetchone()
         
         if row:
@@ -42,8 +97,44 @@ class DisciplinaDAO:
         return None
     
     def buscarPorNome(self, nome: str):
+        """Com FTS5 ativo: busca por prefixo de palavra, ordenada por relevância. Sem FTS5: LIKE"""
+        consulta = montarConsultaFts(nome, 'nome') if self.__db.ftsAtivo else None
+        cur = self.__db.cursor()
+        
+        if consulta is not None:
+            cur.execute(f"""
+                SELECT {self.COLUNAS} FROM disciplina d
+                JOIN disciplina_fts ON disciplina_fts.rowid = d.id
+                WHERE disciplina_fts MATCH ?
+                ORDER BY disciplina_fts.rank;
+            """, (consulta,))
+        else:
+            cur.execute(f"SELECT {self.COLUNAS} FROM disciplina d WHERE d.nome LIKE ?;", (f'%{nome}%',))
+        rows = cur.fetchall()
+        
+        resultado = []
+        for row in rows:
+            resultado.append(self.criarDeRow(row))
+        return resultado
+    
+    def buscarTexto(self, termo: str, limite: int = 50):
+        """Busca no nome e na descrição; com FTS5, ordenada por relevância (nome pesa mais)"""
+        consulta = montarConsultaFts(termo) if self.__db.ftsAtivo else None
         cur = self.__db.cursor()
-        cur.execute("SELECT * FROM disciplina WHERE nome LIKE ?;", (f'%{nome}%',))
+        
+        if consulta is not None:
+            cur.execute(f"""
+                SELECT {self.COLUNAS} FROM disciplina d
+                JOIN disciplina_fts ON disciplina_fts.rowid = d.id
+                WHERE disciplina_fts MATCH ?
+                ORDER BY bm25(disciplina_fts, 10.0, 1.0) LIMIT ?;
+            """, (consulta, limite))
+        else:
+            cur.execute(f"""
+                SELECT {self.COLUNAS} FROM disciplina d
+                WHERE d.nome LIKE ? OR d.descricao LIKE ?
+                ORDER BY d.nome LIMIT ?;
+            """, (f'%{termo}%', f'%{termo}%', limite))
         rows = cur.fetchall()
         
         resultado = []
@@ -53,7 +144,43 @@ class DisciplinaDAO:
     
     def listarTodas(self):
         cur = self.__db.cursor()
-        cur.execute("SELECT * FROM disciplina ORDER BY nome;")
+        cur.execute(f"SELECT {self.COLUNAS} FROM disciplina d ORDER BY d.nome;")
+        rows = cur.fetchall()
+        
+        resultado = []
+        for row in rows:
+            resultado.append(self.criarDeRow(row))
+        return resultado
+    
+    def iterarTodas(self, tamanhoLote: int = 500):
+        """
+        Gerador com todas as disciplinas em ordem de nome, lendo tamanhoLote linhas por vez
+        (com PoolConexoes o resultado é lido por inteiro antes, ver CursorPool)
+        """
+        cur = self.__db.cursor()
+        cur.execute(f"SELECT {self.COLUNAS} FROM disciplina d ORDER BY d.nome, d.id;")
+        
+        while True:
+            rows = cur.fetchmany(tamanhoLote)
+            if not rows:
+                break
+            for row in rows:
+                yield self.criarDeRow(row)
+    
+    def listarPagina(self, aposNome: str | None = None, aposId: int | None = None, limite: int = 50):
+        """
+        Paginação por chave (keyset): até `limite` disciplinas em ordem de (nome, id)
+        posteriores à última disciplina da página anterior
+        """
+        cur = self.__db.cursor()
+        if aposNome is None:
+            cur.execute(f"SELECT {self.COLUNAS} FROM disciplina d ORDER BY d.nome, d.id LIMIT ?;", (limite,))
+        else:
+            cur.execute(f"""
+                SELECT {self.COLUNAS} FROM disciplina d
+                WHERE (d.nome, d.id) > (?, ?)
+                ORDER BY d.nome, d.id LIMIT ?;
+            """, (aposNome, aposId if aposId is not None else 0, limite))
         rows = cur.fetchall()
         
         resultado = []
@@ -61,41 +188,95 @@ class DisciplinaDAO:
             resultado.append(self.criarDeRow(row))
         return resultado
     
+    def contar(self):
+        cur = self.__db.cursor()
+        cur.execute("SELECT COUNT(*) FROM disciplina;")
+        return cur.fetchone()[0]
+    
     def criarDeRow(self, row):
-        return Disciplina(
-            id=row['id'],
-            nome=row['nome'],
-            cargaHoraria=row['carga_horaria'],
-            descricao=row['descricao']
-        )
+        # Reaproveitar a instância já carregada, se houver
+        disciplina = self.__db.identityMap.obter(Disciplina, row[0])
+        if disciplina is not None:
+            return disciplina
+        
+        # Colunas pela posição, na ordem de COLUNAS
+        id, nome, cargaHoraria, descricao = row[:4]
+        return self.__db.identityMap.registrar(Disciplina(id, nome, cargaHoraria, descricao))
     
     def deletar(self, disciplina: Disciplina):
         cur = self.__db.cursor()
         cur.execute("DELETE FROM disciplina WHERE id = ?;", (disciplina.id,))
+        self.__db.identityMap.remover(Disciplina, disciplina.id)
         
         return cur.rowcount > 0
     
+    def invalidar(self, disciplinaId: int):
+        """Remove a disciplina do identity map (ex.: alteração descartada sem salvar)"""
+        self.__db.identityMap.remover(Disciplina, disciplinaId)
+    
     # Métodos para gerenciar relacionamento N:N com Pessoa
     
     def vincularPessoa(self, pessoa: Pessoa, disciplina: Disciplina):
-        """Vincula uma pessoa a uma disciplina"""
+        """Vincula uma pessoa a uma disciplina (retorna False se o vínculo já existia)"""
         cur = self.__db.cursor()
         
-        # Verificar se já existe o vínculo
+        # OR IGNORE: um vínculo existente (PK) não é inserido de novo, sem SELECT prévio
         cur.execute("""
-            SELECT * FROM pessoa_disciplina 
-            WHERE pessoa_id = ? AND disciplina_id = ?;
+            INSERT OR IGNORE INTO pessoa_disciplina (pessoa_id, disciplina_id)
+            VALUES (?, ?);
         """, (pessoa.id, disciplina.id))
         
-        if cur.fetchone():
-            return False  # Já existe o vínculo
+        return cur.rowcount > 0
+    
+    def vincularPessoasEmLote(self, disciplina: Disciplina, pessoas, tamanhoLote: int = 500):
+        """
+        Vincula várias pessoas (objetos Pessoa ou ids) à disciplina com executemany em
+        uma única transação. Vínculos que já existiam são ignorados. Retorna quantos
+        vínculos foram criados.
+        """
+        adicionados = 0
         
-        cur.execute("""
-            INSERT INTO pessoa_disciplina (pessoa_id, disciplina_id)
-            VALUES (?, ?);
-        """, (pessoa.id, disciplina.id))
+        def salvarLote(cur, lote):
+            nonlocal adicionados
+            cur.executemany("""
+                INSERT OR IGNORE INTO pessoa_disciplina (pessoa_id, disciplina_id)
+                VALUES (?, ?);
+            """, [(pessoa if isinstance(pessoa, int) else pessoa.id, disciplina.id) for pessoa in lote])
+            adicionados += cur.rowcount
+            return []
+        
+        executarEmLotes(self.__db, pessoas, tamanhoLote, salvarLote)
+        return adicionados
+    
+    def sincronizarVinculos(self, disciplina: Disciplina, pessoaIds):
+        """
+        Deixa a disciplina vinculada exatamente às pessoas de pessoaIds: cria os vínculos
+        que faltam e remove os que sobram, em uma única transação.
+        Retorna (adicionados, removidos).
+        """
+        desejados = set(pessoaIds)
+        
+        with self.__db.transacao():
+            cur = self.__db.cursor()
+            cur.execute("SELECT pessoa_id FROM pessoa_disciplina WHERE disciplina_id = ?;",
+                        (disciplina.id,))
+            atuais = {row[0] for row in cur.fetchall()}
+            
+            remover = atuais - desejados
+            adicionar = desejados - atuais
+            
+            if remover:
+                cur.executemany("""
+                    DELETE FROM pessoa_disciplina
+                    WHERE pessoa_id = ? AND disciplina_id = ?;
+                """, [(pessoaId, disciplina.id) for pessoaId in remover])
+            if adicionar:
+                cur.executemany("""
+                    INSERT OR IGNORE INTO pessoa_disciplina (pessoa_id, disciplina_id)
+                    VALUES (?, ?);
+                """, [(pessoaId, disciplina.id) for pessoaId in adicionar])
         
-        return True
+        return len(adicionar), len(remover)
     
     def desvincularPessoa(self, pessoa: Pessoa, disciplina: Disciplina):
         """Remove o vínculo entre uma pessoa e uma disciplina"""
@@ -107,30 +288,83 @@ class DisciplinaDAO:
         
         return cur.rowcount > 0
     
+    def contarPorDisciplina(self, disciplinaIds=None):
+        """
+        Quantidade de pessoas vinculadas a cada disciplina: {disciplinaId: total}.
+        Disciplinas sem vínculos aparecem com 0. disciplinaIds limita às disciplinas informadas.
+        Com contadores ativos (DatabaseConnection(contadores=True)) lê total_matriculados;
+        senão, uma única consulta com GROUP BY.
+        """
+        filtro = ""
+        parametros = ()
+        if disciplinaIds is not None:
+            parametros = tuple(disciplinaIds)
+            if not parametros:
+                return {}
+            filtro = f"WHERE d.id IN ({', '.join('?' * len(parametros))})"
+        
+        cur = self.__db.cursor()
+        if self.__db.contadoresAtivos:
+            cur.execute(f"SELECT d.id, d.total_matriculados FROM disciplina d {filtro};", parametros)
+        else:
+            cur.execute(f"""
+                SELECT d.id, COUNT(pd.pessoa_id)
+                FROM disciplina d
+                LEFT JOIN pessoa_disciplina pd ON pd.disciplina_id = d.id
+                {filtro}
+                GROUP BY d.id;
+            """, parametros)
+        return {row[0]: row[1] for row in cur.fetchall()}
+    
+    def estatisticasCargaHoraria(self):
+        """
+        Uma linha por disciplina (ordem de nome), calculada em uma única consulta:
+        disciplinaId, nome, cargaHoraria, matriculados e horasTotais (carga horária x matriculados)
+        Com contadores ativos lê total_matriculados; senão, conta os vínculos com GROUP BY.
+        """
+        cur = self.__db.cursor()
+        if self.__db.contadoresAtivos:
+            cur.execute("""
+                SELECT d.id, d.nome, d.carga_horaria, d.total_matriculados AS matriculados,
+                       COALESCE(d.carga_horaria, 0) * d.total_matriculados AS horas_totais
+                FROM disciplina d
+                ORDER BY d.nome;
+            """)
+        else:
+            cur.execute("""
+                SELECT d.id, d.nome, d.carga_horaria, COUNT(pd.pessoa_id) AS matriculados,
+                       COALESCE(d.carga_horaria, 0) * COUNT(pd.pessoa_id) AS horas_totais
+                FROM disciplina d
+                LEFT JOIN pessoa_disciplina pd ON pd.disciplina_id = d.id
+                GROUP BY d.id
+                ORDER BY d.nome;
+            """)
+        
+        return [{
+            'disciplinaId': row['id'],
+            'nome': row['nome'],
+            'cargaHoraria': row['carga_horaria'],
+            'matriculados': row['matriculados'],
+            'horasTotais': row['horas_totais'],
+        } for row in cur.fetchall()]
+    
     def buscarPessoasPorDisciplina(self, disciplinaId: int):
         """Retorna todas as pessoas vinculadas a uma disciplina"""
         cur = self.__db.cursor()
-        cur.execute("""
-            SELECT p.*
-            FROM pessoa p
+        cur.execute(PessoaDAO.SELECT_COM_CATEGORIA + """
             INNER JOIN pessoa_disciplina pd ON p.id = pd.pessoa_id
             WHERE pd.disciplina_id = ?
             ORDER BY p.nome;
         """, (disciplinaId,))
         
-        rows = cur.fetchall()
         pessoaDao = PessoaDAO(self.__db)
-        
-        resultado = []
-        for row in rows:
-            resultado.append(pessoaDao.criarDeRow(row))
-        return resultado
+        return pessoaDao.criarListaDeRows(cur.fetchall())
     
     def buscarDisciplinasPorPessoa(self, pessoaId: int):
         """Retorna todas as disciplinas vinculadas a uma pessoa"""
         cur = self.__db.cursor()
-        cur.execute("""
-            SELECT d.*
+        cur.execute(f"""
+            SELECT {self.COLUNAS}
             FROM disciplina d
             INNER JOIN pessoa_disciplina pd ON d.id = pd.disciplina_id
             WHERE pd.pessoa_id = ?
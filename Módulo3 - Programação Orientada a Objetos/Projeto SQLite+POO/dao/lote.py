@@ -0,0 +1,64 @@
+"""
+Funções auxiliares para as operações em lote dos DAOs (salvarEmLote)
+"""
+
+def dividirEmLotes(itens, tamanhoLote: int):
+    """Percorre qualquer iterável devolvendo listas de até tamanhoLote itens"""
+    if tamanhoLote < 1:
+        raise ValueError("tamanhoLote deve ser maior que zero")
+
+    lote = []
+    for item in itens:
+        lote.append(item)
+        if len(lote) >= tamanhoLote:
+            yield lote
+            lote = []
+
+    if lote:
+        yield lote
+
+
+def executarEmLotes(db, itens, tamanhoLote: int, salvarLote):
+    """
+    Executa salvarLote(cur, lote) para cada lote dentro de uma única transação
+    (ou de um savepoint, se já houver uma transação aberta).
+    salvarLote retorna os objetos que receberam id gerado pelo banco, para que
+    o id seja desfeito caso a transação seja revertida.
+    Retorna o total de itens processados.
+    """
+    total = 0
+    novos = []
+
+    # Uma transação para o lote todo evita um commit (e um fsync) por linha
+    try:
+        with db.transacao():
+            cur = db.cursor()
+            for lote in dividirEmLotes(itens, tamanhoLote):
+                novos.extend(salvarLote(cur, lote))
+                total += len(lote)
+    except Exception:
+        for item in novos:
+            item.id = None
+        raise
+
+    # Dentro de uma transação maior, o lote só é gravado no COMMIT dela
+    desfazerIdsAoReverter(db, novos)
+    return total
+
+
+def desfazerIdsAoReverter(db, objetos):
+    """
+    Objetos que receberam id em um INSERT feito dentro de uma transação: se o
+    bloco transacao() em que o INSERT foi feito, ou um bloco externo a ele, for
+    desfeito, o id volta a None, para que os objetos não pareçam gravados.
+    Em autocommit o INSERT já foi gravado.
+    """
+    if not db.emTransacao or not objetos:
+        return
+
+    def desfazer(confirmada):
+        if not confirmada:
+            for objeto in objetos:
+                objeto.id = None
+
+    db.aposTransacao(desfazer)
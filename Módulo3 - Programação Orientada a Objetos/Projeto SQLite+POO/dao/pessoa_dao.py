@@ -1,12 +1,47 @@
 """
 DAO (Data Access Object) para operações de banco de dados da tabela pessoa
 """
+import sqlite3
+import string
 
 from bd.database import DatabaseConnection
+from dao.busca import montarConsultaFts
 from dao.categoria_dao import CategoriaDAO
+from dao.lote import desfazerIdsAoReverter, dividirEmLotes, executarEmLotes
+from model.categoria import Categoria
 from model.pessoa import Pessoa
+from model.usuario import Usuario
+
+# COLLATE NOCASE só iguala maiúsculas e minúsculas ASCII
+MINUSCULAS_NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
 
 class PessoaDAO:
+    # Colunas lidas pela posição em criarDeRow. Listadas em vez de p.*: uma coluna
+    # nova em pessoa (migração) não desloca as posições nem o categoria_nome
+    COLUNAS = ("p.id, p.nome, p.email, p.altura, p.peso, p.data_nascimento, "
+               "p.ativo, p.telefone, p.categoria_id")
+    
+    # Consulta base das listagens: a categoria vem na mesma linha (JOIN),
+    # evitando uma consulta extra à tabela categoria para cada pessoa
+    SELECT_COM_CATEGORIA = f"""
+        SELECT {COLUNAS}, c.nome AS categoria_nome
+        FROM pessoa p
+        JOIN categoria c ON p.categoria_id = c.id
+    """
+    
+    # Upsert das pessoas sem id pelo email, com o mesmo critério do índice único
+    # idx_pessoa_email_nocase ("A@x.com" e "a@x.com" são o mesmo email)
+    UPSERT_POR_EMAIL = """
+        INSERT INTO pessoa (nome, email, altura, peso, data_nascimento,
+                            ativo, telefone, categoria_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT({alvo}) DO UPDATE SET
+            nome = excluded.nome, email = excluded.email,
+            altura = excluded.altura, peso = excluded.peso,
+            data_nascimento = excluded.data_nascimento, ativo = excluded.ativo,
+            telefone = excluded.telefone, categoria_id = excluded.categoria_id;
+    """
+    
     def __init__(self, db: DatabaseConnection):
         self.__db = db
     
@@ -29,6 +64,7 @@ class PessoaDAO:
                   categoriaId))
 
             pessoa.id = cur.lastrowid
+            desfazerIdsAoReverter(self.__db, [pessoa])
         else:
             # UPDATE
             cur.execute("""
@@ -39,12 +75,85 @@ class PessoaDAO:
             """, (pessoa.nome, pessoa.email, pessoa.altura, pessoa.peso,
                   pessoa.dataNascimento, ativoInt, pessoa.telefone,
                   categoriaId, pessoa.id))
+            self.invalidar(pessoa.id)
         
         return pessoa.id
     
+    def salvarEmLote(self, pessoas, tamanhoLote: int = 500):
+        """
+        Insere/atualiza várias pessoas com executemany em uma única transação.
+        Pessoas sem id fazem upsert pelo email; as com id, pelo id.
+        Os ids gerados são gravados de volta nos objetos. Retorna o total salvo.
+        """
+        return executarEmLotes(self.__db, pessoas, tamanhoLote, self.__salvarLote)
+    
+    def __salvarLote(self, cur, pessoas):
+        novas = [p for p in pessoas if p.id is None]
+        existentes = [p for p in pessoas if p.id is not None]
+        
+        if existentes:
+            cur.executemany("""
+                INSERT INTO pessoa (id, nome, email, altura, peso, data_nascimento,
+                                    ativo, telefone, categoria_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    nome = excluded.nome, email = excluded.email,
+                    altura = excluded.altura, peso = excluded.peso,
+                    data_nascimento = excluded.data_nascimento, ativo = excluded.ativo,
+                    telefone = excluded.telefone, categoria_id = excluded.categoria_id;
+            """, [(p.id,) + self.__parametros(p) for p in existentes])
+            
+            for p in existentes:
+                self.invalidar(p.id)
+        
+        if novas:
+            # Ids AUTOINCREMENT só crescem: os maiores que este são de linhas inseridas agora;
+            # os demais são de pessoas já gravadas que o upsert encontrou pelo email
+            cur.execute("SELECT COALESCE(MAX(id), 0) FROM pessoa;")
+            ultimoId = cur.fetchone()[0]
+            parametros = [self.__parametros(p) for p in novas]
+            try:
+                cur.executemany(self.UPSERT_POR_EMAIL.format(alvo="email COLLATE NOCASE"), parametros)
+            except sqlite3.OperationalError as erro:
+                # Banco antigo com emails repetidos sem diferenciar maiúsculas: o índice
+                # NOCASE não é UNIQUE (migração 3) e só o email exato pode ser o alvo
+                if 'does not match' not in str(erro):
+                    raise
+                cur.executemany(self.UPSERT_POR_EMAIL.format(alvo="email"), parametros)
+            
+            # executemany não informa lastrowid de cada linha: buscar os ids pelo email,
+            # sem diferenciar maiúsculas (o upsert pode ter atualizado "a@x.com" com "A@x.com")
+            emails = [p.email for p in novas]
+            marcadores = ", ".join("?" * len(emails))
+            cur.execute(f"SELECT id, email FROM pessoa WHERE email COLLATE NOCASE IN ({marcadores});", emails)
+            rows = cur.fetchall()
+            idsPorEmail = {row['email']: row['id'] for row in rows}
+            idsSemCaixa = {row['email'].translate(MINUSCULAS_NOCASE): row['id'] for row in rows}
+            
+            for p in novas:
+                p.id = idsPorEmail.get(p.email)
+                if p.id is None:
+                    p.id = idsSemCaixa[p.email.translate(MINUSCULAS_NOCASE)]
+                self.invalidar(p.id)
+            
+            # Só as inseridas perdem o id se a transação for desfeita
+            return [p for p in novas if p.id > ultimoId]
+        
+        return []
+    
+    def __parametros(self, pessoa: Pessoa):
+        ativoInt = 1 if pessoa.ativo else 0
+        return (pessoa.nome, pessoa.email, pessoa.altura, pessoa.peso,
+                pessoa.dataNascimento, ativoInt, pessoa.telefone,
+                pessoa.categoria.id)
+    
     def buscarPorId(self, id: int):
+        pessoa = self.__db.identityMap.obter(Pessoa, id)
+        if pessoa is not None:
+            return pessoa
+        
         cur = self.__db.cursor()
-        cur.execute("SELECT * FROM pessoa WHERE id = ?;", (id,))
+        cur.execute(self.SELECT_COM_CATEGORIA + " WHERE p.id = ?;", (id,))
         row = cur.fetchone()
         
         if row:
@@ -52,67 +161,218 @@ class PessoaDAO:
         return None
     
     def buscarPorNome(self, nome: str):
+        """
+        Com FTS5 ativo (DatabaseConnection(fts=True)): busca por prefixo de palavra,
+        das mais relevantes para as menos. Sem FTS5: LIKE '%nome%'.
+        """
+        consulta = montarConsultaFts(nome, 'nome') if self.__db.ftsAtivo else None
         cur = self.__db.cursor()
-        cur.execute("SELECT * FROM pessoa WHERE nome LIKE ?;", (f'%{nome}%',))
-        rows = cur.fetchall()
         
-        resultado = []
-        for row in rows:
-            resultado.append(self.criarDeRow(row))
-        return resultado
+        if consulta is not None:
+            cur.execute(self.SELECT_COM_CATEGORIA + """
+                JOIN pessoa_fts ON pessoa_fts.rowid = p.id
+                WHERE pessoa_fts MATCH ?
+                ORDER BY pessoa_fts.rank;
+            """, (consulta,))
+        else:
+            cur.execute(self.SELECT_COM_CATEGORIA + " WHERE p.nome LIKE ?;", (f'%{nome}%',))
+        return self.criarListaDeRows(cur.fetchall())
     
-    def listarTodas(self, comCategoria: bool = False):
+    def existeEmail(self, email: str, ignorarId: int | None = None):
+        """
+        Retorna o id da pessoa que já usa o email (sem diferenciar maiúsculas/minúsculas)
+        ou None. ignorarId exclui a própria pessoa (ao atualizar).
+        Consulta o índice pessoa(email COLLATE NOCASE), sem carregar a tabela.
+        """
+        cur = self.__db.cursor()
+        cur.execute("""
+            SELECT id FROM pessoa
+            WHERE email = ? COLLATE NOCASE AND id IS NOT ?
+            LIMIT 1;
+        """, (email, ignorarId))
+        row = cur.fetchone()
+        return row['id'] if row else None
+    
+    def idsExistentes(self, ids, tamanhoLote: int = 500):
+        """
+        Quais dos ids existem em pessoa, com um SELECT ... IN por lote
+        (o SQLite limita a quantidade de parâmetros por comando)
+        """
+        encontrados = set()
+        cur = self.__db.cursor()
+        for lote in dividirEmLotes(ids, tamanhoLote):
+            cur.execute(f"SELECT id FROM pessoa WHERE id IN ({', '.join('?' * len(lote))});", lote)
+            encontrados.update(row[0] for row in cur.fetchall())
+        return encontrados
+    
+    def buscarPorEmails(self, emails, tamanhoLote: int = 500):
+        """
+        Pessoas com os emails informados (sem diferenciar maiúsculas/minúsculas), com um
+        SELECT ... IN por lote que usa o índice pessoa(email COLLATE NOCASE).
+        Retorna {email.translate(MINUSCULAS_NOCASE): pessoa}: só as letras ASCII viram
+        minúsculas, como no NOCASE ("É" e "é" continuam emails diferentes).
+        """
+        pessoas = self.__buscarPorValores("p.email COLLATE NOCASE", emails, tamanhoLote)
+        return {pessoa.email.translate(MINUSCULAS_NOCASE): pessoa for pessoa in pessoas}
+    
+    def buscarPorIds(self, ids, tamanhoLote: int = 500):
+        """Pessoas com os ids informados, com um SELECT ... IN por lote. Retorna {id: pessoa}."""
+        return {pessoa.id: pessoa for pessoa in self.__buscarPorValores("p.id", ids, tamanhoLote)}
+    
+    def __buscarPorValores(self, coluna: str, valores, tamanhoLote: int):
+        categorias = {}
+        cur = self.__db.cursor()
+        for lote in dividirEmLotes(valores, tamanhoLote):
+            cur.execute(self.SELECT_COM_CATEGORIA + f" WHERE {coluna} IN ({', '.join('?' * len(lote))});", lote)
+            for row in cur.fetchall():
+                yield self.criarDeRow(row, categorias)
+    
+    def buscarTexto(self, termo: str, limite: int = 50):
+        """Busca no nome e no email; com FTS5, ordenada por relevância (nome pesa mais)"""
+        consulta = montarConsultaFts(termo) if self.__db.ftsAtivo else None
         cur = self.__db.cursor()
         
-        if comCategoria:
-            cur.execute("""
-                SELECT p.*, c.nome as categoria_nome
-                FROM pessoa p
-                JOIN categoria c ON p.categoria_id = c.id
-                ORDER BY p.nome;
-            """)
+        if consulta is not None:
+            cur.execute(self.SELECT_COM_CATEGORIA + """
+                JOIN pessoa_fts ON pessoa_fts.rowid = p.id
+                WHERE pessoa_fts MATCH ?
+                ORDER BY bm25(pessoa_fts, 10.0, 1.0) LIMIT ?;
+            """, (consulta, limite))
         else:
-            cur.execute("SELECT * FROM pessoa ORDER BY nome;")
+            cur.execute(self.SELECT_COM_CATEGORIA + """
+                WHERE p.nome LIKE ? OR p.email LIKE ?
+                ORDER BY p.nome LIMIT ?;
+            """, (f'%{termo}%', f'%{termo}%', limite))
+        return self.criarListaDeRows(cur.fetchall())
+    
+    def listarTodas(self, comCategoria: bool = False):
+        # comCategoria é mantido por compatibilidade: a listagem sempre
+        # traz a categoria pelo JOIN
+        cur = self.__db.cursor()
+        cur.execute(self.SELECT_COM_CATEGORIA + " ORDER BY p.nome;")
+        return self.criarListaDeRows(cur.fetchall())
+    
+    def iterarTodas(self, tamanhoLote: int = 500):
+        """
+        Gerador com todas as pessoas em ordem de nome, lendo tamanhoLote linhas
+        por vez (fetchmany) em vez de montar a lista inteira na memória.
+        Com PoolConexoes o resultado é lido por inteiro antes do primeiro lote
+        (ver CursorPool): só a montagem dos objetos é incremental.
+        """
+        return self.__iterar(self.SELECT_COM_CATEGORIA + " ORDER BY p.nome, p.id;", tamanhoLote)
+    
+    def iterarSemUsuario(self, tamanhoLote: int = 500):
+        """Como iterarTodas, só com as pessoas que ainda não têm usuário (uma consulta, anti-join)"""
+        return self.__iterar(self.SELECT_COM_CATEGORIA + """
+            LEFT JOIN usuario u ON u.id = p.id
+            WHERE u.id IS NULL
+            ORDER BY p.nome, p.id;
+        """, tamanhoLote)
+    
+    def __iterar(self, sql: str, tamanhoLote: int):
+        cur = self.__db.cursor()
+        cur.execute(sql)
         
-        rows = cur.fetchall()
-        resultado = []
-        for row in rows:
-            resultado.append(self.criarDeRow(row))
-        return resultado
+        categorias = {}
+        while True:
+            rows = cur.fetchmany(tamanhoLote)
+            if not rows:
+                break
+            for row in rows:
+                yield self.criarDeRow(row, categorias)
+    
+    def listarPagina(self, aposNome: str | None = None, aposId: int | None = None, limite: int = 50):
+        """
+        Paginação por chave (keyset): retorna até `limite` pessoas em ordem de
+        (nome, id) posteriores à última pessoa da página anterior.
+        Para a próxima página, passe o nome e o id da última pessoa retornada.
+        """
+        return self.__listarPagina("", [], aposNome, aposId, limite)
+    
+    def listarPaginaSemUsuario(self, aposNome: str | None = None, aposId: int | None = None, limite: int = 50):
+        """Como listarPagina, só com as pessoas que ainda não têm usuário (anti-join)"""
+        return self.__listarPagina("LEFT JOIN usuario u ON u.id = p.id", ["u.id IS NULL"],
+                                   aposNome, aposId, limite)
+    
+    def __listarPagina(self, juncao: str, condicoes: list, aposNome, aposId, limite: int):
+        parametros = []
+        if aposNome is not None:
+            # Usa o índice de pessoa(nome) em vez de percorrer as páginas anteriores (OFFSET)
+            condicoes = condicoes + ["(p.nome, p.id) > (?, ?)"]
+            parametros += [aposNome, aposId if aposId is not None else 0]
+        filtro = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        
+        cur = self.__db.cursor()
+        cur.execute(self.SELECT_COM_CATEGORIA + f" {juncao} {filtro} ORDER BY p.nome, p.id LIMIT ?;",
+                    parametros + [limite])
+        return self.criarListaDeRows(cur.fetchall())
+    
+    def contar(self):
+        cur = self.__db.cursor()
+        cur.execute("SELECT COUNT(*) FROM pessoa;")
+        return cur.fetchone()[0]
     
     def buscarPorCategoria(self, categoriaId: int):
         cur = self.__db.cursor()
-        cur.execute("SELECT * FROM pessoa WHERE categoria_id = ? ORDER BY nome;", (categoriaId,))
-        rows = cur.fetchall()
+        cur.execute(self.SELECT_COM_CATEGORIA + " WHERE p.categoria_id = ? ORDER BY p.nome;",
+                    (categoriaId,))
+        return self.criarListaDeRows(cur.fetchall())
+    
+    def criarListaDeRows(self, rows):
+        """Monta as pessoas de um resultado, compartilhando uma única instância de cada Categoria"""
+        categorias = {}
         
         resultado = []
         for row in rows:
-            resultado.append(self.criarDeRow(row))
+            resultado.append(self.criarDeRow(row, categorias))
         return resultado
     
-    def criarDeRow(self, row):
-        # Buscar a categoria usando o CategoriaDAO
-        categoriaDao = CategoriaDAO(self.__db)
-        categoria = categoriaDao.buscarPorId(row['categoria_id'])
-        
-        return Pessoa(
-            id=row['id'],
-            nome=row['nome'],
-            email=row['email'],
-            altura=row['altura'],
-            peso=row['peso'],
-            dataNascimento=row['data_nascimento'],
-            ativo=bool(row['ativo']),
-            telefone=row['telefone'],
-            categoria=categoria
-        )
+    def criarDeRow(self, row, categorias: dict | None = None):
+        """
+        Monta a pessoa a partir de uma linha com as colunas de COLUNAS (opcionalmente
+        seguidas de categoria_nome, como em SELECT_COM_CATEGORIA). As colunas são lidas
+        pela posição, o que é mais rápido que row['coluna'].
+        """
+        identityMap = self.__db.identityMap
+        
+        # Reaproveitar a instância já carregada, se houver
+        pessoa = identityMap.obter(Pessoa, row[0])
+        if pessoa is not None:
+            return pessoa
+        
+        (id, nome, email, altura, peso, dataNascimento,
+         ativo, telefone, categoriaId) = row[:9]
+        
+        categoria = categorias.get(categoriaId) if categorias is not None else None
+        if categoria is None:
+            categoria = identityMap.obter(Categoria, categoriaId)
+        
+        if categoria is None:
+            if len(row) > 9:
+                # A categoria já veio no JOIN (categoria_nome): não é preciso consultar o banco
+                categoria = identityMap.registrar(Categoria(categoriaId, row[9]))
+            else:
+                # Row sem JOIN (só COLUNAS): buscar pelo CategoriaDAO
+                categoria = CategoriaDAO(self.__db).buscarPorId(categoriaId)
+            
+            if categorias is not None:
+                categorias[categoriaId] = categoria
+        
+        return identityMap.registrar(Pessoa(id, nome, categoria, email, altura, peso,
+                                            dataNascimento, bool(ativo), telefone))
     
     def deletar(self, pessoa: Pessoa):        
         cur = self.__db.cursor()
         cur.execute("DELETE FROM pessoa WHERE id = ?;", (pessoa.id,))
+        self.invalidar(pessoa.id)
 
         return cur.rowcount > 0
     
+    def invalidar(self, pessoaId: int):
+        """Remove a pessoa do identity map (e o usuário 1:1, que guarda referência a ela)"""
+        self.__db.identityMap.remover(Pessoa, pessoaId)
+        self.__db.identityMap.remover(Usuario, pessoaId)
+    
     def obterCategoria(self, pessoa: Pessoa):
         return pessoa.categoria
 
@@ -3,12 +3,23 @@ DAO (Data Access Object) para operações de banco de dados da tabela usuario
 """
 
 from bd.database import DatabaseConnection
+from dao.lote import desfazerIdsAoReverter, executarEmLotes
 from dao.pessoa_dao import PessoaDAO
 from model.usuario import Usuario
 
 class UsuarioDAO:
+    # A pessoa (e a categoria dela) vem na mesma linha: colunas do usuário seguidas
+    # das de PessoaDAO.SELECT_COM_CATEGORIA, lidas pela posição em criarDeRow
+    SELECT_COM_PESSOA = f"""
+        SELECT u.id, u.login, u.senha, u.tipo, {PessoaDAO.COLUNAS}, c.nome AS categoria_nome
+        FROM usuario u
+        JOIN pessoa p ON p.id = u.id
+        JOIN categoria c ON p.categoria_id = c.id
+    """
+    
     def __init__(self, db: DatabaseConnection):
         self.__db = db
+        self.__pessoaDao = PessoaDAO(db)
     
     def salvar(self, usuario: Usuario):
         cur = self.__db.cursor()
@@ -23,18 +34,48 @@ class UsuarioDAO:
             """, (pessoaId, usuario.login, usuario.senha, usuario.tipo))
             
             usuario.id = pessoaId
+            desfazerIdsAoReverter(self.__db, [usuario])
         else:
             # UPDATE
             cur.execute("""
                 UPDATE usuario SET login = ?, senha = ?, tipo = ?
                 WHERE id = ?;
             """, (usuario.login, usuario.senha, usuario.tipo, usuario.id))
+            self.__db.identityMap.remover(Usuario, usuario.id)
         
         return usuario.id
     
+    def salvarEmLote(self, usuarios, tamanhoLote: int = 500):
+        """
+        Insere/atualiza vários usuários com executemany em uma única transação.
+        O upsert é pelo id, que é o mesmo da pessoa (relacionamento 1:1).
+        Retorna o total salvo.
+        """
+        return executarEmLotes(self.__db, usuarios, tamanhoLote, self.__salvarLote)
+    
+    def __salvarLote(self, cur, usuarios):
+        cur.executemany("""
+            INSERT INTO usuario (id, login, senha, tipo)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                login = excluded.login, senha = excluded.senha, tipo = excluded.tipo;
+        """, [(u.pessoa.id, u.login, u.senha, u.tipo) for u in usuarios])
+        
+        novos = []
+        for u in usuarios:
+            if u.id is None:
+                novos.append(u)
+            u.id = u.pessoa.id
+            self.invalidar(u.id)
+        return novos
+    
     def buscarPorId(self, id: int):
+        usuario = self.__db.identityMap.obter(Usuario, id)
+        if usuario is not None:
+            return usuario
+        
         cur = self.__db.cursor()
-        cur.execute("SELECT * FROM usuario WHERE id = ?;", (id,))
+        cur.execute(self.SELECT_COM_PESSOA + " WHERE u.id = ?;", (id,))
         row = cur.fetchone()
         
         if row:
@@ -43,7 +84,7 @@ class UsuarioDAO:
     
     def buscarPorLogin(self, login: str):
         cur = self.__db.cursor()
-        cur.execute("SELECT * FROM usuario WHERE login = ?;", (login,))
+        cur.execute(self.SELECT_COM_PESSOA + " WHERE u.login = ?;", (login,))
         row = cur.fetchone()
         
         if row:
@@ -51,42 +92,79 @@ class UsuarioDAO:
         return None
     
     def buscarPorPessoaId(self, pessoaId: int):
-        cur = self.__db.cursor()
         # O id do usuário é o mesmo id da pessoa (relacionamento 1:1)
-        cur.execute("SELECT * FROM usuario WHERE id = ?;", (pessoaId,))
-        row = cur.fetchone()
-        
-        if row:
-            return self.criarDeRow(row)
-        return None
+        return self.buscarPorId(pessoaId)
     
     def listarTodos(self):
         cur = self.__db.cursor()
-        cur.execute("SELECT * FROM usuario ORDER BY login;")
-        rows = cur.fetchall()
+        cur.execute(self.SELECT_COM_PESSOA + " ORDER BY u.login;")
+        return self.criarListaDeRows(cur.fetchall())
+    
+    def iterarTodos(self, tamanhoLote: int = 500):
+        """Gerador com todos os usuários em ordem de login, lendo tamanhoLote linhas por vez"""
+        cur = self.__db.cursor()
+        cur.execute(self.SELECT_COM_PESSOA + " ORDER BY u.login;")
+        
+        categorias = {}
+        while True:
+            rows = cur.fetchmany(tamanhoLote)
+            if not rows:
+                break
+            for row in rows:
+                yield self.criarDeRow(row, categorias)
+    
+    def listarPagina(self, aposLogin: str | None = None, limite: int = 50):
+        """
+        Paginação por chave (keyset): até `limite` usuários em ordem de login
+        posteriores ao último login da página anterior (login é UNIQUE)
+        """
+        cur = self.__db.cursor()
+        if aposLogin is None:
+            cur.execute(self.SELECT_COM_PESSOA + " ORDER BY u.login LIMIT ?;", (limite,))
+        else:
+            cur.execute(self.SELECT_COM_PESSOA + " WHERE u.login > ? ORDER BY u.login LIMIT ?;",
+                        (aposLogin, limite))
+        return self.criarListaDeRows(cur.fetchall())
+    
+    def contar(self):
+        cur = self.__db.cursor()
+        cur.execute("SELECT COUNT(*) FROM usuario;")
+        return cur.fetchone()[0]
+    
+    def criarListaDeRows(self, rows):
+        """Monta os usuários de um resultado, compartilhando uma única instância de cada Categoria"""
+        categorias = {}
         
         resultado = []
         for row in rows:
-            resultado.append(self.criarDeRow(row))
+            resultado.append(self.criarDeRow(row, categorias))
         return resultado
     
-    def criarDeRow(self, row):
-        # Buscar a pessoa usando o PessoaDAO
-        # O id do usuário é o mesmo id da pessoa (relacionamento 1:1)
-        pessoaDao = PessoaDAO(self.__db)
-        pessoa = pessoaDao.buscarPorId(row['id'])
+    def criarDeRow(self, row, categorias: dict | None = None):
+        """
+        Monta o usuário a partir de uma linha de SELECT_COM_PESSOA, pela posição:
+        (id, login, senha, tipo) e, a partir da 5ª coluna, a pessoa com a categoria
+        """
+        # Reaproveitar a instância já carregada, se houver
+        usuario = self.__db.identityMap.obter(Usuario, row[0])
+        if usuario is not None:
+            return usuario
         
-        return Usuario(
-            id=row['id'],
-            login=row['login'],
-            senha=row['senha'],
-            tipo=row['tipo'],
-            pessoa=pessoa
-        )
+        id, login, senha, tipo = row[:4]
+        # A pessoa vem no JOIN (o id do usuário é o mesmo da pessoa, relacionamento 1:1);
+        # criarDeRow reaproveita a instância do identity map, se houver
+        pessoa = self.__pessoaDao.criarDeRow(row[4:], categorias)
+        
+        return self.__db.identityMap.registrar(Usuario(id, login, senha, tipo, pessoa))
     
     def deletar(self, usuario: Usuario):
         cur = self.__db.cursor()
         cur.execute("DELETE FROM usuario WHERE id = ?;", (usuario.id,))
+        self.__db.identityMap.remover(Usuario, usuario.id)
         
         return cur.rowcount > 0
+    
+    def invalidar(self, usuarioId: int):
+        """Remove o usuário do identity map (ex.: alteração descartada sem salvar)"""
+        self.__db.identityMap.remover(Usuario, usuarioId)
 
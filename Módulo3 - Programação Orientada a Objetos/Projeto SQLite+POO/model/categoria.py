@@ -3,6 +3,8 @@ Classe modelo para a tabela categoria
 """
 
 class Categoria: 
+    __slots__ = ('__id', '__nome')
+    
     def __init__(self, id: int, nome: str):
         self.__id = id
         self.__nome = nome
@@ -3,6 +3,8 @@ Classe modelo para a tabela disciplina
 """
 
 class Disciplina:
+    __slots__ = ('__id', '__nome', '__cargaHoraria', '__descricao')
+    
     def __init__(self, id: int, nome: str, cargaHoraria: int | None = None,
                  descricao: str | None = None):
         self.__id = id
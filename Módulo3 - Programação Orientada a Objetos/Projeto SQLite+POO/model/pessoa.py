@@ -4,6 +4,10 @@ Classe modelo para a tabela pessoa
 from model.categoria import Categoria
 
 class Pessoa:
+    # __slots__: sem um __dict__ por objeto (importante ao carregar muitas pessoas)
+    __slots__ = ('__id', '__nome', '__email', '__altura', '__peso',
+                 '__dataNascimento', '__ativo', '__telefone', '__categoria')
+    
     def __init__(self, id: int, nome: str, categoria: Categoria, email: str,
                  altura: float | None = None,
                  peso: float | None = None, dataNascimento: str | None = None,
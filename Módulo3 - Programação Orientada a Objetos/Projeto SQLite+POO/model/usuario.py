@@ -4,6 +4,8 @@ Classe modelo para a tabela usuario (relacionamento 1:1 com Pessoa)
 from model.pessoa import Pessoa
 
 class Usuario:
+    __slots__ = ('__id', '__login', '__senha', '__tipo', '__pessoa')
+    
     def __init__(self, id: int, login: str, senha: str, tipo: str, pessoa: Pessoa):
         self.__id = id
         self.__login = login
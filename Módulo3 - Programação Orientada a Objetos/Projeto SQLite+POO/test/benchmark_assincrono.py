@@ -0,0 +1,121 @@
+"""
+Benchmark: pedidos por segundo com os DAOs síncronos (um pedido por vez) x
+DAOs async com várias corrotinas simultâneas (escritas agrupadas pelo ExecutorBanco)
+Uso: python3 test/benchmark_assincrono.py [pedidos] [corrotinas] [percentualEscrita]
+"""
+import sys
+import os
+import asyncio
+import random
+import time
+import tempfile
+
+# Adicionar o diretório pai ao path para permitir imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.database import DatabaseConnection
+from bd.executor import ExecutorBanco
+from model.categoria import Categoria
+from model.pessoa import Pessoa
+from dao.assincrono import PessoaDAOAssincrono
+from dao.categoria_dao import CategoriaDAO
+from dao.pessoa_dao import PessoaDAO
+
+QUANTIDADE_INICIAL = 10000
+
+
+def popular(db):
+    categoria = Categoria(id=None, nome="Benchmark")
+    CategoriaDAO(db).salvar(categoria)
+    PessoaDAO(db).salvarEmLote(
+        Pessoa(id=None, nome=f"Pessoa {i:07d}", email=f"inicial{i}@example.com", categoria=categoria)
+        for i in range(QUANTIDADE_INICIAL)
+    )
+    return categoria
+
+
+def gerarPedidos(quantidade, percentualEscrita, semente=42):
+    """Lista de ('ler', id) / ('escrever', n) com a mesma sequência nos dois modos"""
+    aleatorio = random.Random(semente)
+    return [('escrever', i) if aleatorio.random() * 100 < percentualEscrita
+            else ('ler', aleatorio.randint(1, QUANTIDADE_INICIAL))
+            for i in range(quantidade)]
+
+
+def executarSincrono(dbPath, pedidos):
+    db = DatabaseConnection(dbPath)
+    try:
+        pessoaDao = PessoaDAO(db)
+        categoria = CategoriaDAO(db).buscarPorNome("Benchmark")
+        inicio = time.perf_counter()
+        for tipo, valor in pedidos:
+            if tipo == 'ler':
+                pessoaDao.buscarPorId(valor)
+            else:
+                pessoaDao.salvar(Pessoa(id=None, nome=f"Sync {valor}", email=f"sync{valor}@example.com",
+                                        categoria=categoria))
+        return time.perf_counter() - inicio, None
+    finally:
+        db.fechar()
+
+
+async def executarAssincrono(dbPath, pedidos, corrotinas):
+    executor = ExecutorBanco(DatabaseConnection(dbPath))
+    try:
+        pessoaDao = PessoaDAOAssincrono(executor)
+        categoria = Categoria(id=1, nome="Benchmark")
+        fila = iter(pedidos)
+
+        async def trabalhador():
+            # Cada corrotina simula um cliente: um pedido por vez, aguardando a resposta
+            for tipo, valor in fila:
+                if tipo == 'ler':
+                    await pessoaDao.buscarPorId(valor)
+                else:
+                    await pessoaDao.salvar(Pessoa(id=None, nome=f"Async {valor}", email=f"async{valor}@example.com",
+                                                  categoria=categoria))
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(trabalhador() for _ in range(corrotinas)))
+        return time.perf_counter() - inicio, executor.metricas
+    finally:
+        executor.fechar()
+
+
+def executarBenchmark(quantidade=5000, corrotinas=50, percentualEscrita=20):
+    pedidos = gerarPedidos(quantidade, percentualEscrita)
+    escritas = sum(1 for tipo, _ in pedidos if tipo == 'escrever')
+    print(f"\n{quantidade} pedidos ({escritas} escritas, {quantidade - escritas} leituras)\n")
+    print(f"{'Modo':<28} {'Tempo (s)':>10} {'Pedidos/s':>12}")
+    print("-" * 52)
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        for modo in ('sincrono', 'assincrono'):
+            dbPath = os.path.join(diretorio, f'{modo}.db')
+            db = DatabaseConnection(dbPath)
+            db.criarTabelas()
+            popular(db)
+            db.fechar()
+
+            if modo == 'sincrono':
+                segundos, metricas = executarSincrono(dbPath, pedidos)
+                rotulo = "Síncrono (1 por vez)"
+            else:
+                segundos, metricas = asyncio.run(executarAssincrono(dbPath, pedidos, corrotinas))
+                rotulo = f"Async ({corrotinas} corrotinas)"
+            resultados[modo] = segundos
+            print(f"{rotulo:<28} {segundos:>10.3f} {quantidade / segundos:>12.0f}")
+
+    print("-" * 52)
+    print(f"Async: {metricas['escritas']} escritas em {metricas['transacoes']} transações "
+          f"(maior lote: {metricas['maiorLote']})")
+    print(f"Ganho: {resultados['sincrono'] / resultados['assincrono']:.1f}x")
+    return resultados
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    corrotinas = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    percentualEscrita = float(sys.argv[3]) if len(sys.argv) > 3 else 20
+    executarBenchmark(quantidade, corrotinas, percentualEscrita)
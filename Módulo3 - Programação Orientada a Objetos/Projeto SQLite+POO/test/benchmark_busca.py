@@ -0,0 +1,79 @@
+"""
+Benchmark: busca por nome com LIKE '%termo%' x índice FTS5
+Uso: python3 test/benchmark_busca.py [quantidade ...]   (padrão: 10000 100000; ex.: 10000 100000 1000000)
+"""
+import sys
+import os
+import random
+import time
+import tempfile
+
+# Adicionar o diretório pai ao path para permitir imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.database import DatabaseConnection
+from model.categoria import Categoria
+from model.pessoa import Pessoa
+from dao.categoria_dao import CategoriaDAO
+from dao.pessoa_dao import PessoaDAO
+
+NOMES = ["Ana", "Bruno", "Carla", "Diego", "Eduarda", "Fábio", "Gabriela", "Heitor",
+         "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael"]
+SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves",
+              "Pereira", "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho"]
+
+
+def gerarPessoas(quantidade, categoria, semente=42):
+    aleatorio = random.Random(semente)
+    for i in range(quantidade):
+        nome = f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {aleatorio.choice(SOBRENOMES)}{i}"
+        yield Pessoa(id=None, nome=nome, email=f"pessoa{i}@example.com", categoria=categoria)
+
+
+def medirBuscas(db, termos):
+    """Retorna a latência média (ms) de buscarPorNome"""
+    pessoaDao = PessoaDAO(db)
+    encontradas = 0
+    inicio = time.perf_counter()
+    for termo in termos:
+        encontradas += len(pessoaDao.buscarPorNome(termo))
+        db.identityMap.limpar()
+    return (time.perf_counter() - inicio) * 1000 / len(termos), encontradas / len(termos)
+
+
+def executarBenchmark(quantidades=(10000, 100000), buscas=20):
+    aleatorio = random.Random(7)
+    # Termos seletivos: sobrenome + número (como quem digita para achar uma pessoa)
+    termos = [f"{aleatorio.choice(SOBRENOMES)}{aleatorio.randint(0, 999)}" for _ in range(buscas)]
+
+    print(f"\nbuscarPorNome: média de {buscas} buscas")
+    print("-" * 80)
+    print(f"{'Linhas':>10}  {'LIKE (ms)':>12}  {'FTS5 (ms)':>12}  {'Ganho':>8}")
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        for quantidade in quantidades:
+            caminho = os.path.join(diretorio, f'busca{quantidade}.db')
+            dbFts = DatabaseConnection(caminho, tamanhoIdentityMap=0, perfil='throughput', fts=True)
+            dbLike = DatabaseConnection(caminho, tamanhoIdentityMap=0, perfil='throughput')
+            try:
+                dbFts.criarTabelas()
+                if not dbFts.ftsAtivo:
+                    print("⚠️  SQLite sem FTS5: nada a comparar")
+                    return
+                categoria = Categoria(id=None, nome="Benchmark")
+                CategoriaDAO(dbFts).salvar(categoria)
+                PessoaDAO(dbFts).salvarEmLote(gerarPessoas(quantidade, categoria), 5000)
+
+                tempoLike, _ = medirBuscas(dbLike, termos)
+                tempoFts, _ = medirBuscas(dbFts, termos)
+                print(f"{quantidade:>10}  {tempoLike:>12.2f}  {tempoFts:>12.2f}  {tempoLike / tempoFts:>7.1f}x")
+            finally:
+                dbFts.fechar()
+                dbLike.fechar()
+
+    print("-" * 80)
+
+
+if __name__ == "__main__":
+    quantidades = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+    executarBenchmark(quantidades)
@@ -0,0 +1,450 @@
+"""
+Benchmark dos DAOs: gera dados sintéticos (semente fixa), mede cada método e
+conta os comandos SQL por chamada. O resultado em JSON pode ser comparado entre
+commits para encontrar regressões.
+
+Uso:
+    python3 test/benchmark_dao.py --escala 1k --saida antes.json
+    python3 test/benchmark_dao.py --escala 100k --saida depois.json
+    python3 test/benchmark_dao.py --comparar antes.json depois.json [--tolerancia 0.25] [--minimo-ms 0.2]
+Escalas: 1k, 100k, 1m (quantidade de pessoas)
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Adicionar o diretório pai ao path para permitir imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.database import DatabaseConnection
+from model.categoria import Categoria
+from model.disciplina import Disciplina
+from model.pessoa import Pessoa
+from model.usuario import Usuario
+from dao.categoria_dao import CategoriaDAO
+from dao.disciplina_dao import DisciplinaDAO
+from dao.pessoa_dao import PessoaDAO
+from dao.usuario_dao import UsuarioDAO
+
+# Quantidades por escala
+ESCALAS = {
+    '1k': {'pessoas': 1000, 'categorias': 10, 'disciplinas': 20, 'matriculasPorPessoa': 3},
+    '100k': {'pessoas': 100000, 'categorias': 50, 'disciplinas': 200, 'matriculasPorPessoa': 3},
+    '1m': {'pessoas': 1000000, 'categorias': 100, 'disciplinas': 1000, 'matriculasPorPessoa': 3},
+}
+
+# Escritas em lote: chamadas medidas e objetos por chamada
+REPETICOES_LOTE = 20
+TAMANHO_LOTE = 100
+
+NOMES = ["Ana", "Bruno", "Carla", "Diego", "Eduarda", "Fábio", "Gabriela", "Heitor",
+         "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael"]
+SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves",
+              "Pereira", "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho"]
+
+
+# Geradores de dados sintéticos
+
+def gerarCategorias(quantidade):
+    return [Categoria(id=None, nome=f"Categoria {i:04d}") for i in range(quantidade)]
+
+
+def gerarPessoas(quantidade, categorias, aleatorio):
+    for i in range(quantidade):
+        yield Pessoa(
+            id=None,
+            nome=f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {i}",
+            email=f"pessoa{i}@example.com",
+            categoria=aleatorio.choice(categorias),
+            altura=round(aleatorio.uniform(1.50, 2.00), 2),
+            peso=round(aleatorio.uniform(50, 110), 1),
+            dataNascimento=f"{aleatorio.randint(1960, 2005)}-{aleatorio.randint(1, 12):02d}-{aleatorio.randint(1, 28):02d}",
+            ativo=aleatorio.random() < 0.9,
+            telefone=f"119{aleatorio.randint(10000000, 99999999)}"
+        )
+
+
+def gerarDisciplinas(quantidade, aleatorio):
+    return [Disciplina(id=None, nome=f"Disciplina {i:04d}", cargaHoraria=aleatorio.choice((30, 40, 60, 80)),
+                       descricao=f"Conteúdo da disciplina {i}") for i in range(quantidade)]
+
+
+def gerarUsuarios(db, aleatorio, percentual=0.5):
+    """Um usuário para cada pessoa sorteada (relacionamento 1:1)"""
+    pessoaDao = PessoaDAO(db)
+    for pessoa in pessoaDao.iterarTodas(5000):
+        if aleatorio.random() < percentual:
+            yield Usuario(id=None, login=f"usuario{pessoa.id}", senha="senha",
+                          tipo=aleatorio.choice(("aluno", "professor", "admin")), pessoa=pessoa)
+
+
+def popular(db, escala, semente):
+    """Cria o banco da escala com dados reproduzíveis; retorna os totais gerados"""
+    quantidades = ESCALAS[escala]
+    aleatorio = random.Random(semente)
+
+    categorias = gerarCategorias(quantidades['categorias'])
+    CategoriaDAO(db).salvarEmLote(categorias)
+    PessoaDAO(db).salvarEmLote(gerarPessoas(quantidades['pessoas'], categorias, aleatorio), 5000)
+    UsuarioDAO(db).salvarEmLote(gerarUsuarios(db, aleatorio), 5000)
+
+    disciplinas = gerarDisciplinas(quantidades['disciplinas'], aleatorio)
+    disciplinaDao = DisciplinaDAO(db)
+    disciplinaDao.salvarEmLote(disciplinas)
+
+    # Matrículas: cada pessoa em algumas disciplinas sorteadas
+    cur = db.cursor()
+    cur.execute("SELECT id FROM pessoa;")
+    pessoaIds = [row[0] for row in cur.fetchall()]
+    disciplinaIds = [d.id for d in disciplinas]
+    with db.transacao():
+        cur = db.cursor()
+        for inicio in range(0, len(pessoaIds), 5000):
+            cur.executemany("INSERT OR IGNORE INTO pessoa_disciplina (pessoa_id, disciplina_id) VALUES (?, ?);", [
+                (pessoaId, disciplinaId)
+                for pessoaId in pessoaIds[inicio:inicio + 5000]
+                for disciplinaId in aleatorio.sample(disciplinaIds, quantidades['matriculasPorPessoa'])
+            ])
+    db.identityMap.limpar()
+    return {'pessoaIds': pessoaIds, 'disciplinaIds': disciplinaIds,
+            'categoriaIds': [c.id for c in categorias]}
+
+
+# Medição
+
+class ContadorSql:
+    """
+    Conta os comandos SQL enviados pelos DAOs: cada execute/executemany do cursor conta
+    um, e o set_trace_callback acrescenta os executados fora do cursor (BEGIN/COMMIT de
+    transacao()). Os corpos dos triggers, que o trace também informa, não entram na conta.
+    """
+    def __init__(self, conn):
+        self.total = 0
+        self.noCursor = False
+        conn.set_trace_callback(self.registrar)
+
+    def registrar(self, sql):
+        if not self.noCursor:
+            self.total += 1
+
+
+class CursorContado:
+    def __init__(self, cursor, contador: ContadorSql):
+        self.__cursor = cursor
+        self.__contador = contador
+
+    def execute(self, sql, parametros=()):
+        return self.__executar(self.__cursor.execute, sql, parametros)
+
+    def executemany(self, sql, parametros):
+        return self.__executar(self.__cursor.executemany, sql, parametros)
+
+    def __executar(self, metodo, sql, parametros):
+        self.__contador.total += 1
+        self.__contador.noCursor = True
+        try:
+            metodo(sql, parametros)
+        finally:
+            self.__contador.noCursor = False
+        return self
+
+    def __iter__(self):
+        return iter(self.__cursor)
+
+    def __getattr__(self, nome):
+        # fetchone, fetchall, lastrowid, rowcount...
+        return getattr(self.__cursor, nome)
+
+
+class ConexaoContada(DatabaseConnection):
+    """DatabaseConnection cujos cursores contam os comandos em contador (quando definido)"""
+    contador = None
+
+    def cursor(self):
+        cursor = super().cursor()
+        return CursorContado(cursor, self.contador) if self.contador is not None else cursor
+
+
+def medir(funcao, repeticoes, contador, aleatorio):
+    funcao(aleatorio)  # Aquecimento: cache de comandos e páginas do banco
+    tempos = []
+    comandos = 0
+    for _ in range(repeticoes):
+        antes = contador.total
+        inicio = time.perf_counter()
+        funcao(aleatorio)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        comandos += contador.total - antes
+
+    tempos.sort()
+    return {
+        'chamadas': repeticoes,
+        'mediaMs': round(statistics.fmean(tempos), 4),
+        'p50Ms': round(tempos[len(tempos) // 2], 4),
+        'p95Ms': round(tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))], 4),
+        'sqlPorChamada': round(comandos / repeticoes, 2),
+    }
+
+
+def criarOperacoes(db, dados):
+    """(nome, funcao(aleatorio), repetições) para cada método medido"""
+    categoriaDao = CategoriaDAO(db)
+    pessoaDao = PessoaDAO(db)
+    usuarioDao = UsuarioDAO(db)
+    disciplinaDao = DisciplinaDAO(db)
+    pessoaIds = dados['pessoaIds']
+    disciplinaIds = dados['disciplinaIds']
+    categoriaIds = dados['categoriaIds']
+    primeiraCategoria = categoriaDao.buscarPorId(categoriaIds[0])
+    novas = iter(range(10 ** 9))
+    # Entidades carregadas antes da medição: as escritas medem só a chamada ao DAO,
+    # sem as buscas que preparam os argumentos
+    amostra = random.Random(0)
+    pessoasCarregadas = [pessoaDao.buscarPorId(pessoaId)
+                         for pessoaId in amostra.sample(pessoaIds, min(500, len(pessoaIds)))]
+    disciplinasCarregadas = [disciplinaDao.buscarPorId(disciplinaId) for disciplinaId in disciplinaIds]
+
+    def preparadas(dao, quantidade, criar):
+        """quantidade + 1 (aquecimento) entidades gravadas antes da medição, uma por chamada"""
+        objetos = [criar(next(novas)) for _ in range(quantidade + 1)]
+        dao.salvarEmLote(objetos, 5000)
+        return iter(objetos)
+
+    def novaPessoa(i):
+        return Pessoa(id=None, nome=f"Nova {i}", email=f"nova{i}@example.com", categoria=primeiraCategoria)
+
+    def novoUsuario(pessoa):
+        return Usuario(id=None, login=f"novo{pessoa.id}", senha="senha", tipo="aluno", pessoa=pessoa)
+
+    def lotes(quantidade, criar):
+        """quantidade + 1 lotes de TAMANHO_LOTE objetos ainda não gravados"""
+        return iter([[criar(next(novas)) for _ in range(TAMANHO_LOTE)] for _ in range(quantidade + 1)])
+
+    # Entidades das escritas que precisam de linhas próprias (deletar, usuário 1:1)
+    categoriasApagar = preparadas(categoriaDao, 200, lambda i: Categoria(id=None, nome=f"Apagar {i}"))
+    pessoasApagar = preparadas(pessoaDao, 200, novaPessoa)
+    disciplinasApagar = preparadas(disciplinaDao, 200, lambda i: Disciplina(id=None, nome=f"Apagar {i}"))
+    pessoasSemUsuario = preparadas(pessoaDao, 200 + 201, novaPessoa)
+    usuariosApagar = preparadas(usuarioDao, 200, lambda i: novoUsuario(next(pessoasSemUsuario)))
+    pessoasLoteUsuarios = preparadas(pessoaDao, (REPETICOES_LOTE + 1) * TAMANHO_LOTE, novaPessoa)
+    cur = db.cursor()
+    cur.execute("SELECT pessoa_id, disciplina_id FROM pessoa_disciplina LIMIT 201;")
+    vinculosDesfazer = iter([(pessoaDao.buscarPorId(pessoaId), disciplinaDao.buscarPorId(disciplinaId))
+                             for pessoaId, disciplinaId in cur.fetchall()])
+    lotesCategorias = lotes(REPETICOES_LOTE, lambda i: Categoria(id=None, nome=f"Lote {i}"))
+    lotesPessoas = lotes(REPETICOES_LOTE, novaPessoa)
+    lotesUsuarios = lotes(REPETICOES_LOTE, lambda i: novoUsuario(next(pessoasLoteUsuarios)))
+    lotesDisciplinas = lotes(REPETICOES_LOTE, lambda i: Disciplina(id=None, nome=f"Lote {i}", cargaHoraria=40))
+
+    def pessoaAleatoria(aleatorio):
+        return pessoaDao.buscarPorId(aleatorio.choice(pessoaIds))
+
+    def salvarNovaPessoa(aleatorio):
+        pessoaDao.salvar(novaPessoa(next(novas)))
+
+    def atualizarPessoa(aleatorio):
+        pessoa = aleatorio.choice(pessoasCarregadas)
+        pessoa.telefone = f"119{aleatorio.randint(10000000, 99999999)}"
+        pessoaDao.salvar(pessoa)
+
+    def salvarNovaCategoria(aleatorio):
+        categoriaDao.salvar(Categoria(id=None, nome=f"Nova categoria {next(novas)}"))
+
+    def salvarNovaDisciplina(aleatorio):
+        disciplinaDao.salvar(Disciplina(id=None, nome=f"Nova disciplina {next(novas)}", cargaHoraria=40))
+
+    def salvarNovoUsuario(aleatorio):
+        usuarioDao.salvar(novoUsuario(next(pessoasSemUsuario)))
+
+    def vincular(aleatorio):
+        disciplinaDao.vincularPessoa(aleatorio.choice(pessoasCarregadas), aleatorio.choice(disciplinasCarregadas))
+
+    def desvincular(aleatorio):
+        disciplinaDao.desvincularPessoa(*next(vinculosDesfazer))
+
+    def semCache(funcao):
+        # O cache de categorias é do processo e absorveria as leituras: limpo antes
+        # de cada chamada, a leitura vai ao banco (as versões "(cache)" medem o acerto)
+        def comCacheLimpo(aleatorio):
+            categoriaDao.cache.invalidar()
+            return funcao(aleatorio)
+        return comCacheLimpo
+
+    def categoriaPorId(aleatorio):
+        return categoriaDao.buscarPorId(aleatorio.choice(categoriaIds))
+
+    def categoriaPorNome(aleatorio):
+        return categoriaDao.buscarPorNome(f"Categoria {aleatorio.randrange(len(categoriaIds)):04d}")
+
+    # Listagens completas são caras nas escalas grandes: poucas repetições.
+    # As leituras de categoria vêm antes das escritas, com a tabela no tamanho da escala
+    return [
+        ('CategoriaDAO.buscarPorId', semCache(categoriaPorId), 1000),
+        ('CategoriaDAO.buscarPorId (cache)', categoriaPorId, 1000),
+        ('CategoriaDAO.buscarPorNome', semCache(categoriaPorNome), 1000),
+        ('CategoriaDAO.buscarPorNome (cache)', categoriaPorNome, 1000),
+        ('CategoriaDAO.listarTodas', semCache(lambda a: categoriaDao.listarTodas()), 50),
+        ('CategoriaDAO.listarTodas (cache)', lambda a: categoriaDao.listarTodas(), 50),
+        ('CategoriaDAO.salvar', salvarNovaCategoria, 200),
+        ('CategoriaDAO.salvarEmLote', lambda a: categoriaDao.salvarEmLote(next(lotesCategorias)), REPETICOES_LOTE),
+        ('CategoriaDAO.deletar', lambda a: categoriaDao.deletar(next(categoriasApagar)), 200),
+        ('PessoaDAO.salvar (insert)', salvarNovaPessoa, 200),
+        ('PessoaDAO.salvar (update)', atualizarPessoa, 200),
+        ('PessoaDAO.salvarEmLote', lambda a: pessoaDao.salvarEmLote(next(lotesPessoas)), REPETICOES_LOTE),
+        ('PessoaDAO.buscarPorId', pessoaAleatoria, 1000),
+        ('PessoaDAO.buscarPorNome', lambda a: pessoaDao.buscarPorNome(f"{a.choice(SOBRENOMES)} {a.randrange(len(pessoaIds))}"), 20),
+        ('PessoaDAO.buscarPorCategoria', lambda a: pessoaDao.buscarPorCategoria(a.choice(categoriaIds)), 5),
+        ('PessoaDAO.listarPagina', lambda a: pessoaDao.listarPagina(a.choice(NOMES), 0, 50), 200),
+        ('PessoaDAO.existeEmail', lambda a: pessoaDao.existeEmail(f"pessoa{a.randrange(len(pessoaIds))}@example.com"), 1000),
+        ('PessoaDAO.contar', lambda a: pessoaDao.contar(), 50),
+        ('PessoaDAO.listarTodas', lambda a: pessoaDao.listarTodas(), 2),
+        ('PessoaDAO.deletar', lambda a: pessoaDao.deletar(next(pessoasApagar)), 200),
+        ('UsuarioDAO.salvar (insert)', salvarNovoUsuario, 200),
+        ('UsuarioDAO.salvarEmLote', lambda a: usuarioDao.salvarEmLote(next(lotesUsuarios)), REPETICOES_LOTE),
+        ('UsuarioDAO.buscarPorId', lambda a: usuarioDao.buscarPorId(a.choice(pessoaIds)), 1000),
+        ('UsuarioDAO.buscarPorPessoaId', lambda a: usuarioDao.buscarPorPessoaId(a.choice(pessoaIds)), 1000),
+        ('UsuarioDAO.buscarPorLogin', lambda a: usuarioDao.buscarPorLogin(f"usuario{a.choice(pessoaIds)}"), 1000),
+        ('UsuarioDAO.listarPagina', lambda a: usuarioDao.listarPagina(f"usuario{a.choice(pessoaIds)}", 50), 100),
+        ('UsuarioDAO.listarTodos', lambda a: usuarioDao.listarTodos(), 2),
+        ('UsuarioDAO.deletar', lambda a: usuarioDao.deletar(next(usuariosApagar)), 200),
+        ('DisciplinaDAO.salvar', salvarNovaDisciplina, 200),
+        ('DisciplinaDAO.salvarEmLote', lambda a: disciplinaDao.salvarEmLote(next(lotesDisciplinas)), REPETICOES_LOTE),
+        ('DisciplinaDAO.buscarPorId', lambda a: disciplinaDao.buscarPorId(a.choice(disciplinaIds)), 1000),
+        ('DisciplinaDAO.buscarPorNome', lambda a: disciplinaDao.buscarPorNome(f"{a.randrange(len(disciplinaIds)):04d}"), 100),
+        ('DisciplinaDAO.listarTodas', lambda a: disciplinaDao.listarTodas(), 20),
+        ('DisciplinaDAO.buscarPessoasPorDisciplina', lambda a: disciplinaDao.buscarPessoasPorDisciplina(a.choice(disciplinaIds)), 10),
+        ('DisciplinaDAO.buscarDisciplinasPorPessoa', lambda a: disciplinaDao.buscarDisciplinasPorPessoa(a.choice(pessoaIds)), 1000),
+        ('DisciplinaDAO.vincularPessoa', vincular, 200),
+        ('DisciplinaDAO.desvincularPessoa', desvincular, 200),
+        ('DisciplinaDAO.contarPorDisciplina', lambda a: disciplinaDao.contarPorDisciplina(), 5),
+        ('DisciplinaDAO.estatisticasCargaHoraria', lambda a: disciplinaDao.estatisticasCargaHoraria(), 5),
+        ('DisciplinaDAO.deletar', lambda a: disciplinaDao.deletar(next(disciplinasApagar)), 200),
+    ]
+
+
+def commitAtual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def executarBenchmark(escala='1k', semente=42, tamanhoIdentityMap=0):
+    """
+    Retorna o dicionário de resultados. tamanhoIdentityMap=0 (padrão) faz toda
+    leitura ir ao banco, medindo o SQL em vez do cache.
+    """
+    with tempfile.TemporaryDirectory() as diretorio:
+        db = ConexaoContada(os.path.join(diretorio, f'benchmark_{escala}.db'),
+                            tamanhoIdentityMap=tamanhoIdentityMap)
+        try:
+            db.criarTabelas()
+            inicio = time.perf_counter()
+            dados = popular(db, escala, semente)
+            print(f"Dados da escala {escala} gerados em {time.perf_counter() - inicio:.1f}s", file=sys.stderr)
+
+            contador = db.contador = ContadorSql(db.conectar())
+            aleatorio = random.Random(semente)
+            resultados = {}
+            for nome, funcao, repeticoes in criarOperacoes(db, dados):
+                resultados[nome] = medir(funcao, repeticoes, contador, aleatorio)
+                print(f"  {nome:<45} {resultados[nome]['mediaMs']:>10.3f} ms  "
+                      f"{resultados[nome]['sqlPorChamada']:>6} SQL/chamada", file=sys.stderr)
+        finally:
+            db.fechar()
+
+    return {
+        'meta': {
+            'escala': escala,
+            'semente': semente,
+            'quantidades': ESCALAS[escala],
+            'tamanhoIdentityMap': tamanhoIdentityMap,
+            'commit': commitAtual(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'resultados': resultados,
+    }
+
+
+def comparar(caminhoBase, caminhoNovo, tolerancia=0.25, minimoMs=0.2):
+    """
+    Compara dois arquivos de resultado. Regressão: mediana (p50) mais lenta que a
+    base além da tolerância (ex.: 0.25 = 25%) e de minimoMs, ou mais SQL por chamada.
+    A mediana e o mínimo absoluto evitam acusar o ruído das operações muito rápidas.
+    Retorna a lista de regressões encontradas.
+    """
+    with open(caminhoBase, encoding='utf-8') as arquivo:
+        base = json.load(arquivo)
+    with open(caminhoNovo, encoding='utf-8') as arquivo:
+        novo = json.load(arquivo)
+
+    if base['meta']['escala'] != novo['meta']['escala']:
+        print(f"⚠️  Escalas diferentes: {base['meta']['escala']} x {novo['meta']['escala']}")
+
+    print(f"\n{'Método':<45} {'Base p50':>10} {'Novo p50':>10} {'Variação':>9} {'SQL':>11}")
+    print("-" * 90)
+    regressoes = []
+    for nome, resultadoNovo in novo['resultados'].items():
+        resultadoBase = base['resultados'].get(nome)
+        if resultadoBase is None:
+            print(f"{nome:<45} {'-':>10} {resultadoNovo['p50Ms']:>10.3f}   (novo)")
+            continue
+
+        base50, novo50 = resultadoBase['p50Ms'], resultadoNovo['p50Ms']
+        variacao = novo50 / base50 - 1 if base50 else 0
+        sql = f"{resultadoBase['sqlPorChamada']:g}->{resultadoNovo['sqlPorChamada']:g}"
+        marcador = ""
+        if ((variacao > tolerancia and novo50 - base50 > minimoMs)
+                or resultadoNovo['sqlPorChamada'] > resultadoBase['sqlPorChamada']):
+            regressoes.append(nome)
+            marcador = "  ❌"
+        print(f"{nome:<45} {base50:>10.3f} {novo50:>10.3f} "
+              f"{variacao:>+8.0%} {sql:>11}{marcador}")
+
+    print("-" * 90)
+    if regressoes:
+        print(f"❌ {len(regressoes)} regressão(ões) (tolerância de {tolerancia:.0%})")
+    else:
+        print(f"✅ Nenhuma regressão (tolerância de {tolerancia:.0%})")
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos DAOs do SQLite+POO")
+    parser.add_argument('--escala', choices=list(ESCALAS), default='1k')
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--identity-map', dest='tamanhoIdentityMap', type=int, default=0,
+                        help="tamanho do identity map (padrão 0: sem cache)")
+    parser.add_argument('--saida', help="arquivo JSON de resultados (padrão: saída padrão)")
+    parser.add_argument('--comparar', nargs=2, metavar=('BASE', 'NOVO'), help="compara dois resultados")
+    parser.add_argument('--tolerancia', type=float, default=0.25)
+    parser.add_argument('--minimo-ms', dest='minimoMs', type=float, default=0.2,
+                        help="diferença mínima (ms) para contar como regressão")
+    args = parser.parse_args(argv)
+
+    if args.comparar:
+        return 1 if comparar(*args.comparar, args.tolerancia, args.minimoMs) else 0
+
+    resultado = executarBenchmark(args.escala, args.semente, args.tamanhoIdentityMap)
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto + "\n")
+    else:
+        print(texto)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Benchmark: preparar o banco de cada teste reinserindo os dados x copiar um
+banco modelo (bd/fixtures.py) em memória, em arquivo ou compartilhado.
+Cada "teste" recebe um banco com os dados da escala, faz algumas leituras e
+escritas e descarta o banco.
+Uso: python3 test/benchmark_fixtures.py [escala] [testes]   (escala: 1k, 100k, 1m)
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Adicionar o diretório pai ao path para permitir imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_dao import popular
+from bd.database import DatabaseConnection
+from bd.fixtures import ModeloBanco
+from model.pessoa import Pessoa
+from dao.categoria_dao import CategoriaDAO
+from dao.disciplina_dao import DisciplinaDAO
+from dao.pessoa_dao import PessoaDAO
+
+SEMENTE = 42
+# Reinserir a escala a cada teste é lento: mede poucos testes e projeta o total
+TESTES_REINSERINDO = 2
+
+
+def executarTeste(db, numero):
+    """Carga típica de um teste de DAO"""
+    pessoaDao = PessoaDAO(db)
+    for id in range(numero + 1, numero + 21):
+        pessoaDao.buscarPorId(id)
+    pessoaDao.listarPagina(limite=50)
+    categoria = CategoriaDAO(db).listarTodas()[0]
+    pessoaDao.salvar(Pessoa(id=None, nome=f"Teste {numero}", email=f"teste{numero}@example.com",
+                            categoria=categoria))
+    pessoaDao.deletar(pessoaDao.buscarPorId(numero + 1))
+    DisciplinaDAO(db).listarTodas()
+    assert pessoaDao.existeEmail(f"teste{numero}@example.com")
+
+
+def medirReinserindo(escala, testes):
+    with tempfile.TemporaryDirectory() as diretorio:
+        inicio = time.perf_counter()
+        for numero in range(testes):
+            db = DatabaseConnection(os.path.join(diretorio, f'teste_{numero}.db'))
+            try:
+                db.criarTabelas()
+                popular(db, escala, SEMENTE)
+                executarTeste(db, numero)
+            finally:
+                db.fechar()
+        return 0.0, (time.perf_counter() - inicio) / testes
+
+
+def medirModelo(escala, testes, modo):
+    inicio = time.perf_counter()
+    with ModeloBanco(lambda db: popular(db, escala, SEMENTE), modo=modo) as modelo:
+        preparo = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        for numero in range(testes):
+            db = modelo.novoBanco()
+            try:
+                executarTeste(db, numero)
+            finally:
+                db.fechar()
+        return preparo, (time.perf_counter() - inicio) / testes
+
+
+def executarBenchmark(escala='100k', testes=50):
+    print(f"\nEscala {escala}, suíte de {testes} testes\n")
+    print(f"{'Estratégia':<32} {'Preparo (s)':>12} {'Por teste (ms)':>15} {'Suíte (s)':>10}")
+    print("-" * 72)
+
+    resultados = {}
+    estrategias = [('reinserir', "Reinserir por teste*")] + \
+        [(modo, f"Cópia do modelo ({modo})") for modo in ('memoria', 'arquivo', 'compartilhado')]
+    for estrategia, rotulo in estrategias:
+        if estrategia == 'reinserir':
+            preparo, porTeste = medirReinserindo(escala, min(testes, TESTES_REINSERINDO))
+        else:
+            preparo, porTeste = medirModelo(escala, testes, estrategia)
+        total = preparo + porTeste * testes
+        resultados[estrategia] = total
+        print(f"{rotulo:<32} {preparo:>12.2f} {porTeste * 1000:>15.1f} {total:>10.2f}")
+
+    print("-" * 72)
+    print(f"* projetado a partir de {min(testes, TESTES_REINSERINDO)} testes")
+    print(f"Ganho (memoria): {resultados['reinserir'] / resultados['memoria']:.0f}x")
+    return resultados
+
+
+if __name__ == "__main__":
+    escala = sys.argv[1] if len(sys.argv) > 1 else '100k'
+    testes = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    executarBenchmark(escala, testes)
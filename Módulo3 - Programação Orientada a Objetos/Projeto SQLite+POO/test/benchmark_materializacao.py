@@ -0,0 +1,75 @@
+"""
+Benchmark: memória e velocidade para montar objetos Pessoa a partir das linhas do banco
+Uso: python3 test/benchmark_materializacao.py [quantidade]   (padrão: 1000000)
+"""
+import sys
+import os
+import gc
+import time
+import tempfile
+import tracemalloc
+
+# Adicionar o diretório pai ao path para permitir imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.database import DatabaseConnection
+from model.categoria import Categoria
+from model.pessoa import Pessoa
+from dao.categoria_dao import CategoriaDAO
+from dao.pessoa_dao import PessoaDAO
+
+
+def popular(db, quantidade):
+    categoria = Categoria(id=None, nome="Benchmark")
+    CategoriaDAO(db).salvar(categoria)
+    PessoaDAO(db).salvarEmLote((
+        Pessoa(id=None, nome=f"Pessoa {i}", email=f"pessoa{i}@example.com", categoria=categoria,
+               altura=1.70, peso=70.0, dataNascimento="2000-01-01", telefone="11999999999")
+        for i in range(quantidade)
+    ), 5000)
+
+
+def medirTempo(db):
+    """Carrega todas as pessoas com iterarTodas e mede o tempo"""
+    db.identityMap.limpar()
+    gc.collect()
+    inicio = time.perf_counter()
+    pessoas = list(PessoaDAO(db).iterarTodas(tamanhoLote=5000))
+    return len(pessoas), time.perf_counter() - inicio
+
+
+def medirMemoria(db):
+    """Memória ocupada pelas pessoas carregadas (medida à parte: tracemalloc deixa tudo mais lento)"""
+    db.identityMap.limpar()
+    gc.collect()
+    tracemalloc.start()
+    pessoas = list(PessoaDAO(db).iterarTodas(tamanhoLote=5000))
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return memoria
+
+
+def executarBenchmark(quantidade=1000000):
+    with tempfile.TemporaryDirectory() as diretorio:
+        # O identity map precisa comportar todas as pessoas: elas ficam vivas na lista
+        db = DatabaseConnection(os.path.join(diretorio, 'materializacao.db'),
+                                tamanhoIdentityMap=quantidade + 1, perfil='throughput')
+        try:
+            db.criarTabelas()
+            print(f"\nPopulando {quantidade} pessoas...")
+            popular(db, quantidade)
+
+            total, duracao = medirTempo(db)
+            memoria = medirMemoria(db)
+            print("-" * 80)
+            print(f"{'Pessoas':>10}  {'Tempo':>8}  {'Pessoas/s':>12}  {'Memória':>10}  {'Bytes/pessoa':>12}")
+            print(f"{total:>10}  {duracao:>7.2f}s  {total / duracao:>12,.0f}  "
+                  f"{memoria / 1024 / 1024:>8.1f}MB  {memoria / total:>12.0f}")
+            print("-" * 80)
+        finally:
+            db.fechar()
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    executarBenchmark(quantidade)
@@ -0,0 +1,110 @@
+"""
+Benchmark: compara os perfis de conexão (default, throughput, readonly)
+em uma carga mista de leitura e escrita
+Uso: python3 test/benchmark_perfis.py [operacoes] [percentualEscrita]
+"""
+import sys
+import os
+import random
+import time
+import tempfile
+
+# Adicionar o diretório pai ao path para permitir imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.database import DatabaseConnection
+from model.categoria import Categoria
+from model.pessoa import Pessoa
+from dao.categoria_dao import CategoriaDAO
+from dao.pessoa_dao import PessoaDAO
+
+
+def popular(db, quantidade):
+    """Cria categorias e pessoas iniciais (em lote, fora da medição)"""
+    categorias = [Categoria(id=None, nome=f"Categoria {i}") for i in range(10)]
+    CategoriaDAO(db).salvarEmLote(categorias)
+    PessoaDAO(db).salvarEmLote(
+        Pessoa(id=None, nome=f"Pessoa {i:07d}", email=f"inicial{i}@example.com",
+               categoria=categorias[i % 10])
+        for i in range(quantidade)
+    )
+    return categorias
+
+
+def cargaMista(db, categorias, operacoes, percentualEscrita, semente=42):
+    """Executa escritas (salvar em autocommit) intercaladas com leituras"""
+    pessoaDao = PessoaDAO(db)
+    aleatorio = random.Random(semente)
+    totalPessoas = db.cursor().execute("SELECT MAX(id) FROM pessoa;").fetchone()[0]
+
+    inicio = time.perf_counter()
+    for i in range(operacoes):
+        if aleatorio.random() * 100 < percentualEscrita:
+            pessoa = Pessoa(id=None, nome=f"Nova {i}", email=f"nova{i}@example.com",
+                            categoria=aleatorio.choice(categorias))
+            pessoaDao.salvar(pessoa)
+            totalPessoas = pessoa.id
+        elif i % 50 == 0:
+            pessoaDao.buscarPorCategoria(aleatorio.choice(categorias).id)
+        else:
+            pessoaDao.buscarPorId(aleatorio.randint(1, totalPessoas))
+    return time.perf_counter() - inicio
+
+
+def cargaLeitura(db, operacoes, semente=42):
+    """Executa apenas leituras (perfil readonly)"""
+    pessoaDao = PessoaDAO(db)
+    aleatorio = random.Random(semente)
+    totalPessoas = db.cursor().execute("SELECT MAX(id) FROM pessoa;").fetchone()[0]
+    categoriaIds = [row[0] for row in db.cursor().execute("SELECT id FROM categoria;")]
+
+    inicio = time.perf_counter()
+    for i in range(operacoes):
+        if i % 50 == 0:
+            pessoaDao.buscarPorCategoria(aleatorio.choice(categoriaIds))
+        else:
+            pessoaDao.buscarPorId(aleatorio.randint(1, totalPessoas))
+    return time.perf_counter() - inicio
+
+
+def exibir(perfil, descricao, operacoes, duracao):
+    print(f"{perfil:<12} {descricao:<28} {operacoes:>8} ops  {duracao:>8.2f}s  {operacoes / duracao:>10,.0f} ops/s")
+
+
+def executarBenchmark(operacoes=5000, percentualEscrita=20, pessoasIniciais=20000):
+    print(f"\nCarga mista: {operacoes} operações, {percentualEscrita}% escritas, "
+          f"{pessoasIniciais} pessoas iniciais")
+    print("-" * 80)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminhoDefault = None
+        for perfil in ('default', 'throughput'):
+            caminho = os.path.join(diretorio, f'{perfil}.db')
+            # tamanhoIdentityMap=0: toda leitura vai ao banco
+            db = DatabaseConnection(caminho, tamanhoIdentityMap=0, perfil=perfil)
+            try:
+                db.criarTabelas()
+                categorias = popular(db, pessoasIniciais)
+                duracao = cargaMista(db, categorias, operacoes, percentualEscrita)
+                exibir(perfil, "leitura + escrita", operacoes, duracao)
+                duracao = cargaLeitura(db, operacoes)
+                exibir(perfil, "somente leitura", operacoes, duracao)
+            finally:
+                db.fechar()
+            if perfil == 'default':
+                caminhoDefault = caminho
+
+        db = DatabaseConnection(caminhoDefault, tamanhoIdentityMap=0, perfil='readonly')
+        try:
+            duracao = cargaLeitura(db, operacoes)
+            exibir('readonly', "somente leitura", operacoes, duracao)
+        finally:
+            db.fechar()
+
+    print("-" * 80)
+
+
+if __name__ == "__main__":
+    operacoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    percentualEscrita = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    executarBenchmark(operacoes, percentualEscrita)
@@ -0,0 +1,75 @@
+"""
+Benchmark: inserção de pessoas linha a linha (salvar) x em lote (salvarEmLote)
+Uso: python3 test/benchmark_salvar_lote.py [quantidade] [tamanhoLote]
+"""
+import sys
+import os
+import time
+import tempfile
+
+# Adicionar o diretório pai ao path para permitir imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bd.database import DatabaseConnection
+from model.categoria import Categoria
+from model.pessoa import Pessoa
+from dao.categoria_dao import CategoriaDAO
+from dao.pessoa_dao import PessoaDAO
+
+
+def gerarPessoas(quantidade, categoria, prefixo):
+    for i in range(quantidade):
+        yield Pessoa(
+            id=None,
+            nome=f"Pessoa {i}",
+            email=f"{prefixo}{i}@example.com",
+            categoria=categoria,
+            altura=1.70,
+            peso=70.0,
+            dataNascimento="2000-01-01",
+            telefone="11999999999"
+        )
+
+
+def medir(descricao, quantidade, funcao):
+    inicio = time.perf_counter()
+    funcao()
+    duracao = time.perf_counter() - inicio
+    print(f"{descricao:<30} {quantidade:>10} linhas  {duracao:>8.2f}s  {quantidade / duracao:>12,.0f} linhas/s")
+    return duracao
+
+
+def executarBenchmark(quantidade=2000, tamanhoLote=500):
+    with tempfile.TemporaryDirectory() as diretorio:
+        db = DatabaseConnection(os.path.join(diretorio, 'benchmark.db'))
+        try:
+            db.conectar()
+            db.criarTabelas()
+
+            categoria = Categoria(id=None, nome="Benchmark")
+            CategoriaDAO(db).salvar(categoria)
+            pessoaDao = PessoaDAO(db)
+
+            print(f"\nInserindo {quantidade} pessoas (tamanhoLote={tamanhoLote})")
+            print("-" * 80)
+
+            def linhaALinha():
+                for pessoa in gerarPessoas(quantidade, categoria, "linha"):
+                    pessoaDao.salvar(pessoa)
+
+            def emLote():
+                pessoaDao.salvarEmLote(gerarPessoas(quantidade, categoria, "lote"), tamanhoLote)
+
+            tempoLinha = medir("salvar (autocommit)", quantidade, linhaALinha)
+            tempoLote = medir("salvarEmLote", quantidade, emLote)
+
+            print("-" * 80)
+            print(f"Ganho: {tempoLinha / tempoLote:.1f}x")
+        finally:
+            db.fechar()
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    tamanhoLote = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    executarBenchmark(quantidade, tamanhoLote)
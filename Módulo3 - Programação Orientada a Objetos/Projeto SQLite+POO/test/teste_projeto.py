@@ -4,22 +4,45 @@ Testa todas as funcionalidades e verifica se está tudo funcionando
 """
 import sys
 import os
+import asyncio
+import io
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
 
 # Adicionar o diretório pai ao path para permitir imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from bd.backup import fazerBackup, restaurar, restaurarEmMemoria
 from bd.database import DatabaseConnection
+from bd.executor import ExecutorBanco
+from bd.fixtures import ModeloBanco
+from bd.identity_map import IdentityMap
+from bd.pool import PoolConexoes
+from bd.migracoes import MIGRACOES, Migracao, migrar, preencherEmPartes, versaoAtual
+from bd.rastreador import RastreadorSql
 from model.categoria import Categoria
 from model.pessoa import Pessoa
+from model.usuario import Usuario
+from model.disciplina import Disciplina
+from app.cli import ArquivoService
+from dao.assincrono import CategoriaDAOAssincrono, PessoaDAOAssincrono
 from dao.categoria_dao import CategoriaDAO
-from dao.pessoa_dao import PessoaDAO
+from dao.pessoa_dao import MINUSCULAS_NOCASE, PessoaDAO
+from dao.usuario_dao import UsuarioDAO
+from dao.disciplina_dao import DisciplinaDAO
 
 
-def limparBanco(db):
-    """Remove todos os dados do banco para testes limpos"""
-    print("🧹 Limpando banco de dados...")
-    db.limparDados()
-    print("✓ Banco limpo!\n")
+def executarComCopia(modelo, teste):
+    """Executa teste(db) em uma cópia nova do banco modelo"""
+    db = modelo.novoBanco()
+    try:
+        return teste(db)
+    finally:
+        db.fechar()
 
 
 def testarCategoriaDao(db):
@@ -178,6 +201,14 @@ def testarPessoaDao(db):
         assert len(todasPessoas) >= 2, f"Esperava pelo menos 2 pessoas, encontrou {len(todasPessoas)}"
         print(f"  ✓ Total de pessoas: {len(todasPessoas)}")
         
+        # Pessoas da mesma categoria devem compartilhar a mesma instância de Categoria
+        categoriasVistas = {}
+        for p in todasPessoas:
+            assert p.categoria.nome, "Categoria não foi carregada pelo JOIN"
+            categoriaVista = categoriasVistas.setdefault(p.categoria.id, p.categoria)
+            assert categoriaVista is p.categoria, "Categoria duplicada na listagem"
+        print(f"  ✓ Categorias carregadas pelo JOIN: {len(categoriasVistas)}")
+        
         # Testar relacionamento
         print("\n✓ READ - Testando relacionamento com categoria...")
         categoriaRel = pessoaDao.obterCategoria(pessoaEncontrada)
@@ -252,6 +283,19 @@ def testarIntegridadeReferencial(db):
             else:
                 raise
         
+        # Email sem diferenciar maiúsculas/minúsculas
+        print("\n✓ Testando existeEmail...")
+        joaoId = pessoaDao.existeEmail("JOAO@example.com")
+        assert joaoId is not None, "existeEmail deveria ignorar maiúsculas"
+        assert pessoaDao.existeEmail("joao@example.com", ignorarId=joaoId) is None, "ignorarId não foi respeitado"
+        assert pessoaDao.existeEmail("ninguem@example.com") is None, "Email inexistente encontrado"
+        try:
+            pessoaDao.salvar(Pessoa(id=None, nome="Teste Maiúsculas", email="JOAO@EXAMPLE.COM",
+                                    categoria=categoria))
+            raise AssertionError("Email repetido com outra caixa foi aceito")
+        except sqlite3.IntegrityError:
+            print("  ✓ existeEmail e índice UNIQUE NOCASE funcionando")
+        
         # Testar constraint de foreign key
         print("\n✓ Testando integridade referencial (foreign key)...")
         pessoaInvalida = Pessoa(
@@ -284,32 +328,1359 @@ def testarIntegridadeReferencial(db):
         return False
 
 
+def testarIdentityMap(db):
+    """Testa o identity map compartilhado pelos DAOs"""
+    print("=" * 60)
+    print("TESTE 4: Identity Map")
+    print("=" * 60)
+    
+    categoriaDao = CategoriaDAO(db)
+    pessoaDao = PessoaDAO(db)
+    
+    try:
+        # Mesma chave -> mesma instância
+        print("\n✓ Verificando instância única por registro...")
+        pessoa = pessoaDao.listarTodas()[0]
+        assert pessoaDao.buscarPorId(pessoa.id) is pessoa, "buscarPorId criou outra instância"
+        assert categoriaDao.buscarPorId(pessoa.categoria.id) is pessoa.categoria, "Categoria duplicada"
+        print("  ✓ buscarPorId reaproveita o objeto já carregado")
+        
+        # salvar invalida a entrada
+        print("\n✓ Verificando invalidação ao salvar...")
+        pessoaDao.salvar(pessoa)
+        recarregada = pessoaDao.buscarPorId(pessoa.id)
+        assert recarregada is not pessoa, "Entrada não foi invalidada ao salvar"
+        assert recarregada.email == pessoa.email, "Dados recarregados incorretos"
+        print("  ✓ salvar invalidou a entrada")
+        
+        # Tamanho limitado (descarta a entrada usada há mais tempo)
+        print("\n✓ Verificando limite de tamanho...")
+        mapa = IdentityMap(tamanhoMaximo=2)
+        cats = [Categoria(id=i, nome=f"Cat {i}") for i in range(1, 4)]
+        mapa.registrar(cats[0])
+        mapa.registrar(cats[1])
+        mapa.obter(Categoria, 1)  # Categoria 1 passa a ser a mais recente
+        mapa.registrar(cats[2])
+        assert len(mapa) == 2, "Limite de tamanho não respeitado"
+        assert mapa.obter(Categoria, 2) is None, "Entrada menos usada não foi descartada"
+        assert mapa.obter(Categoria, 1) is cats[0], "Entrada recente foi descartada"
+        print("  ✓ Entrada menos usada foi descartada")
+        
+        # Modelos com __slots__: sem __dict__ por objeto
+        assert not hasattr(pessoaDao.buscarPorId(pessoa.id), '__dict__'), "Pessoa deveria usar __slots__"
+        
+        print("\n✅ TESTE 4 PASSOU - Identity Map OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 4 FALHOU: {e}\n")
+        return False
+
+
+def testarSalvarEmLote(db):
+    """Testa a inserção/atualização em lote (salvarEmLote)"""
+    print("=" * 60)
+    print("TESTE 5: Salvar em Lote")
+    print("=" * 60)
+    
+    categoriaDao = CategoriaDAO(db)
+    pessoaDao = PessoaDAO(db)
+    usuarioDao = UsuarioDAO(db)
+    
+    try:
+        # INSERT em lote com ids gravados de volta
+        print("\n✓ Inserindo categorias e pessoas em lote...")
+        categorias = [Categoria(id=None, nome=f"Lote {i}") for i in range(3)]
+        total = categoriaDao.salvarEmLote(categorias, tamanhoLote=2)
+        assert total == 3, f"Esperava 3 categorias salvas, obteve {total}"
+        assert all(c.id is not None for c in categorias), "IDs das categorias não foram atribuídos"
+        
+        pessoas = [
+            Pessoa(id=None, nome=f"Pessoa Lote {i}", email=f"lote{i}@example.com",
+                   categoria=categorias[i % 3], ativo=(i % 2 == 0))
+            for i in range(5)
+        ]
+        pessoaDao.salvarEmLote(pessoas, tamanhoLote=2)
+        assert all(p.id is not None for p in pessoas), "IDs das pessoas não foram atribuídos"
+        assert len(set(p.id for p in pessoas)) == 5, "IDs repetidos"
+        encontrada = pessoaDao.buscarPorId(pessoas[3].id)
+        assert encontrada.email == "lote3@example.com", "Pessoa salva incorretamente"
+        assert encontrada.ativo == False, "Campo ativo salvo incorretamente"
+        print(f"  ✓ {total} categorias e {len(pessoas)} pessoas inseridas")
+        
+        usuarios = [Usuario(id=None, login=f"lote{i}", senha="123", tipo="aluno", pessoa=p)
+                    for i, p in enumerate(pessoas[:2])]
+        usuarioDao.salvarEmLote(usuarios)
+        assert usuarioDao.buscarPorId(pessoas[1].id).login == "lote1", "Usuário salvo incorretamente"
+        print(f"  ✓ {len(usuarios)} usuários inseridos")
+        
+        # UPSERT: pelo id e pelo email
+        print("\n✓ Atualizando em lote (upsert)...")
+        pessoas[0].nome = "Pessoa Lote Alterada"
+        duplicada = Pessoa(id=None, nome="Pessoa Lote Nova", email="lote1@example.com",
+                           categoria=categorias[0])
+        pessoaDao.salvarEmLote([pessoas[0], duplicada])
+        assert duplicada.id == pessoas[1].id, "Upsert por email não reaproveitou o registro"
+        assert pessoaDao.buscarPorId(pessoas[0].id).nome == "Pessoa Lote Alterada", "Upsert por id falhou"
+        assert pessoaDao.buscarPorId(pessoas[1].id).nome == "Pessoa Lote Nova", "Upsert por email falhou"
+        print("  ✓ Upsert por id e por email OK")
+        
+        # Emails que diferem só em maiúsculas/minúsculas são o mesmo (índice COLLATE NOCASE)
+        print("\n✓ Upsert com emails em maiúsculas/minúsculas...")
+        maiuscula = Pessoa(id=None, nome="Pessoa Lote Maiúscula", email="LOTE2@Example.com",
+                           categoria=categorias[0])
+        nova = Pessoa(id=None, nome="Pessoa Caixa", email="Caixa@example.com", categoria=categorias[0])
+        repetida = Pessoa(id=None, nome="Pessoa Caixa Repetida", email="caixa@EXAMPLE.com", categoria=categorias[0])
+        pessoaDao.salvarEmLote([maiuscula, nova, repetida])
+        assert maiuscula.id == pessoas[2].id, "Email em maiúsculas não reaproveitou o registro"
+        assert nova.id is not None and repetida.id == nova.id, "Emails repetidos no lote geraram registros diferentes"
+        assert pessoaDao.buscarPorId(pessoas[2].id).nome == "Pessoa Lote Maiúscula", "Upsert sem caixa falhou"
+        assert pessoaDao.existeEmail("CAIXA@example.com") == nova.id, "Pessoa do lote não encontrada"
+        print("  ✓ Mesmo registro para emails que diferem só na caixa")
+        
+        # Falha no meio do lote: nada é gravado e os ids gerados são desfeitos
+        print("\n✓ Verificando rollback do lote...")
+        validas = [Pessoa(id=None, nome="Rollback", email=f"rollback{i}@example.com",
+                          categoria=categorias[0]) for i in range(3)]
+        invalida = Pessoa(id=None, nome="Rollback FK", email="rollback_fk@example.com",
+                          categoria=Categoria(id=99999, nome="Inexistente"))
+        try:
+            pessoaDao.salvarEmLote(validas + [invalida], tamanhoLote=3)
+            raise AssertionError("Lote com foreign key inválida não falhou")
+        except Exception as e:
+            if "FOREIGN KEY" not in str(e):
+                raise
+        assert all(p.id is None for p in validas), "IDs não foram desfeitos após o rollback"
+        assert not pessoaDao.buscarPorNome("Rollback"), "Lote parcialmente gravado"
+        
+        # Pessoa sem id encontrada pelo email: a linha já existia e continua no banco
+        reencontrada = Pessoa(id=None, nome="Pessoa Lote Reencontrada", email="LOTE3@example.com",
+                              categoria=categorias[0])
+        inserida = Pessoa(id=None, nome="Rollback Inserida", email="rollback_inserida@example.com",
+                          categoria=categorias[0])
+        try:
+            with db.transacao():
+                pessoaDao.salvarEmLote([reencontrada, inserida])
+                raise RuntimeError("falha simulada")
+        except RuntimeError:
+            pass
+        assert reencontrada.id == pessoas[3].id, "Id de pessoa já gravada foi desfeito"
+        assert inserida.id is None, "Id de pessoa inserida continua após o rollback"
+        print("  ✓ Rollback OK (só as pessoas inseridas perdem o id)")
+        
+        # Chaves de buscarPorEmails com o mesmo critério do NOCASE (só ASCII)
+        print("\n✓ Buscando por emails com letras não ASCII...")
+        acentuadas = [Pessoa(id=None, nome="Érica", email=email, categoria=categorias[0])
+                      for email in ("ÉRICA@example.com", "érica@example.com")]
+        pessoaDao.salvarEmLote(acentuadas)
+        assert acentuadas[0].id != acentuadas[1].id, "NOCASE não deveria igualar É e é"
+        porEmail = pessoaDao.buscarPorEmails(["ÉRICA@EXAMPLE.COM", "érica@example.com"])
+        assert len(porEmail) == 2, f"Emails diferentes no NOCASE viraram a mesma chave: {list(porEmail)}"
+        for pessoa in acentuadas:
+            assert porEmail[pessoa.email.translate(MINUSCULAS_NOCASE)].id == pessoa.id, "Chave do email incorreta"
+        print("  ✓ 'É' e 'é' continuam emails diferentes")
+        
+        print("\n✅ TESTE 5 PASSOU - Salvar em Lote OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 5 FALHOU: {e}\n")
+        return False
+
+
+def testarTransacao(db):
+    """Testa transacao() com commit, rollback e savepoints aninhados"""
+    print("=" * 60)
+    print("TESTE 6: Transações")
+    print("=" * 60)
+    
+    categoriaDao = CategoriaDAO(db)
+    
+    try:
+        # COMMIT ao final do bloco
+        print("\n✓ Verificando commit...")
+        with db.transacao():
+            categoriaDao.salvar(Categoria(id=None, nome="Transação Commit"))
+            assert db.emTransacao, "Bloco não abriu transação"
+        assert not db.emTransacao, "Transação não foi encerrada"
+        assert categoriaDao.buscarPorNome("Transação Commit") is not None, "Commit não gravou"
+        print("  ✓ Commit OK")
+        
+        # ROLLBACK em caso de exceção
+        print("\n✓ Verificando rollback...")
+        try:
+            desfeita = Categoria(id=None, nome="Transação Rollback")
+            with db.transacao():
+                categoriaDao.salvar(desfeita)
+                raise RuntimeError("falha simulada")
+        except RuntimeError:
+            pass
+        assert categoriaDao.buscarPorNome("Transação Rollback") is None, "Rollback não desfez"
+        assert desfeita.id is None, "Id gerado continua no objeto após o rollback"
+        print("  ✓ Rollback OK")
+        
+        # Savepoint: erro no bloco interno não desfaz o externo
+        print("\n✓ Verificando savepoints aninhados...")
+        externa = Categoria(id=None, nome="Transação Externa")
+        internas = [Categoria(id=None, nome="Transação Interna")]
+        pessoasInternas = [Pessoa(id=None, nome=f"Interna {i}", email=f"interna{i}@email.com", categoria=externa)
+                           for i in range(2)]
+        with db.transacao():
+            categoriaDao.salvar(externa)
+            try:
+                with db.transacao():
+                    categoriaDao.salvar(internas[0])
+                    PessoaDAO(db).salvarEmLote(pessoasInternas)
+                    raise RuntimeError("falha simulada")
+            except RuntimeError:
+                pass
+        assert categoriaDao.buscarPorNome("Transação Externa") is not None, "Bloco externo perdido"
+        assert categoriaDao.buscarPorNome("Transação Interna") is None, "Savepoint não desfez"
+        assert externa.id is not None, "Id do bloco externo confirmado foi desfeito"
+        assert all(objeto.id is None for objeto in internas + pessoasInternas), \
+            "Ids do bloco interno desfeito continuam nos objetos após o COMMIT externo"
+        print("  ✓ Savepoint OK (ids do bloco interno desfeitos)")
+
+        # COMMIT recusado: com a FK adiada, a violação só aparece no COMMIT
+        print("\n✓ Verificando falha no commit...")
+        try:
+            with db.transacao():
+                cur = db.cursor()
+                cur.execute("PRAGMA defer_foreign_keys = ON;")
+                categoriaDao.salvar(Categoria(id=None, nome="Transação Commit Recusado"))
+                cur.execute("INSERT INTO pessoa (nome, email, categoria_id) VALUES (?, ?, ?);",
+                            ("Sem Categoria", "sem.categoria@email.com", 999999))
+            assert False, "COMMIT deveria ter falhado"
+        except sqlite3.IntegrityError:
+            pass
+        assert not db.emTransacao and not db.conectar().in_transaction, "Transação ficou aberta"
+        assert categoriaDao.buscarPorNome("Transação Commit Recusado") is None, "Commit recusado gravou"
+        with db.transacao():
+            categoriaDao.salvar(Categoria(id=None, nome="Transação Após Falha"))
+        assert categoriaDao.buscarPorNome("Transação Após Falha") is not None, "Conexão inutilizada"
+        print("  ✓ Rollback após commit recusado OK")
+
+        print("\n✅ TESTE 6 PASSOU - Transações OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 6 FALHOU: {e}\n")
+        return False
+
+
+def testarPerfisEIndices(db, dbPath):
+    """Testa os perfis de conexão e os índices secundários"""
+    print("=" * 60)
+    print("TESTE 7: Perfis de Conexão e Índices")
+    print("=" * 60)
+    
+    try:
+        # Índices criados por criarTabelas
+        print("\n✓ Verificando índices secundários...")
+        cur = db.cursor()
+        cur.execute("SELECT name FROM sqlite_master WHERE type = 'index';")
+        indices = {row['name'] for row in cur.fetchall()}
+        for indice in ("idx_pessoa_categoria_id", "idx_pessoa_nome",
+                       "idx_pessoa_disciplina_disciplina_id"):
+            assert indice in indices, f"Índice {indice} não foi criado"
+        print(f"  ✓ Índices OK")
+        
+        # Perfil inválido
+        print("\n✓ Verificando perfil inválido...")
+        try:
+            DatabaseConnection(dbPath, perfil="inexistente")
+            raise AssertionError("Perfil inválido foi aceito")
+        except ValueError:
+            print("  ✓ ValueError para perfil desconhecido")
+        
+        # Perfil readonly: lê, mas recusa escrita
+        print("\n✓ Verificando perfil readonly...")
+        dbLeitura = DatabaseConnection(dbPath, perfil="readonly")
+        try:
+            assert CategoriaDAO(dbLeitura).listarTodas(), "Leitura falhou no perfil readonly"
+            try:
+                CategoriaDAO(dbLeitura).salvar(Categoria(id=None, nome="Somente Leitura"))
+                raise AssertionError("Escrita foi aceita no perfil readonly")
+            except sqlite3.OperationalError:
+                print("  ✓ Escrita recusada no perfil readonly")
+        finally:
+            dbLeitura.fechar()
+        
+        print("\n✅ TESTE 7 PASSOU - Perfis e Índices OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 7 FALHOU: {e}\n")
+        return False
+
+
+def testarPoolConexoes():
+    """Testa o pool de conexões com várias threads usando os DAOs sem alteração"""
+    print("=" * 60)
+    print("TESTE 8: Pool de Conexões")
+    print("=" * 60)
+    
+    diretorio = tempfile.TemporaryDirectory()
+    pool = PoolConexoes(os.path.join(diretorio.name, 'pool.db'), tamanhoLeitores=2, timeout=10.0)
+    try:
+        pool.criarTabelas()
+        categoria = Categoria(id=None, nome="Pool")
+        CategoriaDAO(pool).salvar(categoria)
+        # O escritor já existe; os leitores são criados pelas threads com o rastreador ativo
+        rastreador = pool.ativarRastreamento()
+        
+        # Várias threads lendo e escrevendo ao mesmo tempo
+        print("\n✓ Executando 4 threads com leituras e escritas...")
+        erros = []
+        
+        def trabalhar(numero):
+            try:
+                pessoaDao = PessoaDAO(pool)
+                with pool.escopo(f"thread {numero}"):
+                    for i in range(25):
+                        pessoa = Pessoa(id=None, nome=f"Pool {numero}-{i}", categoria=categoria,
+                                        email=f"pool{numero}-{i}@example.com")
+                        if i % 5 == 0:
+                            with pool.transacao():
+                                pessoaDao.salvar(pessoa)
+                        else:
+                            pessoaDao.salvar(pessoa)
+                        assert pessoaDao.buscarPorId(pessoa.id).email == pessoa.email
+                        pessoaDao.listarTodas()
+            except Exception as e:
+                erros.append(e)
+        
+        threads = [threading.Thread(target=trabalhar, args=(numero,)) for numero in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert not erros, f"Erros nas threads: {erros}"
+        assert len(PessoaDAO(pool).listarTodas()) == 100, "Nem todas as pessoas foram salvas"
+        print(f"  ✓ 100 pessoas salvas sem erros")
+        
+        print("\n✓ Verificando o rastreamento no escritor e nos leitores...")
+        estatisticas = rastreador.estatisticas
+        insercoes = sum(e.execucoes for e in estatisticas.values() if e.sql.startswith("INSERT INTO pessoa"))
+        listagens = sum(e.execucoes for e in estatisticas.values()
+                        if e.sql.startswith("SELECT") and "FROM pessoa" in e.sql and "WHERE" not in e.sql)
+        assert insercoes == 100, f"INSERTs rastreados: {insercoes}"
+        assert listagens >= 100, f"Listagens rastreadas: {listagens}"
+        assert estatisticas["BEGIN"].execucoes == 20, "BEGIN de transacao() no escritor não registrado"
+        escoposNmais1 = {escopo for escopo, tipo, sql, quantidade in rastreador.alertas
+                         if tipo == 'n+1' and sql.startswith("INSERT INTO pessoa") and quantidade == 25}
+        assert len(escoposNmais1) == 4, f"Escopos por thread incorretos: {rastreador.alertas}"
+        print(f"  ✓ {insercoes} INSERTs, {listagens} listagens e um escopo por thread")
+        
+        # Métricas
+        print("\n✓ Verificando métricas...")
+        metricas = pool.metricas
+        assert metricas['checkouts'] > 0, "Nenhum checkout registrado"
+        assert metricas['leitoresCriados'] <= 2, "Pool criou mais leitores que o limite"
+        assert metricas['leitoresEmUso'] == 0 and not metricas['escritorEmUso'], "Conexão não devolvida"
+        print(f"  ✓ checkouts={metricas['checkouts']}, esperas={metricas['esperas']}, "
+              f"leitoresCriados={metricas['leitoresCriados']}")
+        
+        # Timeout quando todos os leitores estão em uso
+        print("\n✓ Verificando timeout...")
+        poolPequeno = PoolConexoes(os.path.join(diretorio.name, 'pool.db'), tamanhoLeitores=1, timeout=0.1)
+        try:
+            with poolPequeno.leitor():
+                try:
+                    poolPequeno.obterLeitor()
+                    raise AssertionError("Checkout além do limite foi aceito")
+                except TimeoutError:
+                    print("  ✓ TimeoutError com o pool esgotado")
+            assert poolPequeno.metricas['timeouts'] == 1, "Timeout não registrado nas métricas"
+        finally:
+            poolPequeno.fechar()
+        
+        print("\n✅ TESTE 8 PASSOU - Pool de Conexões OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 8 FALHOU: {e}\n")
+        return False
+    finally:
+        pool.fechar()
+        diretorio.cleanup()
+
+
+def testarPaginacao(db):
+    """Testa iterarTodas (streaming) e listarPagina (keyset) do PessoaDAO"""
+    print("=" * 60)
+    print("TESTE 9: Paginação e Iteração")
+    print("=" * 60)
+    
+    pessoaDao = PessoaDAO(db)
+    
+    try:
+        categoria = Categoria(id=None, nome="Paginação")
+        CategoriaDAO(db).salvar(categoria)
+        # Nomes repetidos: o desempate da ordenação é pelo id
+        pessoaDao.salvarEmLote(
+            Pessoa(id=None, nome=f"Pessoa {i % 10:02d}", categoria=categoria,
+                   email=f"pagina{i}@example.com")
+            for i in range(45)
+        )
+        esperado = [p.id for p in sorted(pessoaDao.listarTodas(), key=lambda p: (p.nome, p.id))]
+        
+        print("\n✓ Verificando iterarTodas...")
+        iterados = [p.id for p in pessoaDao.iterarTodas(tamanhoLote=7)]
+        assert iterados == esperado, "iterarTodas retornou ordem/quantidade diferente"
+        print(f"  ✓ {len(iterados)} pessoas em lotes de 7")
+        
+        print("\n✓ Verificando iterarSemUsuario...")
+        comUsuario = pessoaDao.buscarPorId(esperado[3])
+        UsuarioDAO(db).salvar(Usuario(id=None, login="paginacao", senha="123", tipo="aluno", pessoa=comUsuario))
+        semUsuario = [p.id for p in pessoaDao.iterarSemUsuario(tamanhoLote=7)]
+        assert semUsuario == [id for id in esperado if id != comUsuario.id], "iterarSemUsuario incorreto"
+        print(f"  ✓ {len(semUsuario)} pessoas sem usuário, em uma consulta")
+        
+        print("\n✓ Verificando listarPagina...")
+        paginados = []
+        ultima = None
+        while True:
+            if ultima is None:
+                pagina = pessoaDao.listarPagina(limite=10)
+            else:
+                pagina = pessoaDao.listarPagina(ultima.nome, ultima.id, 10)
+            paginados.extend(p.id for p in pagina)
+            if len(pagina) < 10:
+                break
+            ultima = pagina[-1]
+        assert paginados == esperado, "Páginas repetiram ou pularam pessoas"
+        assert pessoaDao.contar() == 45, "contar() incorreto"
+        print(f"  ✓ {len(paginados)} pessoas em páginas de 10, sem repetições")
+        
+        print("\n✓ Verificando listarPaginaSemUsuario...")
+        paginados = []
+        ultima = None
+        while True:
+            if ultima is None:
+                pagina = pessoaDao.listarPaginaSemUsuario(limite=10)
+            else:
+                pagina = pessoaDao.listarPaginaSemUsuario(ultima.nome, ultima.id, 10)
+            paginados.extend(p.id for p in pagina)
+            if len(pagina) < 10:
+                break
+            ultima = pagina[-1]
+        assert paginados == semUsuario, "Páginas de pessoas sem usuário incorretas"
+        print(f"  ✓ {len(paginados)} pessoas sem usuário em páginas de 10")
+        
+        print("\n✅ TESTE 9 PASSOU - Paginação OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 9 FALHOU: {e}\n")
+        return False
+
+
+def testarBuscaFts():
+    """Testa a busca por nome com FTS5 (prefixo, acentos e sincronização por triggers)"""
+    print("=" * 60)
+    print("TESTE 10: Busca com FTS5")
+    print("=" * 60)
+    
+    diretorio = tempfile.TemporaryDirectory()
+    caminho = os.path.join(diretorio.name, 'fts.db')
+    db = DatabaseConnection(caminho, fts=True)
+    try:
+        db.criarTabelas()
+        if not db.ftsAtivo:
+            print("  ⚠️  SQLite sem FTS5: buscas usam LIKE, nada a verificar")
+            return True
+        
+        pessoaDao = PessoaDAO(db)
+        categoria = Categoria(id=None, nome="Busca")
+        CategoriaDAO(db).salvar(categoria)
+        pessoaDao.salvar(Pessoa(id=None, nome="João da Silva", categoria=categoria, email="jsilva@example.com"))
+        maria = Pessoa(id=None, nome="Maria Souza", categoria=categoria, email="maria@example.com")
+        pessoaDao.salvar(maria)
+        
+        print("\n✓ Verificando busca por prefixo e sem acento...")
+        assert [p.nome for p in pessoaDao.buscarPorNome("joao sil")] == ["João da Silva"], "Busca por prefixo falhou"
+        assert len(pessoaDao.buscarPorNome("")) == 2, "Busca vazia deveria listar todas"
+        print("  ✓ 'joao sil' encontra 'João da Silva'")
+        
+        print("\n✓ Verificando sincronização após UPDATE e DELETE...")
+        maria.nome = "Ana Paula"
+        pessoaDao.salvar(maria)
+        assert not pessoaDao.buscarPorNome("maria"), "Nome antigo continua no índice"
+        assert [p.id for p in pessoaDao.buscarPorNome("ana")] == [maria.id], "Nome novo não foi indexado"
+        assert [p.id for p in pessoaDao.buscarTexto("maria")] == [maria.id], "Email não foi indexado"
+        pessoaDao.deletar(maria)
+        assert not pessoaDao.buscarPorNome("ana"), "Pessoa removida continua no índice"
+        print("  ✓ Triggers mantêm o índice em dia")
+        db.fechar()
+        
+        print("\n✓ Verificando banco aberto com fts=False...")
+        def objetosFts():
+            cur = db.cursor()
+            cur.execute("SELECT name FROM sqlite_master WHERE name LIKE 'pessoa_fts%' OR name LIKE 'disciplina_fts%';")
+            return [row['name'] for row in cur.fetchall()]
+        db = DatabaseConnection(caminho)
+        db.criarTabelas()
+        assert len(objetosFts()) > 0, "Índices FTS5 removidos por uma conexão com fts=False"
+        pessoaDao = PessoaDAO(db)
+        pessoaDao.salvar(Pessoa(id=None, nome="Joana Lima", categoria=categoria, email="joana@example.com"))
+        assert [p.nome for p in pessoaDao.buscarPorNome("Joana")] == ["Joana Lima"], "Busca com LIKE falhou"
+        print("  ✓ Índices mantidos e sincronizados para as conexões com fts=True")
+        
+        print("\n✓ Verificando remoção explícita...")
+        comFts = DatabaseConnection(caminho, fts=True)
+        try:
+            assert [p.nome for p in PessoaDAO(comFts).buscarPorNome("joana")] == ["Joana Lima"], \
+                "Pessoa salva com fts=False não foi indexada"
+            assert db.removerRecurso('fts'), "Recurso deveria estar instalado"
+            assert objetosFts() == [], f"Índices FTS5 não removidos: {objetosFts()}"
+            assert not comFts.ftsAtivo, "Conexão aberta continua usando os índices removidos"
+            assert [p.nome for p in PessoaDAO(comFts).buscarPorNome("Joana")] == ["Joana Lima"], \
+                "Busca sem os índices falhou"
+            assert not db.removerRecurso('fts'), "Recurso já removido"
+        finally:
+            comFts.fechar()
+        print("  ✓ removerRecurso remove os índices; conexões abertas voltam ao LIKE")
+        db.fechar()
+        
+        novo = DatabaseConnection(os.path.join(diretorio.name, 'sem_fts.db'))
+        try:
+            novo.criarTabelas()
+            cur = novo.cursor()
+            cur.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'pessoa_fts%';")
+            assert cur.fetchone()[0] == 0, "Banco novo com fts=False tem triggers FTS5"
+        finally:
+            novo.fechar()
+        
+        db = DatabaseConnection(caminho, fts=True)
+        db.criarTabelas()
+        assert [p.nome for p in PessoaDAO(db).buscarPorNome("joana")] == ["Joana Lima"], \
+            "Linhas gravadas sem FTS5 não foram indexadas ao reativar"
+        print("  ✓ Sem objetos FTS5 com fts=False; ao reativar, o índice é refeito")
+        
+        print("\n✅ TESTE 10 PASSOU - Busca com FTS5 OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 10 FALHOU: {e}\n")
+        return False
+    finally:
+        db.fechar()
+        diretorio.cleanup()
+
+
+def testarVinculosEmLote(db):
+    """Testa vincularPessoasEmLote e sincronizarVinculos (pessoa_disciplina)"""
+    print("=" * 60)
+    print("TESTE 11: Vínculos em Lote")
+    print("=" * 60)
+    
+    disciplinaDao = DisciplinaDAO(db)
+    
+    try:
+        categoria = Categoria(id=None, nome="Turma")
+        CategoriaDAO(db).salvar(categoria)
+        pessoas = [Pessoa(id=None, nome=f"Aluno {i}", categoria=categoria, email=f"aluno{i}@example.com")
+                   for i in range(10)]
+        PessoaDAO(db).salvarEmLote(pessoas)
+        disciplina = Disciplina(id=None, nome="Turma em Lote", cargaHoraria=40)
+        disciplinaDao.salvar(disciplina)
+        
+        def vinculados():
+            return {p.id for p in disciplinaDao.buscarPessoasPorDisciplina(disciplina.id)}
+        
+        print("\n✓ Verificando vincularPessoasEmLote...")
+        assert disciplinaDao.vincularPessoa(pessoas[0], disciplina), "Vínculo simples falhou"
+        assert not disciplinaDao.vincularPessoa(pessoas[0], disciplina), "Vínculo duplicado aceito"
+        adicionados = disciplinaDao.vincularPessoasEmLote(disciplina, pessoas[:6], tamanhoLote=4)
+        assert adicionados == 5, f"Esperado 5 vínculos novos, obtido {adicionados}"
+        assert vinculados() == {p.id for p in pessoas[:6]}, "Vínculos em lote incorretos"
+        print(f"  ✓ {adicionados} vínculos criados, o já existente foi ignorado")
+        
+        print("\n✓ Verificando sincronizarVinculos...")
+        desejados = {p.id for p in pessoas[4:]}
+        adicionados, removidos = disciplinaDao.sincronizarVinculos(disciplina, desejados)
+        assert (adicionados, removidos) == (4, 4), f"Esperado (4, 4), obtido {(adicionados, removidos)}"
+        assert vinculados() == desejados, "Sincronização incorreta"
+        assert disciplinaDao.sincronizarVinculos(disciplina, desejados) == (0, 0), "Sincronização não é idempotente"
+        print("  ✓ 4 adicionados, 4 removidos")
+        
+        print("\n✓ Verificando ids existentes e vínculo por id...")
+        ids = [p.id for p in pessoas[:3]] + [99998, 99999]
+        assert disciplinaDao.vincularPessoasEmLote(disciplina, []) == 0, "Lote vazio vinculou"
+        assert PessoaDAO(db).idsExistentes(ids, tamanhoLote=2) == set(ids[:3]), "idsExistentes incorreto"
+        assert disciplinaDao.vincularPessoasEmLote(disciplina, ids[:3]) == 3, "Vínculo por id falhou"
+        desejados |= set(ids[:3])
+        assert vinculados() == desejados, "Vínculos por id incorretos"
+        print("  ✓ Inexistentes filtrados em uma consulta, 3 vínculos por id")
+        
+        print("\n✓ Verificando rollback do lote...")
+        try:
+            disciplinaDao.vincularPessoasEmLote(
+                disciplina, pessoas[:2] + [Pessoa(id=99999, nome="X", categoria=categoria, email="x@x")])
+            raise AssertionError("Pessoa inexistente foi vinculada")
+        except sqlite3.IntegrityError:
+            pass
+        assert vinculados() == desejados, "Lote com erro não foi desfeito"
+        print("  ✓ Lote com pessoa inexistente desfeito por inteiro")
+        
+        print("\n✅ TESTE 11 PASSOU - Vínculos em Lote OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 11 FALHOU: {e}\n")
+        return False
+
+
+def testarContadoresMatricula():
+    """Testa contarPorDisciplina, estatisticasCargaHoraria e a coluna total_matriculados"""
+    print("=" * 60)
+    print("TESTE 12: Contadores de Matrícula")
+    print("=" * 60)
+    
+    diretorio = tempfile.TemporaryDirectory()
+    caminho = os.path.join(diretorio.name, 'contadores.db')
+    db = DatabaseConnection(caminho)
+    try:
+        # Banco de uma versão anterior aos contadores (migrações 1 a 3), já com vínculos
+        migrar(db, MIGRACOES[:3])
+        categoria = Categoria(id=None, nome="Turma")
+        CategoriaDAO(db).salvar(categoria)
+        pessoas = [Pessoa(id=None, nome=f"Aluno {i}", categoria=categoria, email=f"aluno{i}@example.com")
+                   for i in range(5)]
+        PessoaDAO(db).salvarEmLote(pessoas)
+        python = Disciplina(id=None, nome="Python", cargaHoraria=60)
+        sqlite = Disciplina(id=None, nome="SQLite", cargaHoraria=40)
+        vazia = Disciplina(id=None, nome="Vazia")
+        disciplinaDao = DisciplinaDAO(db)
+        disciplinaDao.salvarEmLote([python, sqlite, vazia])
+        disciplinaDao.vincularPessoasEmLote(python, pessoas)
+        disciplinaDao.vincularPessoasEmLote(sqlite, pessoas[:2])
+        esperado = {python.id: 5, sqlite.id: 2, vazia.id: 0}
+        
+        print("\n✓ Verificando contarPorDisciplina (GROUP BY)...")
+        assert disciplinaDao.contarPorDisciplina() == esperado, "Contagem incorreta"
+        assert disciplinaDao.contarPorDisciplina([sqlite.id]) == {sqlite.id: 2}, "Filtro por ids incorreto"
+        print("  ✓ Contagens OK")
+        
+        print("\n✓ Verificando estatisticasCargaHoraria...")
+        estatisticas = {linha['nome']: linha for linha in disciplinaDao.estatisticasCargaHoraria()}
+        assert estatisticas['Python']['horasTotais'] == 300, "Horas totais incorretas"
+        assert estatisticas['Vazia']['matriculados'] == 0, "Disciplina sem vínculos deveria ter 0"
+        print("  ✓ Estatísticas OK")
+        
+        print("\n✓ Verificando migração da coluna total_matriculados...")
+        versoes = [versao for versao, _, _ in migrar(db)]
+        assert versoes == [4], f"Migração da coluna não executada: {versoes}"
+        cur = db.cursor()
+        cur.execute("SELECT id, total_matriculados FROM disciplina;")
+        assert {row[0]: row[1] for row in cur.fetchall()} == esperado, "Coluna não foi preenchida"
+        print("  ✓ Coluna adicionada e preenchida com os vínculos existentes")
+        db.fechar()
+        
+        print("\n✓ Verificando total_matriculados mantido por triggers...")
+        db = DatabaseConnection(caminho, contadores=True)
+        assert not db.contadoresAtivos, "Contadores ativos antes de criarTabelas"
+        assert db.criarTabelas() == [], "Nenhuma migração pendente"
+        disciplinaDao = DisciplinaDAO(db)
+        assert db.contadoresAtivos, "Contadores não foram criados"
+        assert disciplinaDao.contarPorDisciplina() == esperado, "Vínculos existentes não foram contados"
+        disciplinaDao.sincronizarVinculos(sqlite, {pessoas[3].id, pessoas[4].id, pessoas[0].id})
+        PessoaDAO(db).deletar(pessoas[4])  # ON DELETE CASCADE também atualiza os contadores
+        assert disciplinaDao.contarPorDisciplina() == {python.id: 4, sqlite.id: 2, vazia.id: 0}, \
+            "Triggers não atualizaram total_matriculados"
+        estatisticas = {linha['nome']: linha for linha in disciplinaDao.estatisticasCargaHoraria()}
+        assert estatisticas['Python']['horasTotais'] == 240, "Estatísticas não usaram os contadores"
+        print("  ✓ Contadores atualizados por INSERT, DELETE e CASCADE")
+        db.fechar()
+        
+        print("\n✓ Verificando remoção explícita dos triggers...")
+        def triggers():
+            cur = db.cursor()
+            cur.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'pessoa_disciplina';")
+            return [row['name'] for row in cur.fetchall()]
+        db = DatabaseConnection(caminho)
+        db.criarTabelas()
+        assert len(triggers()) == 2, "Triggers removidos por uma conexão com contadores=False"
+        comContadores = DatabaseConnection(caminho, contadores=True)
+        try:
+            assert comContadores.contadoresAtivos, "Contadores deveriam estar ativos"
+            assert db.removerRecurso('contadores'), "Recurso deveria estar instalado"
+            assert triggers() == [], f"Triggers não removidos: {triggers()}"
+            disciplinaDao = DisciplinaDAO(db)
+            disciplinaDao.desvincularPessoa(pessoas[1], python)  # Sem triggers: total_matriculados fica desatualizada
+            assert disciplinaDao.contarPorDisciplina()[python.id] == 3, "Contagem por GROUP BY incorreta"
+            # A conexão aberta com contadores=True não pode ler a coluna desatualizada
+            assert DisciplinaDAO(comContadores).contarPorDisciplina()[python.id] == 3, \
+                "Contagem lida de total_matriculados sem os triggers"
+            estatisticas = {linha['nome']: linha for linha in DisciplinaDAO(comContadores).estatisticasCargaHoraria()}
+            assert estatisticas['Python']['matriculados'] == 3, "Estatísticas lidas de total_matriculados sem os triggers"
+        finally:
+            comContadores.fechar()
+        db.fechar()
+        
+        db = DatabaseConnection(caminho, contadores=True)
+        assert db.criarTabelas() == [], "Nenhuma migração pendente"
+        assert db.contadoresAtivos and len(triggers()) == 2, "Triggers não foram recriados"
+        assert DisciplinaDAO(db).contarPorDisciplina()[python.id] == 3, "Contadores não foram recalculados"
+        print("  ✓ Triggers removidos e, ao reativar, recriados com os contadores recalculados")
+        
+        print("\n✅ TESTE 12 PASSOU - Contadores de Matrícula OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 12 FALHOU: {e}\n")
+        return False
+    finally:
+        db.fechar()
+        diretorio.cleanup()
+
+
+def testarMigracoes():
+    """Testa o controle de versão do esquema (PRAGMA user_version)"""
+    print("=" * 60)
+    print("TESTE 13: Migrações")
+    print("=" * 60)
+    
+    diretorio = tempfile.TemporaryDirectory()
+    db = DatabaseConnection(os.path.join(diretorio.name, 'migracoes.db'))
+    try:
+        print("\n✓ Verificando banco novo...")
+        executadas = db.criarTabelas()
+        assert [versao for versao, _, _ in executadas] == [m.versao for m in MIGRACOES], "Migrações não executadas"
+        assert versaoAtual(db) == MIGRACOES[-1].versao, "user_version não foi atualizado"
+        assert db.criarTabelas() == [], "Migrações executadas duas vezes"
+        print(f"  ✓ Versão {versaoAtual(db)}, {len(executadas)} migrações com tempo medido")
+        
+        categoria = Categoria(id=None, nome="Migração")
+        CategoriaDAO(db).salvar(categoria)
+        PessoaDAO(db).salvarEmLote(
+            Pessoa(id=None, nome=f"Pessoa {i}", categoria=categoria, email=f"migracao{i}@example.com")
+            for i in range(25)
+        )
+        
+        print("\n✓ Verificando coluna nova com preenchimento em partes...")
+        def adicionarColuna(db):
+            db.cursor().execute("ALTER TABLE pessoa ADD COLUMN email_normalizado TEXT;")
+        
+        def preencherColuna(db):
+            assert preencherEmPartes(db, 'pessoa', "email_normalizado = lower(email)", tamanhoParte=10) == 25
+        
+        novas = MIGRACOES + [
+            Migracao(100, "Coluna email_normalizado", adicionarColuna),
+            Migracao(101, "Preencher email_normalizado", preencherColuna, emPartes=True),
+        ]
+        assert [versao for versao, _, _ in migrar(db, novas)] == [100, 101], "Migrações novas não executadas"
+        cur = db.cursor()
+        cur.execute("SELECT COUNT(*) FROM pessoa WHERE email_normalizado IS NULL;")
+        assert cur.fetchone()[0] == 0, "Preenchimento incompleto"
+        print("  ✓ Coluna adicionada e preenchida em 3 partes")
+
+        # As leituras por posição não podem enxergar a coluna nova no lugar de categoria_nome
+        db.identityMap.limpar()
+        pessoas = PessoaDAO(db).listarTodas()
+        assert all(p.categoria.nome == "Migração" for p in pessoas), "Categoria lida da coluna errada"
+        UsuarioDAO(db).salvar(Usuario(id=None, login="migracao", senha="123", tipo="aluno", pessoa=pessoas[0]))
+        db.identityMap.limpar()
+        usuario = UsuarioDAO(db).buscarPorLogin("migracao")
+        assert usuario.pessoa.email == pessoas[0].email, "Pessoa do usuário lida da coluna errada"
+        assert usuario.pessoa.categoria.nome == "Migração", "Categoria do usuário lida da coluna errada"
+        print("  ✓ Pessoas e usuários lidos corretamente com a coluna nova")
+
+        print("\n✓ Verificando migração com erro...")
+        def falhar(db):
+            db.cursor().execute("CREATE TABLE temporaria (id INTEGER);")
+            raise RuntimeError("falha simulada")
+        try:
+            migrar(db, novas + [Migracao(102, "Com erro", falhar)])
+            raise AssertionError("Erro da migração não foi propagado")
+        except RuntimeError:
+            pass
+        assert versaoAtual(db) == 101, "Versão avançou mesmo com erro"
+        cur.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'temporaria';")
+        assert cur.fetchone()[0] == 0, "Migração com erro não foi desfeita"
+        print("  ✓ Passo desfeito e versão mantida")
+        
+        print("\n✓ Verificando banco mais novo que o código...")
+        try:
+            migrar(db)
+            raise AssertionError("Banco mais novo foi aceito")
+        except RuntimeError:
+            print("  ✓ RuntimeError para versão desconhecida")
+        
+        print("\n✅ TESTE 13 PASSOU - Migrações OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 13 FALHOU: {e}\n")
+        return False
+    finally:
+        db.fechar()
+        diretorio.cleanup()
+
+
+def testarImportacaoExportacao():
+    """Testa a importação/exportação em CSV e JSONL (app/cli.py)"""
+    print("=" * 60)
+    print("TESTE 14: Importação e Exportação")
+    print("=" * 60)
+    
+    diretorio = tempfile.TemporaryDirectory()
+    db = DatabaseConnection(os.path.join(diretorio.name, 'cli.db'))
+    try:
+        db.criarTabelas()
+        servico = ArquivoService(db, saidaProgresso=io.StringIO())
+        
+        print("\n✓ Importando CSV em lotes...")
+        caminhoCsv = os.path.join(diretorio.name, 'pessoas.csv')
+        with open(caminhoCsv, 'w', encoding='utf-8') as arquivo:
+            arquivo.write("nome,email,altura,peso,data_nascimento,ativo,telefone,categoria\n")
+            for i in range(25):
+                arquivo.write(f"Pessoa {i},importada{i}@example.com,1.70,,2000-01-01,{i % 2},,Categoria {i % 3}\n")
+        assert servico.importar(caminhoCsv, 'pessoas', tamanhoLote=10) == 25, "Total importado incorreto"
+        pessoaDao = PessoaDAO(db)
+        assert pessoaDao.contar() == 25, "Pessoas não foram gravadas"
+        assert len(CategoriaDAO(db).listarTodas()) == 3, "Categorias não foram criadas pelo nome"
+        pessoa = pessoaDao.buscarPorId(pessoaDao.existeEmail("importada1@example.com"))
+        assert pessoa.ativo and pessoa.peso is None and pessoa.categoria.nome == "Categoria 1", "Conversão incorreta"
+        print("  ✓ 25 pessoas em 3 lotes, categorias criadas pelo nome")
+        
+        print("\n✓ Lote com erro não deixa categorias criadas...")
+        caminhoErro = os.path.join(diretorio.name, 'pessoas_erro.csv')
+        with open(caminhoErro, 'w', encoding='utf-8') as arquivo:
+            arquivo.write("nome,email,altura,peso,data_nascimento,ativo,telefone,categoria\n")
+            arquivo.write("Com Erro 1,erro1@example.com,1.70,,,1,,Categoria Órfã\n")
+            arquivo.write("Com Erro 2,erro2@example.com,alta,,,1,,Categoria Órfã\n")
+        try:
+            servico.importar(caminhoErro, 'pessoas')
+            raise AssertionError("Altura inválida foi importada")
+        except ValueError:
+            pass
+        assert CategoriaDAO(db).buscarPorNome("Categoria Órfã") is None, "Categoria do lote desfeito continua gravada"
+        assert pessoaDao.existeEmail("erro1@example.com") is None, "Pessoa do lote desfeito gravada"
+        print("  ✓ Categoria e pessoas do lote desfeitas juntas")
+        
+        print("\n✓ Exportando JSONL e reimportando (upsert)...")
+        saida = io.StringIO()
+        assert servico.exportar('pessoas', saida, 'jsonl', tamanhoLote=10) == 25, "Total exportado incorreto"
+        registros = [json.loads(linha) for linha in saida.getvalue().splitlines()]
+        assert {r['email'] for r in registros} == {f"importada{i}@example.com" for i in range(25)}, "Exportação incompleta"
+        caminhoJsonl = os.path.join(diretorio.name, 'pessoas.jsonl')
+        with open(caminhoJsonl, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(saida.getvalue())
+        assert servico.importar(caminhoJsonl, 'pessoas') == 25, "Reimportação falhou"
+        assert pessoaDao.contar() == 25, "Reimportação duplicou pessoas"
+        print("  ✓ Exportação e reimportação sem duplicar")
+
+        print("\n✓ Importando usuários com as pessoas resolvidas por lote...")
+        caminhoUsuarios = os.path.join(diretorio.name, 'usuarios.csv')
+        semEmail = pessoaDao.existeEmail("importada24@example.com")
+        with open(caminhoUsuarios, 'w', encoding='utf-8') as arquivo:
+            arquivo.write("id,login,senha,tipo,email\n")
+            for i in range(20):
+                arquivo.write(f",login{i},123,aluno,IMPORTADA{i}@example.com\n")
+            arquivo.write(f"{semEmail},login24,123,aluno,\n")
+        rastreador = db.ativarRastreamento()
+        assert servico.importar(caminhoUsuarios, 'usuarios', tamanhoLote=10) == 21, "Usuários não importados"
+        consultasPessoa = sum(e.execucoes for e in rastreador.estatisticas.values()
+                              if e.sql.startswith("SELECT") and "FROM pessoa" in e.sql)
+        assert consultasPessoa == 3, f"Esperada 1 consulta de pessoa por lote, obtidas {consultasPessoa}"
+        assert UsuarioDAO(db).buscarPorLogin("login24").pessoa.id == semEmail, "Pessoa pelo id incorreta"
+        assert UsuarioDAO(db).buscarPorLogin("login3").pessoa.email == "importada3@example.com", "Pessoa pelo email incorreta"
+        print(f"  ✓ 21 usuários em 3 lotes com {consultasPessoa} consultas de pessoa")
+
+        print("\n✅ TESTE 14 PASSOU - Importação e Exportação OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 14 FALHOU: {e}\n")
+        return False
+    finally:
+        db.fechar()
+        diretorio.cleanup()
+
+
+def testarRastreamentoSql():
+    """Testa o rastreador de comandos SQL (bd/rastreador.py)"""
+    print("=" * 60)
+    print("TESTE 15: Rastreamento SQL")
+    print("=" * 60)
+    
+    diretorio = tempfile.TemporaryDirectory()
+    db = DatabaseConnection(os.path.join(diretorio.name, 'rastreamento.db'), tamanhoIdentityMap=0)
+    try:
+        db.criarTabelas()
+        categoria = Categoria(id=None, nome="Rastreada")
+        CategoriaDAO(db).salvar(categoria)
+        pessoas = [Pessoa(id=None, nome=f"Pessoa {i}", email=f"rastreada{i}@example.com", categoria=categoria)
+                   for i in range(12)]
+        PessoaDAO(db).salvarEmLote(pessoas)
+        UsuarioDAO(db).salvarEmLote(Usuario(id=None, login=f"login{i:02d}", senha="x", tipo="aluno", pessoa=p)
+                                    for i, p in enumerate(pessoas))
+        
+        rastreador = db.ativarRastreamento()
+        
+        print("\n✓ Detectando N+1 e consultas repetidas dentro de um escopo...")
+        with db.escopo("listagem"):
+            for pessoa in pessoas:
+                PessoaDAO(db).buscarPorId(pessoa.id)
+            PessoaDAO(db).buscarPorId(pessoas[0].id)
+        # Usuários com a pessoa no mesmo JOIN: uma consulta, sem N+1
+        with db.escopo("usuarios"):
+            UsuarioDAO(db).listarPagina(limite=50)
+        alertas = {(tipo, escopo) for escopo, tipo, _, _ in rastreador.alertas}
+        assert ('n+1', 'listagem') in alertas, "N+1 de buscarPorId em laço não detectado"
+        assert ('repetida', 'listagem') in alertas, "Consulta idêntica repetida não detectada"
+        assert not any(escopo == 'usuarios' for _, escopo in alertas), "UsuarioDAO.listarPagina fez N+1"
+        print(f"  ✓ {len(rastreador.alertas)} alerta(s)")
+        
+        print("\n✓ Agregando pelo SQL normalizado, com linhas e origem...")
+        estatisticas = rastreador.estatisticas
+        porId = [e for e in estatisticas.values() if e.sql.startswith("SELECT") and "WHERE p.id = ?" in e.sql]
+        assert porId and porId[0].execucoes >= 12, "Consultas por id não foram agregadas"
+        assert porId[0].linhas == porId[0].execucoes, "Linhas lidas incorretas"
+        assert any(origem.startswith(os.path.join("dao", "pessoa_dao.py")) for origem in porId[0].origens), \
+            "Origem deveria ser o DAO"
+        
+        with db.transacao():
+            PessoaDAO(db).deletar(pessoas[-1])
+        assert "BEGIN" in rastreador.estatisticas, "BEGIN de transacao() não registrado"
+        assert "RASTREAMENTO SQL" in rastreador.relatorio(topN=3), "Relatório vazio"
+        print("  ✓ Estatísticas, transações e relatório OK")
+        
+        print("\n✓ Verificando parâmetros das execuções lentas...")
+        for mostrar in (False, True):
+            # limiarLentaMs=0: toda execução entra na lista de lentas
+            rastreador = db.ativarRastreamento(RastreadorSql(limiarLentaMs=0, mostrarParametros=mostrar))
+            pessoa = Pessoa(id=None, nome="Sigilosa", email=f"sigilosa{int(mostrar)}@example.com", categoria=categoria)
+            PessoaDAO(db).salvar(pessoa)
+            UsuarioDAO(db).salvar(Usuario(id=None, login=f"sigiloso{int(mostrar)}", senha="senha-secreta",
+                                          tipo="aluno", pessoa=pessoa))
+            relatorio = rastreador.relatorio(topN=100)
+            assert ("senha-secreta" in relatorio) == mostrar, f"mostrarParametros={mostrar} não respeitado"
+            assert "parâmetro(s)" in relatorio or mostrar, "Quantidade de parâmetros não exibida"
+        print("  ✓ Valores omitidos por padrão, exibidos com mostrarParametros=True")
+        
+        print("\n✅ TESTE 15 PASSOU - Rastreamento SQL OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 15 FALHOU: {e}\n")
+        return False
+    finally:
+        db.fechar()
+        diretorio.cleanup()
+
+
+def testarDaoAssincrono():
+    """Testa os DAOs async sobre o ExecutorBanco (dao/assincrono.py)"""
+    print("=" * 60)
+    print("TESTE 16: DAOs Assíncronos")
+    print("=" * 60)
+    
+    diretorio = tempfile.TemporaryDirectory()
+    dbPath = os.path.join(diretorio.name, 'assincrono.db')
+    db = DatabaseConnection(dbPath)
+    db.criarTabelas()
+    db.fechar()
+    executor = ExecutorBanco(DatabaseConnection(dbPath))
+    
+    async def cenario():
+        categoriaDao = CategoriaDAOAssincrono(executor)
+        pessoaDao = PessoaDAOAssincrono(executor)
+        categoria = Categoria(id=None, nome="Async")
+        await categoriaDao.salvar(categoria)
+        
+        print("\n✓ Escritas simultâneas agrupadas...")
+        pessoas = [Pessoa(id=None, nome=f"Async {i:02d}", email=f"async{i}@example.com", categoria=categoria)
+                   for i in range(30)]
+        duplicada = Pessoa(id=None, nome="Duplicada", email="async0@example.com", categoria=categoria)
+        resultados = await asyncio.gather(*(pessoaDao.salvar(p) for p in pessoas + [duplicada]),
+                                          return_exceptions=True)
+        assert all(isinstance(r, int) for r in resultados[:30]), "Escritas válidas deveriam ser gravadas"
+        assert isinstance(resultados[30], sqlite3.IntegrityError), "Email duplicado deveria falhar sozinho"
+        metricas = executor.metricas
+        assert metricas['transacoes'] < metricas['escritas'], "Escritas não foram agrupadas"
+        print(f"  ✓ {metricas['escritas']} escritas em {metricas['transacoes']} transações, 1 erro isolado")
+        
+        print("\n✓ Leituras simultâneas e iteração...")
+        encontradas = await asyncio.gather(*(pessoaDao.buscarPorId(p.id) for p in pessoas))
+        assert [p.email for p in encontradas] == [p.email for p in pessoas], "Leituras incorretas"
+        assert await pessoaDao.contar() == 30, "Contagem incorreta"
+        nomes = [p.nome async for p in pessoaDao.iterarTodas(tamanhoLote=7)]
+        assert nomes == sorted(p.nome for p in pessoas), "iterarTodas async incorreto"
+        print("  ✓ buscarPorId, contar e iterarTodas")
+        
+        print("\n✓ Ciclo desfeito por inteiro (COMMIT recusado)...")
+        def fkAdiadaInvalida():
+            # Com a FK adiada, a violação só aparece no COMMIT do ciclo
+            cur = executor.db.cursor()
+            cur.execute("PRAGMA defer_foreign_keys = ON;")
+            cur.execute("INSERT INTO pessoa (nome, email, categoria_id) VALUES (?, ?, ?);",
+                        ("Sem Categoria", "sem.categoria@example.com", 999999))
+        
+        executor.enviar(time.sleep, 0.1)  # Segura a thread: os pedidos seguintes entram no mesmo ciclo
+        desfeitas = [Pessoa(id=None, nome=f"Desfeita {i}", email=f"desfeita{i}@example.com", categoria=categoria)
+                     for i in range(3)]
+        resultados = await asyncio.gather(pessoaDao.salvar(desfeitas[0]), pessoaDao.salvarEmLote(desfeitas[1:2]),
+                                          executor.executar(fkAdiadaInvalida, escrita=True),
+                                          pessoaDao.salvar(desfeitas[2]), return_exceptions=True)
+        assert all(isinstance(r, sqlite3.IntegrityError) for r in resultados), f"Escritas desfeitas sem erro: {resultados}"
+        assert all(p.id is None for p in desfeitas), "Ids de escritas desfeitas continuam nos objetos"
+        assert await pessoaDao.contar() == 30, "Escritas do ciclo desfeito foram gravadas"
+        print("  ✓ Todas as escritas do ciclo falharam e os ids atribuídos foram desfeitos")
+        
+        print("\n✓ Escrita desfeita em um ciclo confirmado...")
+        def salvarEFalhar(pessoa):
+            # O id é atribuído dentro do SAVEPOINT da escrita, que é desfeito
+            PessoaDAO(executor.db).salvar(pessoa)
+            raise RuntimeError("falha simulada")
+        
+        executor.enviar(time.sleep, 0.1)
+        falha = Pessoa(id=None, nome="Falha", email="falha@example.com", categoria=categoria)
+        gravada = Pessoa(id=None, nome="Gravada", email="gravada@example.com", categoria=categoria)
+        resultados = await asyncio.gather(executor.executar(salvarEFalhar, falha, escrita=True),
+                                          pessoaDao.salvar(gravada), return_exceptions=True)
+        assert isinstance(resultados[0], RuntimeError) and isinstance(resultados[1], int), f"Resultados: {resultados}"
+        assert falha.id is None, "Id da escrita desfeita continua no objeto após o COMMIT do ciclo"
+        assert gravada.id is not None and await pessoaDao.contar() == 31, "Escrita válida do ciclo perdida"
+        print("  ✓ Só a escrita que falhou perdeu o id")
+    
+    try:
+        asyncio.run(cenario())
+        executor.fechar()
+        
+        # A API síncrona continua igual e enxerga o que foi gravado
+        db = DatabaseConnection(dbPath)
+        assert PessoaDAO(db).contar() == 31, "Dados gravados pelo executor não encontrados"
+        db.fechar()
+        
+        print("\n✅ TESTE 16 PASSOU - DAOs Assíncronos OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 16 FALHOU: {e}\n")
+        return False
+    finally:
+        executor.fechar()
+        diretorio.cleanup()
+
+
+def testarCacheCategorias():
+    """Testa o cache da tabela categoria compartilhado pelo processo (bd/cache_tabela.py)"""
+    print("=" * 60)
+    print("TESTE 17: Cache de Categorias")
+    print("=" * 60)
+    
+    diretorio = tempfile.TemporaryDirectory()
+    dbPath = os.path.join(diretorio.name, 'cache.db')
+    db1 = DatabaseConnection(dbPath, tamanhoIdentityMap=0)
+    db2 = DatabaseConnection(dbPath, tamanhoIdentityMap=0)
+    try:
+        db1.criarTabelas()
+        dao1, dao2 = CategoriaDAO(db1), CategoriaDAO(db2)
+        assert dao1.cache is dao2.cache, "Conexões ao mesmo arquivo deveriam compartilhar o cache"
+        dao1.salvarEmLote([Categoria(id=None, nome=f"Cat {i}") for i in range(5)])
+        
+        print("\n✓ Tabela carregada uma vez e consultada por id e nome...")
+        antes = dao1.cache.estatisticas
+        categoria = dao1.buscarPorNome("Cat 3")
+        assert dao2.buscarPorId(categoria.id).nome == "Cat 3", "Busca por id incorreta"
+        assert dao2.buscarPorNome("Inexistente") is None, "Categoria inexistente encontrada"
+        assert [c.nome for c in dao2.listarTodas()] == [f"Cat {i}" for i in range(5)], "listarTodas incorreto"
+        depois = dao1.cache.estatisticas
+        assert depois['falhas'] - antes['falhas'] == 1 and depois['acertos'] - antes['acertos'] == 3, \
+            f"Acertos/falhas inesperados: {depois}"
+        print(f"  ✓ {depois}")
+        
+        print("\n✓ Alterações de outra conexão invalidam o cache...")
+        categoria.nome = "Cat 3 renomeada"
+        dao1.salvar(categoria)
+        assert dao2.buscarPorId(categoria.id).nome == "Cat 3 renomeada", "Cache não foi invalidado pelo salvar"
+        dao2.deletar(dao2.buscarPorNome("Cat 4"))
+        assert dao1.buscarPorNome("Cat 4") is None, "Cache não foi invalidado pelo deletar"
+        
+        print("\n✓ Alterações dentro de uma transação...")
+        try:
+            with db1.transacao():
+                dao1.salvar(Categoria(id=None, nome="Temporária"))
+                assert dao1.buscarPorNome("Temporária") is not None, "A própria conexão deveria ver a alteração"
+                assert dao2.buscarPorNome("Temporária") is None, "Outra conexão viu dado não confirmado"
+                raise RuntimeError("desfazer")
+        except RuntimeError:
+            pass
+        assert dao1.buscarPorNome("Temporária") is None and dao2.buscarPorNome("Temporária") is None, \
+            "Categoria desfeita continua no cache"
+        with db1.transacao():
+            dao1.salvar(Categoria(id=None, nome="Confirmada"))
+            dao2.listarTodas()  # Outra conexão recarrega antes do COMMIT
+        assert dao2.buscarPorNome("Confirmada") is not None, "Cache não foi invalidado após o COMMIT"
+        
+        print("\n✓ TTL para alterações feitas fora dos DAOs...")
+        dao1.cache.ttl = 0.05
+        externa = sqlite3.connect(dbPath)
+        externa.execute("INSERT INTO categoria (nome) VALUES ('Externa');")
+        externa.commit()
+        externa.close()
+        assert dao1.buscarPorNome("Externa") is None, "Cache deveria estar válido antes do ttl"
+        time.sleep(0.06)
+        assert dao1.buscarPorNome("Externa") is not None, "Cache não expirou após o ttl"
+        
+        # Com identity map: a instância já carregada não pode esconder a alteração da outra conexão
+        db3 = DatabaseConnection(dbPath)
+        try:
+            dao3 = CategoriaDAO(db3)
+            antiga = dao3.buscarPorNome("Externa")
+            externa = sqlite3.connect(dbPath)
+            externa.execute("UPDATE categoria SET nome = 'Externa renomeada' WHERE id = ?;", (antiga.id,))
+            externa.commit()
+            externa.close()
+            time.sleep(0.06)
+            renomeada = dao3.buscarPorNome("Externa renomeada")
+            assert renomeada is antiga and renomeada.nome == "Externa renomeada", "Identity map escondeu a alteração"
+            assert dao3.buscarPorId(antiga.id).nome == "Externa renomeada", "buscarPorId com nome antigo"
+            assert "Externa" not in [c.nome for c in dao3.listarTodas()], "listarTodas com nome antigo"
+        finally:
+            db3.fechar()
+        dao1.cache.ttl = None
+        print("  ✓ Invalidação por salvar/deletar, transação e ttl (também com identity map)")
+        
+        print("\n✅ TESTE 17 PASSOU - Cache de Categorias OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 17 FALHOU: {e}\n")
+        return False
+    finally:
+        db1.fechar()
+        db2.fechar()
+        diretorio.cleanup()
+
+
+def testarBackupRestauracao():
+    """Testa o backup em passos e a restauração em arquivo e em memória (bd/backup.py)"""
+    print("=" * 60)
+    print("TESTE 18: Backup e Restauração")
+    print("=" * 60)
+    
+    diretorio = tempfile.TemporaryDirectory()
+    db = DatabaseConnection(os.path.join(diretorio.name, 'origem.db'))
+    memoria = None
+    try:
+        db.criarTabelas()
+        categoria = Categoria(id=None, nome="Backup")
+        CategoriaDAO(db).salvar(categoria)
+        PessoaDAO(db).salvarEmLote(
+            Pessoa(id=None, nome=f"Pessoa {i}", email=f"backup{i}@example.com", categoria=categoria)
+            for i in range(2000))
+        
+        print("\n✓ Backup comprimido em passos, com progresso...")
+        progresso = []
+        destino = os.path.join(diretorio.name, 'copia.db.gz')
+        info = fazerBackup(db, destino, paginasPorPasso=5, aoProgredir=lambda c, t: progresso.append((c, t)))
+        assert len(progresso) > 1 and progresso[-1] == (info['paginas'], info['paginas']), "Progresso incorreto"
+        with open(destino, 'rb') as arquivo:
+            assert arquivo.read(2) == b'\x1f\x8b', "Backup .gz não foi comprimido"
+        assert [f for f in os.listdir(diretorio.name) if f.startswith('.backup-')] == [], "Arquivo parcial ficou"
+        print(f"  ✓ {info['paginas']} páginas em {len(progresso)} passos, {info['bytes']} bytes")
+        
+        print("\n✓ Restaurando em memória...")
+        memoria = restaurarEmMemoria(destino)
+        assert PessoaDAO(memoria).contar() == 2000, "Pessoas não foram restauradas"
+        assert versaoAtual(memoria) == MIGRACOES[-1].versao, "Versão do esquema não foi restaurada"
+        assert CategoriaDAO(memoria).buscarPorNome("Backup") is not None, "Categoria não restaurada"
+        
+        print("\n✓ Restaurando sobre um banco em uso...")
+        pessoa = PessoaDAO(db).buscarPorId(1)
+        CategoriaDAO(db).salvar(Categoria(id=None, nome="Depois do backup"))
+        restaurar(destino, db)
+        assert CategoriaDAO(db).buscarPorNome("Depois do backup") is None, "Cache de categorias não foi invalidado"
+        assert PessoaDAO(db).buscarPorId(1) is not pessoa, "Identity map não foi limpo"
+        assert PessoaDAO(db).contar() == 2000, "Conteúdo não foi restaurado"
+        
+        try:
+            restaurar(os.path.join(diretorio.name, 'inexistente.db'), db)
+            assert False, "Deveria lançar FileNotFoundError"
+        except FileNotFoundError:
+            pass
+        print("  ✓ Restauração em memória e em arquivo")
+        
+        print("\n✅ TESTE 18 PASSOU - Backup e Restauração OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 18 FALHOU: {e}\n")
+        return False
+    finally:
+        if memoria is not None:
+            memoria.fechar()
+        db.fechar()
+        diretorio.cleanup()
+
+
+def testarFixturesMemoria():
+    """Testa bancos em memória, URIs file: e as cópias de ModeloBanco (bd/fixtures.py)"""
+    print("=" * 60)
+    print("TESTE 19: Bancos em Memória e Fixtures")
+    print("=" * 60)
+    
+    diretorio = tempfile.TemporaryDirectory()
+    abertos = []
+    
+    def abrir(dbPath, **opcoes):
+        db = DatabaseConnection(dbPath, **opcoes)
+        abertos.append(db)
+        return db
+    
+    try:
+        print("\n✓ Banco em memória compartilhado (cache=shared)...")
+        uri = 'file:teste_compartilhado?mode=memory&cache=shared'
+        db1, db2 = abrir(uri), abrir(uri)
+        db1.criarTabelas()
+        CategoriaDAO(db1).salvar(Categoria(id=None, nome="Compartilhada"))
+        assert CategoriaDAO(db2).buscarPorNome("Compartilhada") is not None, "Outra conexão não viu o banco"
+        assert CategoriaDAO(db1).cache is CategoriaDAO(db2).cache, "Conexões ao mesmo banco deveriam dividir o cache"
+        privado = abrir(':memory:')
+        privado.criarTabelas()
+        assert CategoriaDAO(privado).cache is not CategoriaDAO(abrir(':memory:')).cache, \
+            "Bancos ':memory:' diferentes não podem dividir o cache"
+        try:
+            PoolConexoes(uri)
+            assert False, "PoolConexoes deveria recusar banco em memória"
+        except ValueError:
+            pass
+        
+        print("\n✓ URI de arquivo com perfil readonly...")
+        caminho = os.path.join(diretorio.name, 'uri.db')
+        abrir(caminho).criarTabelas()
+        leitura = abrir(Path(caminho).as_uri(), perfil='readonly')
+        assert CategoriaDAO(leitura).listarTodas() == [], "Leitura pela URI falhou"
+        try:
+            CategoriaDAO(leitura).salvar(Categoria(id=None, nome="Recusada"))
+            assert False, "Escrita aceita em perfil readonly"
+        except sqlite3.OperationalError:
+            pass
+        
+        print("\n✓ Cópias de um modelo populado uma vez...")
+        chamadas = []
+        
+        def popular(db):
+            chamadas.append(db)
+            categoria = Categoria(id=None, nome="Modelo")
+            CategoriaDAO(db).salvar(categoria)
+            PessoaDAO(db).salvarEmLote(
+                Pessoa(id=None, nome=f"Pessoa {i}", email=f"modelo{i}@example.com", categoria=categoria)
+                for i in range(500))
+        
+        for modo in ('memoria', 'arquivo', 'compartilhado'):
+            with ModeloBanco(popular, modo=modo) as modelo:
+                copia1, copia2 = modelo.novoBanco(), modelo.novoBanco()
+                abertos += [copia1, copia2]
+                PessoaDAO(copia1).deletar(PessoaDAO(copia1).buscarPorId(1))
+                CategoriaDAO(copia1).salvar(Categoria(id=None, nome="Só na cópia 1"))
+                assert PessoaDAO(copia1).contar() == 499 and PessoaDAO(copia2).contar() == 500, \
+                    f"Cópias não são independentes ({modo})"
+                assert CategoriaDAO(copia2).buscarPorNome("Só na cópia 1") is None, f"Cache vazou entre cópias ({modo})"
+                if modo == 'compartilhado':
+                    assert PessoaDAO(abrir(copia1.dbPath)).contar() == 499, "Cópia compartilhada não visível"
+                assert modelo.copias == 2, "Contagem de cópias incorreta"
+            try:
+                modelo.novoBanco()
+                assert False, "Modelo fechado não deveria criar cópias"
+            except RuntimeError:
+                pass
+        assert len(chamadas) == 3, "popular deveria rodar uma vez por modelo"
+        print("  ✓ Modos memoria, arquivo e compartilhado")
+        
+        try:
+            ModeloBanco(modo='disco')
+            assert False, "Modo inválido foi aceito"
+        except ValueError:
+            pass
+        
+        print("\n✅ TESTE 19 PASSOU - Bancos em Memória e Fixtures OK\n")
+        return True
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"\n❌ TESTE 19 FALHOU: {e}\n")
+        return False
+    finally:
+        for db in abertos:
+            db.fechar()
+        diretorio.cleanup()
+
+
 def executarTestes():
     """Executa todos os testes"""
     print("\n" + "=" * 60)
     print("INICIANDO TESTES DO PROJETO SQLite+POO")
     print("=" * 60 + "\n")
     
-    # Caminho do banco de dados relativo ao diretório raiz do projeto
-    dbPath = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'exemplo_bd.db')
-    db = DatabaseConnection(dbPath)
+    # Esquema criado uma vez; cada grupo de testes recebe uma cópia em memória
+    print("📋 Criando banco modelo...")
+    modelo = ModeloBanco()
+    # Perfis precisam de um arquivo (readonly abre o arquivo com mode=ro) com alguma categoria
+    modeloArquivo = ModeloBanco(lambda modeloDb: CategoriaDAO(modeloDb).salvar(Categoria(id=None, nome="Perfis")),
+                                modo='arquivo')
+    print("✓ Tabelas OK\n")
+    db = modelo.novoBanco()
     resultados = []
     
     try:
-        db.conectar()
-        
-        # Criar tabelas
-        print("📋 Criando/verificando tabelas...")
-        db.criarTabelas()
-        print("✓ Tabelas OK\n")
-        
-        # Limpar banco para testes limpos
-        limparBanco(db)
-        
-        # Executar testes
+        # Executar testes (os testes 1 a 6 usam os dados criados pelos anteriores)
         resultados.append(("Categoria CRUD", testarCategoriaDao(db)))
         resultados.append(("Pessoa CRUD", testarPessoaDao(db)))
         resultados.append(("Integridade Referencial", testarIntegridadeReferencial(db)))
+        resultados.append(("Identity Map", testarIdentityMap(db)))
+        resultados.append(("Salvar em Lote", testarSalvarEmLote(db)))
+        resultados.append(("Transações", testarTransacao(db)))
+        resultados.append(("Perfis e Índices",
+                           executarComCopia(modeloArquivo, lambda copia: testarPerfisEIndices(copia, copia.dbPath))))
+        resultados.append(("Pool de Conexões", testarPoolConexoes()))
+        resultados.append(("Paginação", executarComCopia(modelo, testarPaginacao)))
+        resultados.append(("Busca FTS5", testarBuscaFts()))
+        resultados.append(("Vínculos em Lote", executarComCopia(modelo, testarVinculosEmLote)))
+        resultados.append(("Contadores de Matrícula", testarContadoresMatricula()))
+        resultados.append(("Migrações", testarMigracoes()))
+        resultados.append(("Importação e Exportação", testarImportacaoExportacao()))
+        resultados.append(("Rastreamento SQL", testarRastreamentoSql()))
+        resultados.append(("DAOs Assíncronos", testarDaoAssincrono()))
+        resultados.append(("Cache de Categorias", testarCacheCategorias()))
+        resultados.append(("Backup e Restauração", testarBackupRestauracao()))
+        resultados.append(("Bancos em Memória e Fixtures", testarFixturesMemoria()))
         
         # Resumo
         print("\n" + "=" * 60)
@@ -341,6 +1712,8 @@ def executarTestes():
         return False
     finally:
         db.fechar()
+        modelo.fechar()
+        modeloArquivo.fechar()
         print("✓ Conexão encerrada!")
 
 
@@ -1,35 +1,40 @@
+from threading import Lock
+
 from app.schemas.pessoas import PessoaCreate, PessoaOut, PessoaUpdate
 
 class PessoasRepository:
     def __init__(self) -> None:
-        self._dados: list[PessoaOut] = []
+        # Por id: get/update/delete em O(1), e o dict mantém a ordem de criação no list()
+        self._dados: dict[int, PessoaOut] = {}
         self._next_id = 1
+        # Rotas síncronas rodam em paralelo no threadpool do uvicorn
+        self._lock = Lock()
 
     def list(self) -> list[PessoaOut]:
-        return self._dados
+        with self._lock:
+            return list(self._dados.values())
 
     def get(self, pessoa_id: int) -> PessoaOut | None:
-        return next((p for p in self._dados if p.id == pessoa_id), None)
+        return self._dados.get(pessoa_id)
 
     def create(self, payload: PessoaCreate) -> PessoaOut:
-        pessoa = PessoaOut(id=self._next_id, **payload.model_dump())
-        self._dados.append(pessoa)
-        self._next_id += 1
+        with self._lock:
+            pessoa = PessoaOut(id=self._next_id, **payload.model_dump())
+            self._dados[pessoa.id] = pessoa
+            self._next_id += 1
         return pessoa
 
     def update(self, pessoa_id: int, payload: PessoaUpdate) -> PessoaOut | None:
-        atual = self.get(pessoa_id)
-        if not atual:
-            return None
-        data = atual.model_dump()
-        data.update({k: v for k, v in payload.model_dump().items() if v is not None})
-        nova = PessoaOut(**data)
-        self._dados[self._dados.index(atual)] = nova
+        with self._lock:
+            atual = self._dados.get(pessoa_id)
+            if not atual:
+                return None
+            data = atual.model_dump()
+            data.update({k: v for k, v in payload.model_dump().items() if v is not None})
+            nova = PessoaOut(**data)
+            self._dados[pessoa_id] = nova
         return nova
 
     def delete(self, pessoa_id: int) -> bool:
-        atual = self.get(pessoa_id)
-        if not atual:
-            return False
-        self._dados.remove(atual)
-        return True
+        with self._lock:
+            return self._dados.pop(pessoa_id, None) is not None
@@ -1,42 +1,88 @@
+from threading import Lock
+
+from app.repositories.trigram_index import TrigramIndex
 from app.schemas.pessoas import PessoaCreate, PessoaOut, PessoaUpdate
 
 class PessoasRepository:
     def __init__(self) -> None:
-        self._dados: list[PessoaOut] = []
+        # Por id: get/update/delete em O(1), e o dict mantém a ordem de criação no list()
+        self._dados: dict[int, PessoaOut] = {}
         self._next_id = 1
+        # Índices dos filtros: ids por valor de ativa e trigramas de nome e email
+        self._por_ativa: dict[bool, set[int]] = {True: set(), False: set()}
+        self._nomes = TrigramIndex()
+        self._emails = TrigramIndex()
+        # Rotas síncronas rodam em paralelo no threadpool do uvicorn
+        self._lock = Lock()
 
     def list(self, nome: str | None, email: str | None, ativa: bool | None) -> list[PessoaOut]:
-        dados = self._dados
-        if nome:
-            dados = [p for p in dados if nome.lower() in p.nome.lower()]
-        if email:
-            dados = [p for p in dados if email.lower() in p.email.lower()]
-        if ativa is not None:
-            dados = [p for p in dados if p.ativa is ativa]
-        return dados
+        nome = nome.lower() if nome else None
+        email = email.lower() if email else None
+        with self._lock:
+            conjuntos = []
+            if ativa is not None:
+                conjuntos.append(self._por_ativa[ativa])
+            if nome:
+                conjuntos += self._nomes.sets(nome)
+            if email:
+                conjuntos += self._emails.sets(email)
+            if conjuntos:
+                # Do menor para o maior: cada interseção percorre só o resultado parcial
+                conjuntos.sort(key=len)
+                candidatos = conjuntos[0]
+                for conjunto in conjuntos[1:]:
+                    if not candidatos:
+                        break
+                    candidatos = candidatos & conjunto
+                # ids crescem com a criação: ordenar os ids preserva a ordem do list()
+                ids = sorted(candidatos)
+            else:
+                ids = list(self._dados)
+            # Trigramas não garantem a substring (nem cobrem consultas com menos de 3 letras)
+            if nome:
+                ids = [i for i in ids if self._nomes.contains(i, nome)]
+            if email:
+                ids = [i for i in ids if self._emails.contains(i, email)]
+            return [self._dados[i] for i in ids]
 
     def get(self, pessoa_id: int) -> PessoaOut | None:
-        return next((p for p in self._dados if p.id == pessoa_id), None)
+        return self._dados.get(pessoa_id)
 
     def create(self, payload: PessoaCreate) -> PessoaOut:
-        pessoa = PessoaOut(id=self._next_id, **payload.model_dump())
-        self._dados.append(pessoa)
-        self._next_id += 1
+        with self._lock:
+            pessoa = PessoaOut(id=self._next_id, **payload.model_dump())
+            self._dados[pessoa.id] = pessoa
+            self._indexar(pessoa)
+            self._next_id += 1
         return pessoa
 
     def update(self, pessoa_id: int, payload: PessoaUpdate) -> PessoaOut | None:
-        atual = self.get(pessoa_id)
-        if not atual:
-            return None
-        data = atual.model_dump()
-        data.update({k: v for k, v in payload.model_dump().items() if v is not None})
-        nova = PessoaOut(**data)
-        self._dados[self._dados.index(atual)] = nova
+        with self._lock:
+            atual = self._dados.get(pessoa_id)
+            if not atual:
+                return None
+            data = atual.model_dump()
+            data.update({k: v for k, v in payload.model_dump().items() if v is not None})
+            nova = PessoaOut(**data)
+            self._desindexar(atual)
+            self._dados[pessoa_id] = nova
+            self._indexar(nova)
         return nova
 
     def delete(self, pessoa_id: int) -> bool:
-        atual = self.get(pessoa_id)
-        if not atual:
-            return False
-        self._dados.remove(atual)
+        with self._lock:
+            atual = self._dados.pop(pessoa_id, None)
+            if not atual:
+                return False
+            self._desindexar(atual)
         return True
+
+    def _indexar(self, pessoa: PessoaOut) -> None:
+        self._por_ativa[pessoa.ativa].add(pessoa.id)
+        self._nomes.add(pessoa.id, pessoa.nome)
+        self._emails.add(pessoa.id, pessoa.email)
+
+    def _desindexar(self, pessoa: PessoaOut) -> None:
+        self._por_ativa[pessoa.ativa].discard(pessoa.id)
+        self._nomes.remove(pessoa.id)
+        self._emails.remove(pessoa.id)
@@ -0,0 +1,33 @@
+VAZIO: frozenset[int] = frozenset()
+
+def trigramas(texto: str) -> set[str]:
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+class TrigramIndex:
+    """Índice de substring: para cada trigrama do texto (em minúsculas), os ids que o contêm"""
+    def __init__(self) -> None:
+        self._textos: dict[int, str] = {}
+        self._ids: dict[str, set[int]] = {}
+
+    def add(self, chave: int, texto: str) -> None:
+        texto = texto.lower()
+        self._textos[chave] = texto
+        for trigrama in trigramas(texto):
+            self._ids.setdefault(trigrama, set()).add(chave)
+
+    def remove(self, chave: int) -> None:
+        for trigrama in trigramas(self._textos.pop(chave)):
+            ids = self._ids[trigrama]
+            ids.discard(chave)
+            if not ids:
+                del self._ids[trigrama]
+
+    def sets(self, consulta: str) -> list[set[int] | frozenset[int]]:
+        """
+        Conjuntos de ids a intersectar para a consulta (em minúsculas): os candidatos
+        ainda precisam de contains(). Lista vazia se a consulta tem menos de 3 letras.
+        """
+        return [self._ids.get(trigrama, VAZIO) for trigrama in trigramas(consulta)]
+
+    def contains(self, chave: int, consulta: str) -> bool:
+        return consulta in self._textos[chave]
@@ -0,0 +1,110 @@
+"""
+Benchmark do PessoasRepository: latência de get/create/update/delete e dos filtros
+de list() por tamanho do repositório, comparada com a implementação anterior
+baseada em lista.
+Uso (na pasta Projeto2): python tests/benchmark_repository.py [tamanhos...]
+Padrão: 1000 10000 100000 1000000
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.repositories.pessoas_repository import PessoasRepository
+from app.schemas.pessoas import PessoaCreate, PessoaOut, PessoaUpdate
+
+REPETICOES = 200
+# A lista é O(n) por operação: menos repetições para não levar minutos em 1M
+REPETICOES_LISTA = 20
+
+class PessoasRepositoryLista:
+    """Implementação anterior (list[PessoaOut]), mantida só para comparação"""
+    def __init__(self) -> None:
+        self._dados: list[PessoaOut] = []
+        self._next_id = 1
+
+    def list(self, nome: str | None, email: str | None, ativa: bool | None) -> list[PessoaOut]:
+        dados = self._dados
+        if nome:
+            dados = [p for p in dados if nome.lower() in p.nome.lower()]
+        if email:
+            dados = [p for p in dados if email.lower() in p.email.lower()]
+        if ativa is not None:
+            dados = [p for p in dados if p.ativa is ativa]
+        return dados
+
+    def get(self, pessoa_id: int) -> PessoaOut | None:
+        return next((p for p in self._dados if p.id == pessoa_id), None)
+
+    def create(self, payload: PessoaCreate) -> PessoaOut:
+        pessoa = PessoaOut(id=self._next_id, **payload.model_dump())
+        self._dados.append(pessoa)
+        self._next_id += 1
+        return pessoa
+
+    def update(self, pessoa_id: int, payload: PessoaUpdate) -> PessoaOut | None:
+        atual = self.get(pessoa_id)
+        if not atual:
+            return None
+        data = atual.model_dump()
+        data.update({k: v for k, v in payload.model_dump().items() if v is not None})
+        nova = PessoaOut(**data)
+        self._dados[self._dados.index(atual)] = nova
+        return nova
+
+    def delete(self, pessoa_id: int) -> bool:
+        atual = self.get(pessoa_id)
+        if not atual:
+            return False
+        self._dados.remove(atual)
+        return True
+
+def payload(i: int) -> PessoaCreate:
+    # model_construct: a validação do payload acontece na rota, não no repositório
+    return PessoaCreate.model_construct(nome=f'Pessoa {i}', email=f'pessoa{i}@email.com',
+                                        telefone='11999999999', ativa=i % 3 != 0)
+
+def popular(repository, tamanho: int) -> None:
+    for i in range(tamanho):
+        repository.create(payload(i))
+
+def medir(funcao, repeticoes: int) -> float:
+    """Mediana em microssegundos"""
+    tempos = []
+    for n in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(n)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1e6
+
+def medir_repository(repository, tamanho: int, repeticoes: int) -> dict[str, float]:
+    aleatorio = random.Random(42)
+    # Ids do fim do repositório: o pior caso da busca linear
+    ids = [tamanho - aleatorio.randrange(tamanho // 10 + 1) for _ in range(repeticoes)]
+    excluidos = iter(range(tamanho, tamanho - repeticoes, -1))
+    return {
+        'get': medir(lambda n: repository.get(ids[n]), repeticoes),
+        'nome': medir(lambda n: repository.list(nome=f'PESSOA {ids[n]}', email=None, ativa=None), repeticoes),
+        'email+ativa': medir(lambda n: repository.list(nome=None, email=f'a{ids[n]}@', ativa=True), repeticoes),
+        'update': medir(lambda n: repository.update(ids[n], PessoaUpdate.model_construct(
+            nome=None, email=None, telefone=None, ativa=n % 2 == 0)), repeticoes),
+        'create': medir(lambda n: repository.create(payload(tamanho + n)), repeticoes),
+        'delete': medir(lambda n: repository.delete(next(excluidos)), repeticoes),
+    }
+
+def main(tamanhos: list[int]) -> None:
+    operacoes = ('get', 'nome', 'email+ativa', 'update', 'create', 'delete')
+    print(f"{'Registros':>10} {'Implementação':<14}" + ''.join(f'{op + " (µs)":>18}' for op in operacoes))
+    for tamanho in tamanhos:
+        for nome, classe, repeticoes in (('dict', PessoasRepository, REPETICOES),
+                                         ('lista', PessoasRepositoryLista, REPETICOES_LISTA)):
+            repository = classe()
+            popular(repository, tamanho)
+            resultado = medir_repository(repository, tamanho, repeticoes)
+            print(f'{tamanho:>10} {nome:<14}' + ''.join(f'{resultado[op]:>18.1f}' for op in operacoes))
+
+if __name__ == '__main__':
+    main([int(t) for t in sys.argv[1:]] or [1_000, 10_000, 100_000, 1_000_000])
@@ -9,3 +9,13 @@ def test_create_and_filter() -> None:
     filtered = client.get('/pessoas', params={'nome': 'Bruno'})
     assert filtered.status_code == 200
     assert len(filtered.json()) >= 1
+
+def test_filtros_substring_apos_patch() -> None:
+    payload = {'nome': 'Carla Trigrama', 'email': 'Carla.Trigrama@Email.com', 'telefone': '11988887777', 'ativa': True}
+    pessoa_id = client.post('/pessoas', json=payload).json()['id']
+    assert [p['id'] for p in client.get('/pessoas', params={'nome': 'la trig'}).json()] == [pessoa_id]
+    assert [p['id'] for p in client.get('/pessoas', params={'email': 'CARLA.T', 'ativa': True}).json()] == [pessoa_id]
+    assert client.patch(f'/pessoas/{pessoa_id}', json={'nome': 'Carla Renomeada', 'ativa': False}).status_code == 200
+    assert client.get('/pessoas', params={'nome': 'la trig'}).json() == []
+    assert [p['id'] for p in client.get('/pessoas', params={'nome': 'renomeada', 'ativa': False}).json()] == [pessoa_id]
+    assert client.get('/pessoas', params={'nome': 'renomeada', 'ativa': True}).json() == []
@@ -8,6 +8,12 @@ engine = create_engine(DATABASE_URL, connect_args=connect_args)
 
 def create_db_and_tables() -> None:
     SQLModel.metadata.create_all(engine)
+    # create_all não altera tabelas que já existem: cria os índices declarados
+    # depois (ex.: produto.nome e produto.preco) em bancos antigos
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
 
 def get_session() -> Generator[Session, None, None]:
     with Session(engine) as session:
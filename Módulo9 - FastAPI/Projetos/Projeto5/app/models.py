@@ -7,8 +7,8 @@ class Categoria(SQLModel, table=True):
 
 class Produto(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    nome: str
-    preco: float
+    nome: str = Field(index=True)
+    preco: float = Field(index=True)
     estoque: int
     ativo: bool = True
     categoria_id: int = Field(foreign_key='categoria.id')
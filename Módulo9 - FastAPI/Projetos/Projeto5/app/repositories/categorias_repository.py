@@ -1,10 +1,21 @@
-from sqlmodel import Session, select
+from typing import Any
+from sqlmodel import Session
 from app.models import Categoria
+from app.repositories.paginacao import contar, existentes, paginar
 from app.schemas.categorias import CategoriaCreate, CategoriaUpdate
 
+ORDENAVEIS = ('id', 'nome')
+
 class CategoriasRepository:
-    def list(self, session: Session) -> list[Categoria]:
-        return list(session.exec(select(Categoria)).all())
+    def list(self, session: Session, limit: int, cursor: str | None, order_by: str,
+             fields: str | None) -> tuple[list[dict[str, Any]], str | None]:
+        return paginar(session, Categoria, [], ORDENAVEIS, limit, cursor, order_by, fields)
+
+    def count(self, session: Session) -> int:
+        return contar(session, Categoria, [])
+
+    def existing_ids(self, session: Session, ids: set[int]) -> set[int]:
+        return existentes(session, Categoria.id, ids)
 
     def get(self, session: Session, categoria_id: int) -> Categoria | None:
         return session.get(Categoria, categoria_id)
@@ -0,0 +1,79 @@
+import base64
+import binascii
+import json
+from typing import Any
+from sqlalchemy import tuple_
+from sqlmodel import Session, SQLModel, func, select
+
+def codificar_cursor(valores: list[Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(valores, separators=(',', ':')).encode()).decode()
+
+def decodificar_cursor(cursor: str, tamanho: int) -> list[Any]:
+    try:
+        valores = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError):
+        raise ValueError('Cursor inválido') from None
+    if not isinstance(valores, list) or len(valores) != tamanho \
+            or not all(isinstance(v, (int, float, str)) for v in valores):
+        raise ValueError('Cursor inválido')
+    return valores
+
+def colunas_projetadas(modelo: type[SQLModel], fields: str | None) -> list[str]:
+    """Colunas pedidas em fields ('id,nome'), na ordem do modelo; todas se fields for vazio"""
+    todas = list(modelo.model_fields)
+    if not fields:
+        return todas
+    pedidas = {f.strip() for f in fields.split(',') if f.strip()}
+    invalidas = pedidas - set(todas)
+    if invalidas:
+        raise ValueError(f"Campos inválidos: {', '.join(sorted(invalidas))}")
+    return [c for c in todas if c in pedidas]
+
+def paginar(session: Session, modelo: type[SQLModel], filtros: list, ordenaveis: tuple[str, ...],
+            limit: int, cursor: str | None, order_by: str, fields: str | None) -> tuple[list[dict[str, Any]], str | None]:
+    """
+    Página de até limit linhas como dicts com as colunas de fields. A paginação é por keyset:
+    o cursor guarda (coluna de ordenação, id) da última linha, e a próxima página começa depois
+    dela com WHERE (coluna, id) > (valor, id), sem OFFSET.
+    """
+    decrescente = order_by.startswith('-')
+    ordem = order_by.lstrip('-')
+    if ordem not in ordenaveis:
+        raise ValueError(f"order_by deve ser um de: {', '.join(ordenaveis)} (prefixo '-' para decrescente)")
+    campos = colunas_projetadas(modelo, fields)
+
+    # id desempata a ordenação; as colunas do cursor são lidas mesmo fora de fields
+    chave = [modelo.id] if ordem == 'id' else [getattr(modelo, ordem), modelo.id]
+    lidas = list(dict.fromkeys(['id', ordem, *campos]))
+    query = select(*[getattr(modelo, c) for c in lidas])
+    if filtros:
+        query = query.where(*filtros)
+    if cursor:
+        valores = decodificar_cursor(cursor, len(chave))
+        posicao = tuple_(*chave) if len(chave) > 1 else chave[0]
+        inicio = tuple_(*valores) if len(chave) > 1 else valores[0]
+        query = query.where(posicao < inicio if decrescente else posicao > inicio)
+    query = query.order_by(*[c.desc() if decrescente else c.asc() for c in chave]).limit(limit + 1)
+
+    linhas = session.exec(query).all()
+    # Com uma única coluna o resultado vem como escalares
+    registros = [dict(zip(lidas, linha if len(lidas) > 1 else (linha,))) for linha in linhas[:limit]]
+    next_cursor = None
+    if len(linhas) > limit:
+        ultimo = registros[-1]
+        next_cursor = codificar_cursor([ultimo['id']] if ordem == 'id' else [ultimo[ordem], ultimo['id']])
+    return [{c: r[c] for c in campos} for r in registros], next_cursor
+
+def contar(session: Session, modelo: type[SQLModel], filtros: list) -> int:
+    query = select(func.count()).select_from(modelo)
+    if filtros:
+        query = query.where(*filtros)
+    return session.exec(query).one()
+
+def existentes(session: Session, coluna: Any, ids: set[int], tamanho_lote: int = 5000) -> set[int]:
+    """Quais ids existem: um SELECT ... IN por lote (o número de parâmetros por comando é limitado)"""
+    encontrados = set()
+    ids = list(ids)
+    for inicio in range(0, len(ids), tamanho_lote):
+        encontrados.update(session.exec(select(coluna).where(coluna.in_(ids[inicio:inicio + tamanho_lote]))).all())
+    return encontrados
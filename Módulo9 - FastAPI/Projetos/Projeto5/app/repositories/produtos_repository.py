@@ -1,17 +1,46 @@
-from sqlmodel import Session, select
+from collections.abc import Iterator, Sequence
+from typing import Any
+from sqlmodel import Session, insert, select, update
 from app.models import Produto
-from app.schemas.produtos import ProdutoCreate, ProdutoUpdate
+from app.repositories.paginacao import contar, existentes, paginar
+from app.schemas.produtos import ProdutoBulkUpdate, ProdutoCreate, ProdutoUpdate
+
+ORDENAVEIS = ('id', 'nome', 'preco', 'estoque')
+COLUNAS = tuple(Produto.model_fields)
 
 class ProdutosRepository:
-    def list(self, session: Session, nome: str | None, preco_min: float | None, preco_max: float | None) -> list[Produto]:
-        query = select(Produto)
+    def _filtros(self, nome: str | None, preco_min: float | None, preco_max: float | None) -> list:
+        filtros = []
         if nome:
-            query = query.where(Produto.nome.contains(nome))
+            filtros.append(Produto.nome.contains(nome))
         if preco_min is not None:
-            query = query.where(Produto.preco >= preco_min)
+            filtros.append(Produto.preco >= preco_min)
         if preco_max is not None:
-            query = query.where(Produto.preco <= preco_max)
-        return list(session.exec(query).all())
+            filtros.append(Produto.preco <= preco_max)
+        return filtros
+
+    def list(self, session: Session, nome: str | None, preco_min: float | None, preco_max: float | None,
+             limit: int, cursor: str | None, order_by: str, fields: str | None) -> tuple[list[dict[str, Any]], str | None]:
+        return paginar(session, Produto, self._filtros(nome, preco_min, preco_max), ORDENAVEIS,
+                       limit, cursor, order_by, fields)
+
+    def count(self, session: Session, nome: str | None, preco_min: float | None, preco_max: float | None) -> int:
+        return contar(session, Produto, self._filtros(nome, preco_min, preco_max))
+
+    def stream(self, session: Session, nome: str | None, preco_min: float | None, preco_max: float | None,
+               tamanho_lote: int) -> Iterator[Sequence[Sequence[Any]]]:
+        """
+        Lotes de tuplas (na ordem de COLUNAS) ordenados por id. yield_per usa um cursor no
+        servidor (psycopg2) ou o cursor do sqlite3: só um lote fica em memória por vez.
+        """
+        query = select(*[getattr(Produto, c) for c in COLUNAS]).order_by(Produto.id)
+        filtros = self._filtros(nome, preco_min, preco_max)
+        if filtros:
+            query = query.where(*filtros)
+        yield from session.exec(query.execution_options(yield_per=tamanho_lote)).partitions()
+
+    def existing_ids(self, session: Session, ids: set[int]) -> set[int]:
+        return existentes(session, Produto.id, ids)
 
     def get(self, session: Session, produto_id: int) -> Produto | None:
         return session.get(Produto, produto_id)
@@ -23,6 +52,20 @@ class ProdutosRepository:
         session.refresh(produto)
         return produto
 
+    def create_bulk(self, session: Session, payloads: Sequence[ProdutoCreate]) -> Sequence[int]:
+        # Com RETURNING, o SQLAlchemy envia INSERTs de várias linhas (VALUES (...), (...)); os ids voltam na ordem de payloads
+        query = insert(Produto).returning(Produto.id, sort_by_parameter_order=True)
+        ids = list(session.exec(query, params=[p.model_dump() for p in payloads]).scalars())
+        session.commit()
+        return ids
+
+    def update_bulk(self, session: Session, payloads: Sequence[ProdutoBulkUpdate]) -> None:
+        # UPDATE em lote pela chave primária: cada dict traz o id e só os campos informados
+        linhas = [linha for linha in (p.model_dump(exclude_none=True) for p in payloads) if len(linha) > 1]
+        if linhas:
+            session.exec(update(Produto), params=linhas)
+            session.commit()
+
     def update(self, session: Session, produto: Produto, payload: ProdutoUpdate) -> Produto:
         for k, v in payload.model_dump().items():
             if v is not None:
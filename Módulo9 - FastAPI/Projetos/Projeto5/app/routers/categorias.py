@@ -1,17 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session
 from app.db import get_session
 from app.models import Categoria
 from app.repositories.categorias_repository import CategoriasRepository
 from app.schemas.categorias import CategoriaCreate, CategoriaUpdate
+from app.schemas.paginacao import Pagina
 from app.services.categorias_service import CategoriasService
 
 router = APIRouter(prefix='/categorias', tags=['Categorias'])
 service = CategoriasService(CategoriasRepository())
 
-@router.get('', response_model=list[Categoria])
-def list_categorias(session: Session = Depends(get_session)) -> list[Categoria]:
-    return service.list(session)
+@router.get('', response_model=Pagina)
+def list_categorias(limit: int = Query(default=50, ge=1, le=500), cursor: str | None = Query(default=None),
+                    order_by: str = Query(default='id'), fields: str | None = Query(default=None),
+                    include_total: bool = Query(default=False), session: Session = Depends(get_session)) -> Pagina:
+    try:
+        return service.list(session, limit=limit, cursor=cursor, order_by=order_by, fields=fields,
+                            include_total=include_total)
+    except ValueError as erro:
+        raise HTTPException(status_code=400, detail=str(erro))
 
 @router.post('', response_model=Categoria, status_code=201)
 def create_categoria(payload: CategoriaCreate, session: Session = Depends(get_session)) -> Categoria:
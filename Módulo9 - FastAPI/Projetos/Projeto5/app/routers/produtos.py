@@ -1,18 +1,35 @@
+from typing import Literal
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 from app.db import get_session
 from app.models import Produto
 from app.repositories.categorias_repository import CategoriasRepository
 from app.repositories.produtos_repository import ProdutosRepository
-from app.schemas.produtos import ProdutoCreate, ProdutoUpdate
+from app.schemas.paginacao import Pagina
+from app.schemas.produtos import ProdutoBulkUpdate, ProdutoCreate, ProdutoUpdate, ResultadoBulk
+from app.services.exportacao import FORMATOS
 from app.services.produtos_service import ProdutosService
 
 router = APIRouter(prefix='/produtos', tags=['Produtos'])
 service = ProdutosService(ProdutosRepository(), CategoriasRepository())
 
-@router.get('', response_model=list[Produto])
-def list_produtos(nome: str | None = Query(default=None), preco_min: float | None = Query(default=None), preco_max: float | None = Query(default=None), session: Session = Depends(get_session)) -> list[Produto]:
-    return service.list(session, nome=nome, preco_min=preco_min, preco_max=preco_max)
+@router.get('', response_model=Pagina)
+def list_produtos(nome: str | None = Query(default=None), preco_min: float | None = Query(default=None), preco_max: float | None = Query(default=None),
+                  limit: int = Query(default=50, ge=1, le=500), cursor: str | None = Query(default=None),
+                  order_by: str = Query(default='id'), fields: str | None = Query(default=None),
+                  include_total: bool = Query(default=False), session: Session = Depends(get_session)) -> Pagina:
+    try:
+        return service.list(session, nome=nome, preco_min=preco_min, preco_max=preco_max, limit=limit, cursor=cursor,
+                            order_by=order_by, fields=fields, include_total=include_total)
+    except ValueError as erro:
+        raise HTTPException(status_code=400, detail=str(erro))
+
+@router.get('/export')
+def export_produtos(format: Literal['ndjson', 'csv'] = Query(default='ndjson'), nome: str | None = Query(default=None), preco_min: float | None = Query(default=None), preco_max: float | None = Query(default=None)) -> StreamingResponse:
+    return StreamingResponse(service.export(format, nome=nome, preco_min=preco_min, preco_max=preco_max),
+                             media_type=FORMATOS[format][1],
+                             headers={'Content-Disposition': f'attachment; filename=produtos.{format}'})
 
 @router.post('', response_model=Produto, status_code=201)
 def create_produto(payload: ProdutoCreate, session: Session = Depends(get_session)) -> Produto:
@@ -21,6 +38,14 @@ def create_produto(payload: ProdutoCreate, session: Session = Depends(get_sessio
         raise HTTPException(status_code=400, detail='Categoria inválida')
     return produto
 
+@router.post('/bulk', response_model=list[ResultadoBulk])
+def create_produtos_bulk(payload: list[ProdutoCreate], session: Session = Depends(get_session)) -> list[ResultadoBulk]:
+    return service.create_bulk(session, payload)
+
+@router.patch('/bulk', response_model=list[ResultadoBulk])
+def update_produtos_bulk(payload: list[ProdutoBulkUpdate], session: Session = Depends(get_session)) -> list[ResultadoBulk]:
+    return service.update_bulk(session, payload)
+
 @router.patch('/{produto_id}', response_model=Produto)
 def update_produto(produto_id: int, payload: ProdutoUpdate, session: Session = Depends(get_session)) -> Produto:
     produto = service.get(session, produto_id)
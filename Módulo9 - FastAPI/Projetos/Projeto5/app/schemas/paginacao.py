@@ -0,0 +1,7 @@
+from typing import Any
+from pydantic import BaseModel
+
+class Pagina(BaseModel):
+    items: list[dict[str, Any]]
+    next_cursor: str | None = None
+    total: int | None = None
@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic import BaseModel, Field
 
 class ProdutoCreate(BaseModel):
@@ -13,3 +14,12 @@ class ProdutoUpdate(BaseModel):
     estoque: int | None = Field(default=None, ge=0)
     ativo: bool | None = None
     categoria_id: int | None = None
+
+class ProdutoBulkUpdate(ProdutoUpdate):
+    id: int
+
+class ResultadoBulk(BaseModel):
+    index: int
+    status: Literal['criado', 'atualizado', 'erro']
+    id: int | None = None
+    detail: str | None = None
@@ -2,13 +2,17 @@ from sqlmodel import Session
 from app.models import Categoria
 from app.repositories.categorias_repository import CategoriasRepository
 from app.schemas.categorias import CategoriaCreate, CategoriaUpdate
+from app.schemas.paginacao import Pagina
 
 class CategoriasService:
     def __init__(self, repository: CategoriasRepository) -> None:
         self.repository = repository
 
-    def list(self, session: Session) -> list[Categoria]:
-        return self.repository.list(session)
+    def list(self, session: Session, limit: int, cursor: str | None, order_by: str, fields: str | None,
+             include_total: bool) -> Pagina:
+        items, next_cursor = self.repository.list(session, limit=limit, cursor=cursor, order_by=order_by, fields=fields)
+        total = self.repository.count(session) if include_total else None
+        return Pagina(items=items, next_cursor=next_cursor, total=total)
 
     def get(self, session: Session, categoria_id: int) -> Categoria | None:
         return self.repository.get(session, categoria_id)
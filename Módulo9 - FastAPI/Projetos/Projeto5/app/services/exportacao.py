@@ -0,0 +1,37 @@
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+def para_ndjson(colunas: Sequence[str], lotes: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    """Um objeto JSON por linha; cada lote do banco vira um único pedaço da resposta"""
+    for lote in lotes:
+        if orjson is not None:
+            yield b''.join(orjson.dumps(dict(zip(colunas, linha))) + b'\n' for linha in lote)
+        else:
+            yield ''.join(_json(dict(zip(colunas, linha))) + '\n' for linha in lote).encode()
+
+def para_csv(colunas: Sequence[str], lotes: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(colunas)
+    for lote in lotes:
+        writer.writerows(lote)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+FORMATOS = {
+    'ndjson': (para_ndjson, 'application/x-ndjson'),
+    'csv': (para_csv, 'text/csv'),
+}
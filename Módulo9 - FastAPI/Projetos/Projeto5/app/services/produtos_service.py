@@ -1,16 +1,37 @@
+from collections.abc import Iterator, Sequence
+from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session
+from app.db import engine
 from app.models import Produto
 from app.repositories.categorias_repository import CategoriasRepository
-from app.repositories.produtos_repository import ProdutosRepository
-from app.schemas.produtos import ProdutoCreate, ProdutoUpdate
+from app.repositories.produtos_repository import COLUNAS, ProdutosRepository
+from app.schemas.paginacao import Pagina
+from app.schemas.produtos import ProdutoBulkUpdate, ProdutoCreate, ProdutoUpdate, ResultadoBulk
+from app.services.exportacao import FORMATOS
+
+TAMANHO_LOTE_BULK = 1000
 
 class ProdutosService:
     def __init__(self, repository: ProdutosRepository, categorias_repository: CategoriasRepository) -> None:
         self.repository = repository
         self.categorias_repository = categorias_repository
 
-    def list(self, session: Session, nome: str | None, preco_min: float | None, preco_max: float | None) -> list[Produto]:
-        return self.repository.list(session, nome=nome, preco_min=preco_min, preco_max=preco_max)
+    def list(self, session: Session, nome: str | None, preco_min: float | None, preco_max: float | None,
+             limit: int, cursor: str | None, order_by: str, fields: str | None, include_total: bool) -> Pagina:
+        items, next_cursor = self.repository.list(session, nome=nome, preco_min=preco_min, preco_max=preco_max,
+                                                  limit=limit, cursor=cursor, order_by=order_by, fields=fields)
+        total = self.repository.count(session, nome=nome, preco_min=preco_min, preco_max=preco_max) if include_total else None
+        return Pagina(items=items, next_cursor=next_cursor, total=total)
+
+    def export(self, formato: str, nome: str | None, preco_min: float | None, preco_max: float | None,
+               tamanho_lote: int = 1000) -> Iterator[bytes]:
+        # Sessão própria: o corpo é gerado depois que a rota retorna, e a sessão da dependência
+        # pode já estar fechada nesse momento
+        serializar = FORMATOS[formato][0]
+        with Session(engine) as session:
+            lotes = self.repository.stream(session, nome=nome, preco_min=preco_min, preco_max=preco_max,
+                                           tamanho_lote=tamanho_lote)
+            yield from serializar(COLUNAS, lotes)
 
     def get(self, session: Session, produto_id: int) -> Produto | None:
         return self.repository.get(session, produto_id)
@@ -20,6 +41,62 @@ class ProdutosService:
             return None
         return self.repository.create(session, payload)
 
+    def create_bulk(self, session: Session, payloads: Sequence[ProdutoCreate],
+                    tamanho_lote: int = TAMANHO_LOTE_BULK) -> Sequence[ResultadoBulk]:
+        # Uma consulta IN para todas as categorias citadas, em vez de um get() por produto
+        categorias = self.categorias_repository.existing_ids(session, {p.categoria_id for p in payloads})
+        resultados: list[ResultadoBulk | None] = [None] * len(payloads)
+        validos = []
+        for i, payload in enumerate(payloads):
+            if payload.categoria_id in categorias:
+                validos.append(i)
+            else:
+                resultados[i] = ResultadoBulk(index=i, status='erro', detail='Categoria inválida')
+
+        # Um commit por lote: uma falha desfaz só o próprio lote
+        for inicio in range(0, len(validos), tamanho_lote):
+            lote = validos[inicio:inicio + tamanho_lote]
+            try:
+                ids = self.repository.create_bulk(session, [payloads[i] for i in lote])
+            except SQLAlchemyError:
+                session.rollback()
+                for i in lote:
+                    resultados[i] = ResultadoBulk(index=i, status='erro', detail='Falha ao gravar o lote')
+                continue
+            for i, produto_id in zip(lote, ids):
+                resultados[i] = ResultadoBulk(index=i, status='criado', id=produto_id)
+        return resultados
+
+    def update_bulk(self, session: Session, payloads: Sequence[ProdutoBulkUpdate],
+                    tamanho_lote: int = TAMANHO_LOTE_BULK) -> Sequence[ResultadoBulk]:
+        citadas = {p.categoria_id for p in payloads if p.categoria_id is not None}
+        categorias = self.categorias_repository.existing_ids(session, citadas)
+        resultados: list[ResultadoBulk] = []
+        for inicio in range(0, len(payloads), tamanho_lote):
+            lote = list(enumerate(payloads[inicio:inicio + tamanho_lote], start=inicio))
+            produtos = self.repository.existing_ids(session, {p.id for _, p in lote})
+            validos = []
+            for i, payload in lote:
+                if payload.id not in produtos:
+                    resultados.append(ResultadoBulk(index=i, status='erro', id=payload.id, detail='Produto não encontrado'))
+                elif not payload.model_dump(exclude_none=True, exclude={'id'}):
+                    resultados.append(ResultadoBulk(index=i, status='erro', id=payload.id,
+                                                    detail='Nenhum campo para atualizar'))
+                elif payload.categoria_id is not None and payload.categoria_id not in categorias:
+                    resultados.append(ResultadoBulk(index=i, status='erro', id=payload.id, detail='Categoria inválida'))
+                else:
+                    validos.append((i, payload))
+            if not validos:
+                continue
+            try:
+                self.repository.update_bulk(session, [p for _, p in validos])
+                status, detail = 'atualizado', None
+            except SQLAlchemyError:
+                session.rollback()
+                status, detail = 'erro', 'Falha ao gravar o lote'
+            resultados += [ResultadoBulk(index=i, status=status, id=p.id, detail=detail) for i, p in validos]
+        return sorted(resultados, key=lambda r: r.index)
+
     def update(self, session: Session, produto: Produto, payload: ProdutoUpdate) -> Produto | None:
         if payload.categoria_id is not None and not self.categorias_repository.get(session, payload.categoria_id):
             return None
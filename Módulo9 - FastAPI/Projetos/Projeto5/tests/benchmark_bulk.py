@@ -0,0 +1,67 @@
+"""
+Benchmark da criação e atualização de produtos: linhas/s do create()/update() um a um
+(um SELECT da categoria e um commit por produto) contra create_bulk()/update_bulk()
+(uma consulta IN para as categorias e um INSERT/UPDATE de várias linhas por lote).
+Usa um SQLite temporário, sem tocar no db.sqlite3 da aplicação.
+Uso (na pasta Projeto5): python tests/benchmark_bulk.py [quantidade]
+Padrão: 10000 (o caminho um a um mede no máximo 2000 linhas)
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models import Categoria
+from app.repositories.categorias_repository import CategoriasRepository
+from app.repositories.produtos_repository import ProdutosRepository
+from app.schemas.produtos import ProdutoBulkUpdate, ProdutoCreate, ProdutoUpdate
+from app.services.produtos_service import ProdutosService
+
+# Um commit por linha é lento: mede menos linhas e projeta a taxa
+MAXIMO_UM_A_UM = 2000
+
+def payloads(quantidade: int, categorias: list[int]) -> list[ProdutoCreate]:
+    return [ProdutoCreate(nome=f'Produto {i}', preco=10 + i % 100, estoque=i % 50,
+                          categoria_id=categorias[i % len(categorias)]) for i in range(quantidade)]
+
+def medir(funcao) -> float:
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+def main(quantidade: int) -> None:
+    service = ProdutosService(ProdutosRepository(), CategoriasRepository())
+    um_a_um = min(quantidade, MAXIMO_UM_A_UM)
+    with tempfile.TemporaryDirectory() as pasta:
+        engine = create_engine(f"sqlite:///{os.path.join(pasta, 'bench.sqlite3')}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add_all([Categoria(nome=f'Categoria {i}') for i in range(10)])
+            session.commit()
+            categorias = list(session.exec(select(Categoria.id)).all())
+
+            novos = payloads(um_a_um, categorias)
+            criar = medir(lambda: [service.create(session, p) for p in novos])
+            novos = payloads(quantidade, categorias)
+            resultados = []
+            criar_bulk = medir(lambda: resultados.extend(service.create_bulk(session, novos)))
+            assert all(r.status == 'criado' for r in resultados)
+
+            ids = [r.id for r in resultados]
+            atualizar = medir(lambda: [service.update(session, service.get(session, i), ProdutoUpdate(preco=1.5))
+                                       for i in ids[:um_a_um]])
+            alteracoes = [ProdutoBulkUpdate(id=i, preco=2.5, estoque=1) for i in ids]
+            atualizar_bulk = medir(lambda: service.update_bulk(session, alteracoes))
+        engine.dispose()
+
+    print(f"{'Operação':<12} {'um a um (linhas/s)':>20} {'bulk (linhas/s)':>18} {'ganho':>8}")
+    for nome, simples, bulk in (('create', criar, criar_bulk), ('update', atualizar, atualizar_bulk)):
+        taxa, taxa_bulk = um_a_um / simples, quantidade / bulk
+        print(f'{nome:<12} {taxa:>20,.0f} {taxa_bulk:>18,.0f} {taxa_bulk / taxa:>7.1f}x')
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
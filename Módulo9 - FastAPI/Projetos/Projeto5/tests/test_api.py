@@ -1,4 +1,9 @@
+import json
+from uuid import uuid4
 from fastapi.testclient import TestClient
+from sqlalchemy import inspect, text
+from sqlmodel import create_engine
+from app import db
 from app.main import app
 
 client = TestClient(app)
@@ -12,8 +17,84 @@ def test_fluxo_catalogo_completo() -> None:
     produto_id = produto.json()['id']
     filtro = client.get('/produtos', params={'nome': 'Teclado', 'preco_min': 100, 'preco_max': 300})
     assert filtro.status_code == 200
-    assert len(filtro.json()) >= 1
+    assert len(filtro.json()['items']) >= 1
     atualiza = client.patch(f'/produtos/{produto_id}', json={'estoque': 8})
     assert atualiza.status_code == 200
     assert atualiza.json()['estoque'] == 8
     assert client.delete(f'/produtos/{produto_id}').status_code == 204
+
+def test_paginacao_ordenacao_e_projecao() -> None:
+    marca = f'Paginado {uuid4().hex[:8]}'
+    categoria_id = client.post('/categorias', json={'nome': marca, 'ativa': True}).json()['id']
+    precos = [30.0, 10.0, 20.0, 10.0, 50.0]
+    for i, preco in enumerate(precos):
+        client.post('/produtos', json={'nome': f'{marca} {i}', 'preco': preco, 'estoque': i, 'categoria_id': categoria_id})
+    ids, cursor = [], None
+    while True:
+        params = {'nome': marca, 'order_by': '-preco', 'limit': 2, 'fields': 'id,preco', 'include_total': True}
+        if cursor:
+            params['cursor'] = cursor
+        pagina = client.get('/produtos', params=params).json()
+        assert pagina['total'] == len(precos)
+        assert all(set(item) == {'id', 'preco'} for item in pagina['items'])
+        ids += [(item['preco'], item['id']) for item in pagina['items']]
+        cursor = pagina['next_cursor']
+        if not cursor:
+            break
+    assert ids == sorted(ids, key=lambda p: (-p[0], -p[1]))
+    assert len(ids) == len(precos)
+    assert client.get('/produtos', params={'order_by': 'ativo'}).status_code == 400
+    assert client.get('/produtos', params={'fields': 'id,senha'}).status_code == 400
+    assert client.get('/produtos', params={'cursor': 'invalido'}).status_code == 400
+    categorias = client.get('/categorias', params={'order_by': 'nome', 'fields': 'nome'}).json()
+    assert all(set(item) == {'nome'} for item in categorias['items'])
+
+def test_export_ndjson_e_csv() -> None:
+    marca = f'Exportado {uuid4().hex[:8]}'
+    categoria_id = client.post('/categorias', json={'nome': marca, 'ativa': True}).json()['id']
+    for i in range(3):
+        client.post('/produtos', json={'nome': f'{marca} {i}', 'preco': 10.0 + i, 'estoque': i, 'categoria_id': categoria_id})
+    ndjson = client.get('/produtos/export', params={'format': 'ndjson', 'nome': marca})
+    assert ndjson.status_code == 200
+    assert ndjson.headers['content-type'].startswith('application/x-ndjson')
+    linhas = [json.loads(linha) for linha in ndjson.text.splitlines()]
+    assert [p['nome'] for p in linhas] == [f'{marca} {i}' for i in range(3)]
+    csv = client.get('/produtos/export', params={'format': 'csv', 'nome': marca}).text.splitlines()
+    assert csv[0] == 'id,nome,preco,estoque,ativo,categoria_id'
+    assert len(csv) == 4
+    assert client.get('/produtos/export', params={'format': 'xml'}).status_code == 422
+
+def test_bulk_create_e_update() -> None:
+    marca = f'Bulk {uuid4().hex[:8]}'
+    categoria_id = client.post('/categorias', json={'nome': marca, 'ativa': True}).json()['id']
+    novos = [{'nome': f'{marca} {i}', 'preco': 5.0 + i, 'estoque': i, 'categoria_id': categoria_id} for i in range(3)]
+    novos.insert(1, {'nome': f'{marca} sem categoria', 'preco': 1.0, 'estoque': 0, 'categoria_id': 999999})
+    criados = client.post('/produtos/bulk', json=novos)
+    assert criados.status_code == 200
+    resultados = criados.json()
+    assert [r['status'] for r in resultados] == ['criado', 'erro', 'criado', 'criado']
+    assert resultados[1]['detail'] == 'Categoria inválida'
+    ids = [r['id'] for r in resultados if r['status'] == 'criado']
+    alteracoes = [{'id': ids[0], 'estoque': 50}, {'id': ids[1], 'preco': 99.0, 'nome': f'{marca} novo'},
+                  {'id': 999999, 'estoque': 1}, {'id': ids[2], 'categoria_id': 999999}, {'id': ids[2]}]
+    atualizados = client.patch('/produtos/bulk', json=alteracoes).json()
+    assert [r['status'] for r in atualizados] == ['atualizado', 'atualizado', 'erro', 'erro', 'erro']
+    assert [r['index'] for r in atualizados] == [0, 1, 2, 3, 4]
+    assert atualizados[4]['detail'] == 'Nenhum campo para atualizar'
+    produtos = {p['id']: p for p in client.get('/produtos', params={'nome': marca}).json()['items']}
+    assert produtos[ids[0]]['estoque'] == 50
+    assert produtos[ids[1]]['preco'] == 99.0 and produtos[ids[1]]['nome'] == f'{marca} novo'
+    assert produtos[ids[2]]['categoria_id'] == categoria_id
+
+def test_indices_criados_em_banco_existente(tmp_path, monkeypatch) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'antigo.sqlite3'}")
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE categoria (id INTEGER PRIMARY KEY, nome VARCHAR NOT NULL, ativa BOOLEAN NOT NULL)'))
+        conn.execute(text('CREATE TABLE produto (id INTEGER PRIMARY KEY, nome VARCHAR NOT NULL, preco FLOAT NOT NULL, '
+                          'estoque INTEGER NOT NULL, ativo BOOLEAN NOT NULL, '
+                          'categoria_id INTEGER NOT NULL REFERENCES categoria (id))'))
+    monkeypatch.setattr(db, 'engine', engine)
+    db.create_db_and_tables()
+    db.create_db_and_tables()
+    assert {i['name'] for i in inspect(engine).get_indexes('produto')} >= {'ix_produto_nome', 'ix_produto_preco'}
+    engine.dispose()